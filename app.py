@@ -3,26 +3,227 @@
 Flask Web Application for Ranchi Local Guide Translator
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Request, Response, g, render_template, request, jsonify, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
+import hmac
 import json
 import sys
 import os
+import time
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from ranchi_translator import RanchiTranslator
+from ranchi_limits import ClientIdentity, CostBudget, RateLimiter, RedisBucketStore, Rejected, RequestLimits
+from ranchi_metrics import MAX_PROFILE_SECONDS, MetricsRegistry, SamplingProfiler, TranslationMetrics
+from ranchi_serialize import MIN_COMPRESS_BYTES, StaticBody, error_json, negotiate, translation_json
+from ranchi_session import EditConflict, SessionStore
+from ranchi_dialects import MAX_STACKS, discover_dialects
+from ranchi_translator import DEFAULT_DIALECTS_DIR, DEFAULT_TERMS_FILE, RanchiTranslator
 
 app = Flask(__name__)
 
+# Dictionary to serve: a markdown terms file, or a SQLite database built with ranchi_sqlite.py
+# (definitions then stay on disk and are read as terms are matched)
+TERMS_FILE = os.environ.get('RANCHI_TERMS_FILE', DEFAULT_TERMS_FILE)
+# Dialect shards: every terms file in RANCHI_DIALECTS_DIR (nagpuri.md, sadri.db, ...) can be
+# layered over the main dictionary per request; RANCHI_MAX_DIALECT_STACKS merged stacks are kept
+DIALECTS_DIR = os.environ.get('RANCHI_DIALECTS_DIR', DEFAULT_DIALECTS_DIR)
+MAX_DIALECT_STACKS = int(os.environ.get('RANCHI_MAX_DIALECT_STACKS', str(MAX_STACKS)))
+
+# Result cache settings (RANCHI_CACHE_SIZE=0 disables caching)
+CACHE_SIZE = int(os.environ.get('RANCHI_CACHE_SIZE', '10000'))
+CACHE_MAX_BYTES = int(os.environ.get('RANCHI_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+CACHE_TTL = float(os.environ.get('RANCHI_CACHE_TTL', '3600')) or None
+# RANCHI_RESULTS_DB=<file> keeps translations on disk across restarts (see ranchi_results.py)
+RESULTS_DB = os.environ.get('RANCHI_RESULTS_DB')
+
+# RANCHI_COMPACT_TERMS=1 keeps definitions in packed buffers (for very large dictionaries)
+COMPACT_TERMS = os.environ.get('RANCHI_COMPACT_TERMS', '0') not in ('', '0', 'false')
+# RANCHI_FUZZY_INDEX=1 builds the fuzzy-matching index with each dictionary load
+# instead of on the first {"fuzzy": true} request
+FUZZY_INDEX = os.environ.get('RANCHI_FUZZY_INDEX', '0') not in ('', '0', 'false')
+
+# Live translation sessions (/session): how many are kept, for how long while idle,
+# and the longest text one may hold
+MAX_SESSIONS = int(os.environ.get('RANCHI_MAX_SESSIONS', '1000'))
+SESSION_IDLE_TIMEOUT = float(os.environ.get('RANCHI_SESSION_IDLE_TIMEOUT', '1800'))
+MAX_SESSION_CHARS = int(os.environ.get('RANCHI_MAX_SESSION_CHARS', '100000'))
+
+# Dictionary reloading: RANCHI_WATCH_TERMS=<seconds> polls the terms file for changes;
+# Admin endpoints (/admin/*, /debug/*) are disabled unless RANCHI_ADMIN_TOKEN is set, and then
+# require it in the X-Admin-Token header
+WATCH_INTERVAL = float(os.environ.get('RANCHI_WATCH_TERMS', '0'))
+# With several worker processes, /admin/reload reaches one of them; it records the new
+# dictionary in RANCHI_RELOAD_FILE, which the others poll (gunicorn.conf.py sets one up)
+RELOAD_FILE = os.environ.get('RANCHI_RELOAD_FILE')
+ADMIN_TOKEN = os.environ.get('RANCHI_ADMIN_TOKEN')
+
+# Request limits. A translation costs one unit plus one per 1000 characters (four times that
+# when fuzzy). RANCHI_MAX_SENTENCE_CHARS caps one sentence, RANCHI_MAX_BATCH_BYTES a /translate/batch
+# body and RANCHI_MAX_BODY_BYTES any other request body (413). Each client may spend RANCHI_RATE_LIMIT units per second, up to RANCHI_RATE_BURST
+# at once (429; 0 disables); RANCHI_RATE_LIMIT_REDIS=<url> shares the buckets between workers.
+# Work beyond RANCHI_MAX_INFLIGHT_COST units at once waits up to RANCHI_ADMISSION_WAIT seconds,
+# then gets 503 (0 disables). Clients are told apart by address; RANCHI_CLIENT_HEADER
+# (e.g. X-Forwarded-For) is used only on requests from RANCHI_TRUSTED_PROXIES (addresses or
+# networks, comma-separated), taking the address RANCHI_PROXY_HOPS entries from its right end.
+MAX_SENTENCE_CHARS = int(os.environ.get('RANCHI_MAX_SENTENCE_CHARS', '10000'))
+MAX_BODY_BYTES = int(os.environ.get('RANCHI_MAX_BODY_BYTES', str(1024 * 1024)))
+MAX_BATCH_BYTES = int(os.environ.get('RANCHI_MAX_BATCH_BYTES', str(64 * 1024 * 1024)))
+RATE_LIMIT = float(os.environ.get('RANCHI_RATE_LIMIT', '0'))
+RATE_BURST = float(os.environ.get('RANCHI_RATE_BURST', str(max(RATE_LIMIT * 2, 20))))
+RATE_LIMIT_REDIS = os.environ.get('RANCHI_RATE_LIMIT_REDIS')
+MAX_INFLIGHT_COST = float(os.environ.get('RANCHI_MAX_INFLIGHT_COST', '256'))
+ADMISSION_WAIT = float(os.environ.get('RANCHI_ADMISSION_WAIT', '2'))
+CLIENT_HEADER = os.environ.get('RANCHI_CLIENT_HEADER')
+TRUSTED_PROXIES = os.environ.get('RANCHI_TRUSTED_PROXIES', '').split(',')
+PROXY_HOPS = int(os.environ.get('RANCHI_PROXY_HOPS', '1'))
+
+class RanchiRequest(Request):
+    """Request whose body cap depends on the endpoint: batches stream, so they may be larger"""
+    
+    @property
+    def max_content_length(self):
+        if self.path == '/translate/batch':
+            return MAX_BATCH_BYTES
+        return super().max_content_length
+
+app.request_class = RanchiRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_BODY_BYTES
+
 # Initialize the translator
 try:
-    translator = RanchiTranslator()
+    translator = RanchiTranslator(TERMS_FILE, cache_size=CACHE_SIZE, cache_max_bytes=CACHE_MAX_BYTES,
+                                  cache_ttl=CACHE_TTL, compact=COMPACT_TERMS,
+                                  fuzzy_index=FUZZY_INDEX, dialects=discover_dialects(DIALECTS_DIR),
+                                  max_dialect_stacks=MAX_DIALECT_STACKS, results=RESULTS_DB)
+    if WATCH_INTERVAL > 0:
+        translator.watch_terms_file(WATCH_INTERVAL)
     print(f"✅ Translator initialized with {len(translator.terms_dict)} terms")
 except Exception as e:
     print(f"❌ Error initializing translator: {e}")
     translator = None
 
+sessions = SessionStore(MAX_SESSIONS, SESSION_IDLE_TIMEOUT)
+if translator:
+    # Idle sessions would otherwise keep every replaced dictionary alive until they expire
+    translator.install_listeners.append(sessions.release_superseded)
+
+limits = RequestLimits(
+    MAX_SENTENCE_CHARS,
+    RateLimiter(RATE_LIMIT, RATE_BURST, RedisBucketStore(RATE_LIMIT_REDIS) if RATE_LIMIT_REDIS else None)
+    if RATE_LIMIT > 0 else None,
+    CostBudget(MAX_INFLIGHT_COST, ADMISSION_WAIT) if MAX_INFLIGHT_COST > 0 else None)
+
+# Rate limit key for (forwarding header value, peer address)
+client_key = ClientIdentity(TRUSTED_PROXIES if CLIENT_HEADER else (), PROXY_HOPS)
+if CLIENT_HEADER and not client_key.trusted:
+    print("⚠️  RANCHI_CLIENT_HEADER is ignored until RANCHI_TRUSTED_PROXIES lists the proxies setting it")
+
+# Instrumentation, exposed on /metrics
+metrics = MetricsRegistry()
+request_seconds = metrics.histogram('ranchi_http_request_duration_seconds',
+                                    'Time to build the response, by endpoint', labels=('endpoint', 'method', 'status'))
+response_bytes = metrics.counter('ranchi_http_response_bytes_total',
+                                 'Response body bytes sent, by content coding', labels=('encoding',))
+rejected_requests = metrics.counter('ranchi_http_rejected_total',
+                                    'Requests turned away by admission control, by endpoint and reason',
+                                    labels=('endpoint', 'reason'))
+translation_metrics = TranslationMetrics(metrics)
+profiler = SamplingProfiler()
+
+def _cache_stat(name):
+    stats = translator.cache_stats() if translator else None
+    return stats[name] if stats else None
+
+metrics.gauge('ranchi_dictionary_terms', 'Terms in the loaded dictionary',
+              lambda: translator.snapshot.size if translator else None)
+metrics.gauge('ranchi_sessions', 'Open live translation sessions', lambda: len(sessions))
+metrics.gauge('ranchi_admission_cost_in_flight', 'Cost units of the translations running now',
+              lambda: limits.budget.in_flight if limits.budget else None)
+metrics.gauge('ranchi_dialect_stacks', 'Merged dialect stacks kept in memory',
+              lambda: len(translator.dialects) if translator else None)
+for _stat in ('entries', 'bytes'):
+    metrics.gauge(f'ranchi_cache_{_stat}', f'Translation cache {_stat}', lambda stat=_stat: _cache_stat(stat))
+for _stat in ('hits', 'misses', 'evictions', 'expirations'):
+    metrics.gauge(f'ranchi_cache_{_stat}_total', f'Translation cache {_stat}',
+                  lambda stat=_stat: _cache_stat(stat), kind='counter')
+
+if translator:
+    translator.metrics = translation_metrics
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _record_request(response):
+    # Streamed responses (/translate/batch) are timed until their first byte is ready
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_seconds.observe(time.perf_counter() - started, endpoint, request.method, str(response.status_code))
+    return response
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html')
+
+@app.after_request
+def _compress_response(response):
+    """gzip/br-encode bodies for clients that accept it; /terms comes already encoded"""
+    if response.is_streamed or response.direct_passthrough or response.status_code != 200:
+        return response
+    
+    if 'Content-Encoding' not in response.headers and response.mimetype in COMPRESSIBLE_MIMETYPES:
+        body = response.get_data()
+        if len(body) >= MIN_COMPRESS_BYTES:
+            response.vary.add('Accept-Encoding')
+            body, encoding = negotiate(body, request.headers.get('Accept-Encoding'))
+            if encoding is not None:
+                response.set_data(body)
+                response.headers['Content-Encoding'] = encoding
+    
+    response_bytes.inc(response.content_length or 0, response.headers.get('Content-Encoding', 'identity'))
+    return response
+
+def _admin_denied():
+    """Error response unless an admin token is configured and the request carries it"""
+    if not ADMIN_TOKEN:
+        return jsonify({
+            'success': False,
+            'error': 'Admin endpoints are disabled; set RANCHI_ADMIN_TOKEN to enable them'
+        }), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'),
+                               ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid admin token'
+        }), 403
+    return None
+
+def _request_client():
+    return client_key(request.headers.get(CLIENT_HEADER) if CLIENT_HEADER else None, request.remote_addr)
+
+def admitted_translation(cost, sentence, options):
+    """translate_sentence, once cost fits in the in-flight budget (raises Rejected otherwise)"""
+    with limits.admit(cost):
+        return translator.translate_sentence(sentence, **options)
+
+def _rejected(e, endpoint):
+    """Error response for a Rejected request, counted in ranchi_http_rejected_total"""
+    rejected_requests.inc(1, endpoint, e.reason)
+    return jsonify({
+        'success': False,
+        'error': str(e)
+    }), e.status, e.headers()
+
+def _body_too_large():
+    return Rejected(413, 'too_large', f'Request body larger than {request.max_content_length} bytes')
+
+@app.errorhandler(RequestEntityTooLarge)
+def _request_too_large(e):
+    """413 for a body over the cap of its endpoint (see RanchiRequest)"""
+    return _rejected(_body_too_large(), request.url_rule.rule if request.url_rule else request.path)
+
 @app.route('/')
 def index():
     """Main page"""
@@ -37,7 +238,7 @@ def translate():
                 'success': False,
                 'error': 'Translator not initialized'
             })
-            
+        
         data = request.get_json()
         sentence = data.get('sentence', '').strip()
         
@@ -47,68 +248,500 @@ def translate():
                 'error': 'Please enter a sentence to translate'
             })
         
-        # Translate the sentence
-        result = translator.translate_sentence(sentence)
+        # Translate the sentence, if the client and the server have room for it
+        options = translate_options(data)
+        client = _request_client()
+        cost = limits.check(client, len(sentence), options.get('fuzzy', False))
+        result = admitted_translation(cost, sentence, options)
         
-        return jsonify({
-            'success': True,
-            'original': result['original'],
-            'translated': result['translated'],
-            'has_translations': result['has_translations'],
-            'explanations': result['explanations'],
-            'terms_found': result['terms_found']
-        })
+        # Encoded directly; jsonify would sort a fresh dict and cost several times more
+        return Response(translation_json(result), mimetype='application/json')
     
+    except Rejected as e:
+        return _rejected(e, '/translate')
+    except RequestEntityTooLarge:
+        return _rejected(_body_too_large(), '/translate')
     except Exception as e:
         return jsonify({
             'success': False,
             'error': f'Translation error: {str(e)}'
         })
 
+def translate_options(data):
+    """
+    translate_sentence keyword arguments from a request body
+    {"fuzzy": true} also matches other romanizations of terms; "min_confidence"
+    (0-1) drops weaker fuzzy matches; "dialect" is a dialect name or a list of layers
+    """
+    options = {}
+    if data.get('dialect') is not None:
+        options['dialect'] = translator.dialects.resolve(data['dialect'])
+    if not data.get('fuzzy'):
+        return options
+    options['fuzzy'] = True
+    if data.get('min_confidence') is not None:
+        min_confidence = float(data['min_confidence'])
+        if not 0 < min_confidence <= 1:
+            raise ValueError('min_confidence must be between 0 and 1')
+        options['min_confidence'] = min_confidence
+    return options
+
+def translation_response(result):
+    """JSON body for one successful translation"""
+    response = {
+        'success': True,
+        'original': result['original'],
+        'translated': result['translated'],
+        'has_translations': result['has_translations'],
+        'explanations': result['explanations'],
+        'terms_found': result['terms_found']
+    }
+    if 'confidences' in result:
+        response['confidences'] = result['confidences']
+    return response
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-seq')
+
+@app.route('/translate/batch', methods=['POST'])
+def translate_batch():
+    """
+    API endpoint for translating many sentences in one request
+    Accepts a JSON array (of strings or {"sentence": ...} objects) or NDJSON lines,
+    and streams back one NDJSON result per input with its index
+    """
+    if not translator:
+        return jsonify({
+            'success': False,
+            'error': 'Translator not initialized'
+        })
+    
+    if request.mimetype in NDJSON_MIMETYPES:
+        items = _iter_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('sentences')
+        if not isinstance(data, list):
+            return jsonify({
+                'success': False,
+                'error': 'Expected a JSON array of sentences or NDJSON lines'
+            })
+        items = iter(data)
+    
+    client = _request_client()
+    return Response(stream_with_context(_stream_batch(items, client)), mimetype='application/x-ndjson')
+
+class _InvalidLine:
+    """Placeholder for an NDJSON line that could not be decoded"""
+    def __init__(self, error):
+        self.error = error
+
+def _iter_ndjson(stream):
+    """Decode NDJSON lines lazily, skipping blank lines; a body over the cap ends with an error line"""
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield _InvalidLine(f'Invalid JSON line: {e}')
+    except RequestEntityTooLarge:
+        # A chunked body is only found too large once read this far; the lines before stand
+        e = _body_too_large()
+        rejected_requests.inc(1, '/translate/batch', e.reason)
+        yield _InvalidLine(str(e))
+
+def _batch_item_sentence(item):
+    """Extract the sentence from one batch item; returns (sentence, error)"""
+    if isinstance(item, _InvalidLine):
+        return None, item.error
+    if isinstance(item, dict):
+        item = item.get('sentence')
+    if not isinstance(item, str):
+        return None, 'Each item must be a string or an object with a "sentence" string'
+    sentence = item.strip()
+    if not sentence:
+        return None, 'Please enter a sentence to translate'
+    return sentence, None
+
+def _stream_batch(items, client):
+    """
+    Translate items through one translate_many pass, yielding NDJSON lines
+    Each item is checked against the request limits on its own; one that is
+    rejected gets an error line and the rest of the batch carries on.
+    """
+    current = {'index': -1, 'error': None, 'cost': 0}
+    
+    def release():
+        # The item's cost is held only while it is translated, not while its line is sent
+        if current['cost']:
+            limits.release(current['cost'])
+            current['cost'] = 0
+    
+    def sentences():
+        for index, item in enumerate(items):
+            sentence, error = _batch_item_sentence(item)
+            if error is None:
+                try:
+                    cost = limits.check(client, len(sentence))
+                    limits.acquire(cost)
+                    current['index'], current['error'], current['cost'] = index, None, cost
+                    yield sentence
+                    continue
+                except Rejected as e:
+                    rejected_requests.inc(1, '/translate/batch', e.reason)
+                    error = str(e)
+            current['index'], current['error'] = index, error
+            # Invalid items still take a (free) slot so results stay in step
+            yield ''
+    
+    try:
+        # translate_many translates an item before asking for the next, so its result
+        # arrives here with the cost still held
+        for result in translator.translate_many(sentences()):
+            release()
+            if current['error']:
+                yield error_json(current['error'], current['index']) + '\n'
+            elif 'error' in result:
+                yield error_json(f"Translation error: {result['error']}", current['index']) + '\n'
+            else:
+                yield translation_json(result, current['index']) + '\n'
+    finally:
+        release()
+
+MAX_TERMS_PER_PAGE = 500
+
 @app.route('/terms')
 def get_terms():
-    """API endpoint to get all available terms"""
+    """
+    API endpoint to get all available terms
+    Optional ?page=N&per_page=M paginates across categories; bodies are built once
+    per dictionary version and tagged with an ETag for If-None-Match requests
+    """
     try:
         if not translator:
             return jsonify({
                 'success': False,
                 'error': 'Translator not initialized'
             })
-            
-        # Organize terms by category
-        categories = {
-            "Food & Drinks": [],
-            "Greetings & Slang": [],
-            "Places & Locations": [],
-            "Common Phrases": []
-        }
         
-        for term, translation in translator.terms_dict.items():
-            term_info = {
-                'term': term.title(),
-                'translation': translation
-            }
-            
-            if any(word in translation.lower() for word in ['dish', 'food', 'drink', 'rice', 'beer', 'snack', 'curry']):
-                categories["Food & Drinks"].append(term_info)
-            elif any(word in translation.lower() for word in ['greeting', 'friend', 'brother', 'sister', 'how are']):
-                categories["Greetings & Slang"].append(term_info)
-            elif any(word in translation.lower() for word in ['road', 'area', 'lake', 'ground', 'chowk']):
-                categories["Places & Locations"].append(term_info)
-            else:
-                categories["Common Phrases"].append(term_info)
+        page = request.args.get('page', type=int)
+        per_page = request.args.get('per_page', default=50, type=int)
+        if page is not None and (page < 1 or not 1 <= per_page <= MAX_TERMS_PER_PAGE):
+            return jsonify({
+                'success': False,
+                'error': f'page must be >= 1 and per_page between 1 and {MAX_TERMS_PER_PAGE}'
+            })
+        
+        static = _terms_body(translator.snapshot, page, per_page if page else None)
+        body, encoding, etag = static.encoded(request.headers.get('Accept-Encoding'))
         
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        if static.compressible:
+            response.vary.add('Accept-Encoding')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        return response.make_conditional(request)
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error fetching terms: {str(e)}'
+        })
+
+@app.route('/dialects')
+def get_dialects():
+    """Layers a request can pick with "dialect" (a name, or a list lowest first)"""
+    if not translator:
+        return jsonify({
+            'success': False,
+            'error': 'Translator not initialized'
+        })
+    
+    return jsonify({
+        'success': True,
+        'dialects': translator.dialects.names
+    })
+
+MAX_SEARCH_RESULTS = 50
+
+@app.route('/terms/search')
+def search_terms():
+    """
+    Autocomplete: ?q=<text>&limit=N returns terms starting with q, then terms
+    whose translation has words starting with the words of q
+    """
+    if not translator:
+        return jsonify({
+            'success': False,
+            'error': 'Translator not initialized'
+        })
+    
+    return jsonify(_search_payload(request.args.get('q', ''), request.args.get('limit', '10')))
+
+def _search_payload(query, limit):
+    """/terms/search response for the raw q and limit parameters"""
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        return {
+            'success': False,
+            'error': f'limit must be between 1 and {MAX_SEARCH_RESULTS}'
+        }
+    
+    return {
+        'success': True,
+        'query': query,
+        'results': [{'term': term.title(), 'translation': translation}
+                    for term, translation in translator.search_terms(query, limit)]
+    }
+
+# Encoded /terms bodies: dictionary checksum -> {(page, per_page): StaticBody}
+_terms_bodies = {}
+MAX_CACHED_TERMS_BODIES = 128
+
+def _terms_body(snapshot, page, per_page):
+    """/terms body (a StaticBody with its ETag), built once per dictionary snapshot and page"""
+    bodies = _terms_bodies.get(snapshot.checksum)
+    if bodies is None or len(bodies) >= MAX_CACHED_TERMS_BODIES:
+        # Bodies of a replaced dictionary are never requested again
+        bodies = {}
+        _terms_bodies.clear()
+        _terms_bodies[snapshot.checksum] = bodies
+    
+    cached = bodies.get((page, per_page))
+    if cached is not None:
+        return cached
+    
+    ordered = [(category, term) for category, terms in snapshot.categories.items() for term in terms]
+    
+    payload = {'success': True, 'total_terms': snapshot.size}
+    if page is not None:
+        payload.update({
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (len(ordered) + per_page - 1) // per_page
+        })
+        ordered = ordered[(page - 1) * per_page:page * per_page]
+    definitions = snapshot.definitions([term for _, term in ordered])
+    
+    # Organize terms by category
+    categories = {category: [] for category in snapshot.categories}
+    for category, term in ordered:
+        categories[category].append({
+            'term': term.title(),
+            'translation': definitions[term]
+        })
+    payload['categories'] = categories
+    
+    etag = f"{snapshot.checksum[:16]}-{page or 'all'}-{per_page or 'all'}"
+    # Compact, as jsonify writes outside debug mode; app.json.dumps alone pads every separator
+    bodies[(page, per_page)] = StaticBody(app.json.dumps(payload, separators=(',', ':')).encode('utf-8'), etag)
+    return bodies[(page, per_page)]
+
+@app.route('/session', methods=['POST'])
+def create_session():
+    """
+    Start a live translation session for {"text": ..., "dialect": ...}
+    Later keystrokes are sent to /session/<id>/edit instead of retranslating the text
+    """
+    if not translator:
+        return jsonify({
+            'success': False,
+            'error': 'Translator not initialized'
+        })
+    
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return jsonify({'success': False, 'error': 'text must be a string'}), 400
+    if len(text) > MAX_SESSION_CHARS:
+        return jsonify({'success': False, 'error': f'Text longer than {MAX_SESSION_CHARS} characters'}), 413
+    try:
+        dialect = translator.dialects.resolve(data['dialect']) if data.get('dialect') is not None else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # Matching the whole text costs as much as translating it (MAX_SESSION_CHARS is the size cap)
+    try:
+        cost = limits.check(_request_client(), len(text), capped=False)
+        with limits.admit(cost):
+            session_id, session = sessions.create(translator, text, dialect)
+    except Rejected as e:
+        return _rejected(e, '/session')
+    return jsonify({
+        'success': True,
+        'session_id': session_id,
+        'version': session.version,
+        'matches': session.matches()
+    }), 201
+
+@app.route('/session/<session_id>', methods=['GET', 'DELETE'])
+def session_state(session_id):
+    """Full translation of a session's text (GET), or close the session (DELETE)"""
+    if request.method == 'DELETE':
+        return jsonify({'success': sessions.delete(session_id)})
+    
+    try:
+        session = sessions.get(session_id)
+    except KeyError:
+        return jsonify({'success': False, 'error': 'Unknown or expired session'}), 404
+    
+    with session.lock:
+        result = session.result()
+        version = session.version
+    return jsonify({**translation_response(result), 'version': version})
+
+@app.route('/session/<session_id>/edit', methods=['POST'])
+def edit_session(session_id):
+    """
+    Apply edits to a session's text and return the matches that changed
+    Body: {"version": <version the edits were made against>,
+           "edits": [{"offset": ..., "delete": ..., "insert": ...}, ...]}
+    (or a single edit's fields at the top level). Edits are applied in order;
+    one diff is returned per edit.
+    """
+    try:
+        session = sessions.get(session_id)
+    except KeyError:
+        return jsonify({'success': False, 'error': 'Unknown or expired session'}), 404
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'Expected a JSON object'}), 400
+    edits = data.get('edits', [data])
+    
+    # An edit re-matches the text around what it inserts, or all of it after a dictionary reload
+    try:
+        chars = len(session.text) if session.stale else sum(len(edit.get('insert', '')) for edit in edits)
+        cost = limits.check(_request_client(), chars, capped=False)
+    except Rejected as e:
+        return _rejected(e, '/session/<session_id>/edit')
+    except (TypeError, AttributeError) as e:
+        return jsonify({'success': False, 'error': f'Invalid edit: {e}', 'version': session.version}), 400
+    
+    try:
+        with limits.admit(cost):
+            return _apply_edits(session, data, edits)
+    except Rejected as e:
+        return _rejected(e, '/session/<session_id>/edit')
+
+def _apply_edits(session, data, edits):
+    """Response for applying edits to session in order, under its lock"""
+    with session.lock:
+        try:
+            base_version = data.get('version')
+            diffs = []
+            for edit in edits:
+                insert = edit.get('insert', '')
+                if len(session.text) - int(edit.get('delete', 0)) + len(insert) > MAX_SESSION_CHARS:
+                    return jsonify({
+                        'success': False,
+                        'error': f'Text longer than {MAX_SESSION_CHARS} characters'
+                    }), 413
+                diffs.append(session.edit(int(edit['offset']), int(edit.get('delete', 0)), insert,
+                                          base_version if not diffs else None))
+        except EditConflict as e:
+            return jsonify({'success': False, 'error': str(e), 'version': session.version}), 409
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            return jsonify({'success': False, 'error': f'Invalid edit: {e}', 'version': session.version}), 400
+    
+    return jsonify({'success': True, 'version': session.version, 'diffs': diffs})
+
+@app.route('/admin/reload', methods=['POST'])
+def reload_terms():
+    """
+    API endpoint to reload the dictionary without a restart
+    Answers once the new dictionary is in use; if it cannot be loaded, the
+    current one stays and the error is returned with a 500
+    """
+    if not translator:
         return jsonify({
-            'success': True,
-            'categories': categories,
-            'total_terms': len(translator.terms_dict)
+            'success': False,
+            'error': 'Translator not initialized'
         })
     
+    denied = _admin_denied()
+    if denied:
+        return denied
+    
+    # Requests keep using the current dictionary until the new one is swapped in
+    try:
+        translator.reload_terms()
     except Exception as e:
         return jsonify({
             'success': False,
-            'error': f'Error fetching terms: {str(e)}'
+            'error': f'Reload failed, keeping the current dictionary: {e}',
+            'current_checksum': translator.dictionary_checksum
+        }), 500
+    if RELOAD_FILE:
+        translator.announce_reload(RELOAD_FILE)
+    return jsonify({
+        'success': True,
+        'reloaded': translator.terms_file,
+        'terms': translator.snapshot.size,
+        'checksum': translator.dictionary_checksum
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus metrics: request latency, match/rewrite time, dictionary and cache stats"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/debug/profile/start', methods=['POST'])
+def start_profile():
+    """
+    Start the sampling profiler; ?interval=<seconds> between samples (default 0.005)
+    and ?seconds=<n> to sample for (default and at most MAX_PROFILE_SECONDS)
+    """
+    denied = _admin_denied()
+    if denied:
+        return denied
+    
+    interval = max(request.args.get('interval', default=0.005, type=float), 0.001)
+    seconds = min(request.args.get('seconds', default=MAX_PROFILE_SECONDS, type=float), MAX_PROFILE_SECONDS)
+    if not profiler.start(interval, seconds):
+        return jsonify({
+            'success': False,
+            'error': 'Profiler already running'
         })
+    return jsonify({'success': True, 'interval': interval, 'seconds': seconds})
+
+@app.route('/debug/profile/stop', methods=['POST'])
+def stop_profile():
+    """Stop the sampling profiler and return collapsed stacks (flamegraph input)"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+    
+    if not profiler.running:
+        return jsonify({
+            'success': False,
+            'error': 'Profiler not running'
+        })
+    stacks = profiler.stop()
+    return Response(stacks, mimetype='text/plain', headers={'X-Profile-Samples': str(profiler.samples)})
+
+@app.route('/cache/stats')
+def cache_stats():
+    """API endpoint for translation cache counters"""
+    if not translator:
+        return jsonify({
+            'success': False,
+            'error': 'Translator not initialized'
+        })
+    
+    return jsonify({
+        'success': True,
+        'enabled': translator.cache is not None,
+        'stats': translator.cache_stats()
+    })
 
 if __name__ == '__main__':
     print("🚀 Starting Ranchi Local Guide Translator Web Server...")
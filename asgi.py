@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+ASGI application for serving the Ranchi Local Guide Translator in production
+/translate, /terms, /terms/search and /metrics are handled natively with a concurrency limit and
+a bounded wait queue (plus the app's request limits); other routes are passed to the Flask app via asgiref
+(pip install asgiref)
+"""
+
+import asyncio
+import json
+import os
+import time
+from urllib.parse import parse_qs
+
+from app import (app as flask_app, translator, translate_options, _terms_body, _search_payload,
+                 admitted_translation, client_key, limits, request_seconds, rejected_requests, response_bytes,
+                 metrics, CLIENT_HEADER, MAX_BODY_BYTES, MAX_TERMS_PER_PAGE)
+from ranchi_limits import MemoryBucketStore, Rejected
+from ranchi_serialize import MIN_COMPRESS_BYTES, negotiate, translation_json
+
+# Concurrency controls
+MAX_CONCURRENCY = int(os.environ.get('RANCHI_MAX_CONCURRENCY', '32'))
+MAX_QUEUE = int(os.environ.get('RANCHI_MAX_QUEUE', '256'))
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError as e:
+    # Without it every route but the native ones would answer 404
+    raise ImportError("asgi.py needs asgiref to serve the Flask routes: pip install asgiref") from e
+
+
+class TranslatorASGI:
+    """
+    Native async handlers for the hot routes
+    At most max_concurrency translations run at once (in the default thread pool,
+    so the event loop keeps accepting connections); up to max_queue more wait
+    for a slot, and requests beyond that are rejected with 503 + Retry-After.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_queue: int = MAX_QUEUE,
+                 fallback=None):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.fallback = fallback
+        self._slots = None
+        self._waiting = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        path, method = scope['path'], scope['method']
+        started = time.perf_counter()
+
+        if path == '/translate' and method == 'POST':
+            status = await self._translate(scope, receive, send)
+        elif path == '/terms' and method == 'GET':
+            status = await self._terms(scope, send)
+        elif path == '/terms/search' and method == 'GET':
+            status = await self._search(scope, send)
+        elif path == '/metrics' and method == 'GET':
+            status = await self._send(send, 200, metrics.render().encode('utf-8'),
+                                      'text/plain; version=0.0.4', accept_encoding=_header(scope, b'accept-encoding'))
+        elif self.fallback is not None:
+            await self.fallback(scope, receive, send)
+            return
+        else:
+            status = await self._send_json(send, 404, {'success': False, 'error': 'Not found'})
+
+        request_seconds.observe(time.perf_counter() - started, path, method, str(status))
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _translate(self, scope, receive, send) -> int:
+        body = await self._read_body(receive)
+        if body is None:
+            return await self._send_rejection(send, Rejected(
+                413, 'too_large', f'Request body larger than {MAX_BODY_BYTES} bytes'))
+
+        if not translator:
+            return await self._send_json(send, 200, {'success': False, 'error': 'Translator not initialized'})
+
+        # Bad bodies get 200 with success: false, as from the Flask route
+        try:
+            data = json.loads(body or b'null')
+            sentence = data.get('sentence', '').strip()
+            options = translate_options(data) if sentence else None
+        except Exception as e:
+            return await self._send_json(send, 200, {'success': False, 'error': f'Translation error: {str(e)}'})
+
+        if not sentence:
+            return await self._send_json(send, 200, {
+                'success': False,
+                'error': 'Please enter a sentence to translate'
+            })
+
+        loop = asyncio.get_running_loop()
+        client = client_key(_header(scope, CLIENT_HEADER.lower().encode('latin-1')) if CLIENT_HEADER else None,
+                            (scope.get('client') or ('',))[0])
+        try:
+            if limits.limiter is None or isinstance(limits.limiter.store, MemoryBucketStore):
+                cost = limits.check(client, len(sentence), options.get('fuzzy', False))
+            else:
+                # A shared bucket store is a network round trip: keep it off the event loop
+                cost = await loop.run_in_executor(
+                    None, limits.check, client, len(sentence), options.get('fuzzy', False))
+        except Rejected as e:
+            return await self._send_rejection(send, e)
+
+        # Backpressure: shed load instead of queueing without bound
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            return await self._send_json(send, 503, {'success': False, 'error': 'Server busy, retry shortly'},
+                                         [(b'retry-after', b'1')])
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            result = await loop.run_in_executor(
+                None, admitted_translation, cost, sentence, options)
+        except Rejected as e:
+            return await self._send_rejection(send, e)
+        except Exception as e:
+            return await self._send_json(send, 200, {'success': False, 'error': f'Translation error: {str(e)}'})
+        finally:
+            self._slots.release()
+
+        return await self._send(send, 200, translation_json(result).encode('ascii'), 'application/json',
+                                accept_encoding=_header(scope, b'accept-encoding'))
+
+    async def _terms(self, scope, send) -> int:
+        if not translator:
+            return await self._send_json(send, 200, {'success': False, 'error': 'Translator not initialized'})
+
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        try:
+            page = int(query['page'][0]) if 'page' in query else None
+            per_page = int(query.get('per_page', ['50'])[0])
+        except ValueError:
+            page, per_page = 0, 0
+        if page is not None and (page < 1 or not 1 <= per_page <= MAX_TERMS_PER_PAGE):
+            return await self._send_json(send, 200, {
+                'success': False,
+                'error': f'page must be >= 1 and per_page between 1 and {MAX_TERMS_PER_PAGE}'
+            })
+
+        static = _terms_body(translator.snapshot, page, per_page if page else None)
+        body, encoding, etag = static.encoded(_header(scope, b'accept-encoding'))
+        quoted = f'"{etag}"'.encode('ascii')
+        headers = [(b'etag', quoted), (b'cache-control', b'no-cache')]
+        if static.compressible:
+            headers.append((b'vary', b'Accept-Encoding'))
+
+        for name, value in scope['headers']:
+            if name == b'if-none-match' and quoted in [v.strip() for v in value.split(b',')]:
+                return await self._send(send, 304, b'', None, headers)
+
+        return await self._send(send, 200, body, 'application/json', headers, encoding=encoding)
+
+    async def _search(self, scope, send) -> int:
+        if not translator:
+            return await self._send_json(send, 200, {'success': False, 'error': 'Translator not initialized'})
+
+        # Database lookups block, so they run in the thread pool like translations
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        payload = await asyncio.get_running_loop().run_in_executor(
+            None, _search_payload, query.get('q', [''])[0], query.get('limit', ['10'])[0])
+        return await self._send_json(send, 200, payload)
+
+    async def _read_body(self, receive):
+        """Request body, or None if it exceeds MAX_BODY_BYTES"""
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                return None
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def _send_rejection(self, send, e: Rejected) -> int:
+        rejected_requests.inc(1, '/translate', e.reason)
+        headers = [(name.lower().encode('ascii'), value.encode('ascii')) for name, value in e.headers()]
+        return await self._send_json(send, e.status, {'success': False, 'error': str(e)}, headers)
+
+    async def _send_json(self, send, status, payload, headers=None) -> int:
+        # The bytes jsonify sends: compact, with a trailing newline
+        body = flask_app.json.dumps(payload, separators=(',', ':')) + '\n'
+        return await self._send(send, status, body.encode('utf-8'), 'application/json', headers)
+
+    async def _send(self, send, status, body, content_type, headers=None,
+                    accept_encoding=None, encoding=None) -> int:
+        """
+        Send a complete response; with accept_encoding, the body is compressed
+        when worth it, and encoding names the coding of an already compressed body
+        """
+        response_headers = []
+        if accept_encoding is not None and len(body) >= MIN_COMPRESS_BYTES:
+            response_headers.append((b'vary', b'Accept-Encoding'))
+            body, encoding = negotiate(body, accept_encoding)
+        if encoding is not None:
+            response_headers.append((b'content-encoding', encoding.encode('ascii')))
+        response_bytes.inc(len(body), encoding or 'identity')
+
+        response_headers.append((b'content-length', str(len(body)).encode('ascii')))
+        if content_type:
+            response_headers.append((b'content-type', content_type.encode('ascii')))
+        response_headers.extend(headers or [])
+        await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+        await send({'type': 'http.response.body', 'body': body})
+        return status
+
+
+def _header(scope, name: bytes) -> str:
+    """A request header by its lowercase name ('' if absent)"""
+    for header, value in scope['headers']:
+        if header == name:
+            return value.decode('latin-1')
+    return ''
+
+
+# Other routes (batch, sessions, admin, debug) are served by the Flask app
+application = TranslatorASGI(fallback=WsgiToAsgi(flask_app))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuzzy matching latency and recall vs dictionary size
+Terms in the sentences are respelled ("oo" for "u", doubled or dropped letters)
+so that exact matching misses them
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import FILLER_WORDS, make_terms
+from ranchi_translator import RanchiTranslator
+
+RESPELLINGS = [("u", "oo"), ("i", "ee"), ("a", "aa"), ("tt", "t"), ("kh", "k"), ("ch", "chh")]
+
+
+def respell(term: str, rng: random.Random) -> str:
+    """One romanization variant of term"""
+    choices = [(old, new) for old, new in RESPELLINGS if old in term]
+    if not choices:
+        return term + "a"
+    old, new = rng.choice(choices)
+    return term.replace(old, new, 1)
+
+
+def make_variant_sentence(terms: list, rng: random.Random, words: int = 20, density: float = 0.25):
+    """A sentence with respelled terms, and the terms that were respelled"""
+    parts, expected = [], []
+    for _ in range(words):
+        if rng.random() < density:
+            term = rng.choice(terms)
+            parts.append(respell(term, rng))
+            expected.append(term)
+        else:
+            parts.append(rng.choice(FILLER_WORDS))
+    return " ".join(parts) + ".", expected
+
+
+def time_per_call(func, sentences: list) -> float:
+    """Average milliseconds per call over the given sentences"""
+    start = time.perf_counter()
+    for sentence in sentences:
+        func(sentence)
+    return (time.perf_counter() - start) * 1000 / len(sentences)
+
+
+def main():
+    rng = random.Random(42)
+    translator = RanchiTranslator()
+
+    print(f"{'terms':>8} {'index s':>8} {'exact ms':>9} {'fuzzy ms':>9} {'ratio':>6} {'recall':>7}")
+    for size in (100, 1000, 10000, 100000):
+        terms = make_terms(size, rng)
+        translator.terms_dict = terms
+        term_list = list(terms)
+        samples = [make_variant_sentence(term_list, rng) for _ in range(100)]
+        sentences = [sentence for sentence, _ in samples]
+
+        start = time.perf_counter()
+        translator.snapshot.fuzzy_index
+        index_s = time.perf_counter() - start
+
+        found = expected = 0
+        for sentence, terms_used in samples:
+            matched = {term for _, term, _, _ in translator.find_fuzzy_terms(sentence)}
+            found += sum(term in matched for term in terms_used)
+            expected += len(terms_used)
+
+        exact_ms = time_per_call(translator.find_terms_in_sentence, sentences)
+        fuzzy_ms = time_per_call(translator.find_fuzzy_terms, sentences)
+        print(f"{size:>8} {index_s:>8.2f} {exact_ms:>9.3f} {fuzzy_ms:>9.3f} "
+              f"{fuzzy_ms / exact_ms:>5.1f}x {found / max(expected, 1):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: phrase matching latency vs dictionary size
+Compares the old one-regex-per-term loop with the PhraseMatcher scan
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_sentence, make_terms
+from ranchi_translator import RanchiTranslator
+
+def legacy_find_terms(terms_dict: dict, sentence: str) -> list:
+    """The original implementation: sort and compile every term on each call"""
+    sentence_lower = sentence.lower()
+    found_terms = []
+    for term in sorted(terms_dict.keys(), key=len, reverse=True):
+        pattern = r'\b' + re.escape(term) + r'\b'
+        for match in re.finditer(pattern, sentence_lower):
+            found_terms.append((sentence[match.start():match.end()], term, terms_dict[term]))
+    return found_terms
+
+
+def time_per_call(func, sentences: list) -> float:
+    """Average milliseconds per call over the given sentences"""
+    start = time.perf_counter()
+    for sentence in sentences:
+        func(sentence)
+    return (time.perf_counter() - start) * 1000 / len(sentences)
+
+
+def main():
+    rng = random.Random(42)
+    translator = RanchiTranslator()
+
+    print(f"{'terms':>8} {'legacy ms':>12} {'matcher ms':>12} {'speedup':>9}")
+    for size in (10, 100, 1000, 5000, 20000):
+        terms = make_terms(size, rng)
+        translator.terms_dict = terms
+
+        term_list = list(terms)
+        sentences = [make_sentence(term_list, rng) for _ in range(50)]
+
+        for sentence in sentences:
+            assert translator.find_terms_in_sentence(sentence) == legacy_find_terms(terms, sentence)
+
+        legacy_sentences = sentences if size <= 5000 else sentences[:5]
+        legacy_ms = time_per_call(lambda s: legacy_find_terms(terms, s), legacy_sentences)
+        matcher_ms = time_per_call(translator.find_terms_in_sentence, sentences)
+        print(f"{size:>8} {legacy_ms:>12.3f} {matcher_ms:>12.3f} {legacy_ms / matcher_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
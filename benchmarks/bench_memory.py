@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: dict vs CompactTermStore vs SQLite for the term dictionary
+Reports bytes per term for the definitions mapping on its own and for a whole
+loaded translator, and checks that all of them return the same translations.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_sentence, make_terms
+from ranchi_compact import CompactTermStore
+from ranchi_translator import RanchiTranslator
+
+
+def traced_bytes(build):
+    """Bytes still allocated after build() returns, plus the built object"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = build()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0], obj
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dict, compact and SQLite term storage")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.sizes:
+        terms = make_terms(size, rng)
+        encoded = [(term.encode(), definition.encode()) for term, definition in terms.items()]
+
+        def parsed():
+            """Fresh strings, as the parser would produce them"""
+            return {term.decode(): definition.decode() for term, definition in encoded}
+
+        dict_bytes, _ = traced_bytes(parsed)
+        compact_bytes, store = traced_bytes(lambda: CompactTermStore(parsed()))
+
+        def load(compact):
+            with contextlib.redirect_stdout(io.StringIO()):
+                translator = RanchiTranslator("-missing-", use_compiled=False, compact=compact)
+                translator.terms_dict = parsed()
+            return translator
+
+        plain_total, plain = traced_bytes(lambda: load(False))
+        compact_total, compact = traced_bytes(lambda: load(True))
+
+        # Definitions stay on disk; only the matcher and the definitions used are in memory
+        workdir = tempfile.TemporaryDirectory(prefix="ranchi-")
+        database = os.path.join(workdir.name, "terms.db")
+        plain.save_database(database)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sqlite_total, on_disk = traced_bytes(lambda: RanchiTranslator(database))
+
+        term_list = list(terms)
+        for _ in range(200):
+            sentence = make_sentence(term_list, rng, density=0.3)
+            expected = plain.translate_sentence(sentence)
+            assert expected == compact.translate_sentence(sentence) == on_disk.translate_sentence(sentence), sentence
+
+        print(f"{size:>7} terms ({store.unique_definitions} unique definitions)")
+        print(f"   mapping:    dict {dict_bytes / size:8.1f} B/term → compact {compact_bytes / size:8.1f} B/term "
+              f"({store.nbytes() / size:.1f} B/term in buffers)")
+        print(f"   translator: dict {plain_total / size:8.1f} B/term → compact {compact_total / size:8.1f} B/term "
+              f"→ sqlite {sqlite_total / size:8.1f} B/term")
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parallel corpus translation throughput vs worker count
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_sentence, make_terms, write_terms_file
+from ranchi_parallel import translate_parallel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=200000, help="synthetic corpus size")
+    parser.add_argument("--terms", type=int, default=5000, help="synthetic dictionary size")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    terms = make_terms(args.terms, rng)
+    term_list = list(terms)
+    corpus = [make_sentence(term_list, rng) for _ in range(args.lines)]
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        terms_file = os.path.join(workdir, "terms.md")
+        write_terms_file(terms, terms_file)
+
+        print(f"{args.lines} lines, {args.terms} terms, {cores} cores")
+        print(f"{'workers':>8} {'lines/sec':>12} {'speedup':>9}")
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            for _ in translate_parallel(corpus, terms_file, workers, args.chunk_size):
+                pass
+            rate = args.lines / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"{workers:>8} {rate:>12,.0f} {rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /translate response encoding and compression
+Compares jsonify with translation_json (µs per response),
+and the bytes sent for /translate and /terms with and without compression
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_sentence, make_terms
+from ranchi_serialize import SUPPORTED_ENCODINGS, StaticBody, compress, translation_json
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from app import app, translation_response, translator
+    from flask import jsonify
+
+
+def per_call_us(function, items, repeat: int = 5) -> float:
+    """Best of repeat runs, in µs per item"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6 / len(items)
+
+
+def main():
+    rng = random.Random(42)
+    terms = make_terms(10000, rng)
+    translator.terms_dict = terms
+    term_list = list(terms)
+
+    for words in (10, 50, 200):
+        results = [translator.translate_sentence(make_sentence(term_list, rng, words=words, density=0.3))
+                   for _ in range(500)]
+        with app.test_request_context():
+            jsonify_us = per_call_us(lambda result: jsonify(translation_response(result)).get_data(), results)
+        direct_us = per_call_us(lambda result: translation_json(result).encode('ascii'), results)
+
+        body = translation_json(results[0]).encode('ascii')
+        sizes = "  ".join(f"{encoding} {len(compress(body, encoding)):>6}" for encoding in SUPPORTED_ENCODINGS)
+        print(f"/translate {words:>3} words: jsonify {jsonify_us:7.1f} µs → direct {direct_us:6.1f} µs   "
+              f"bytes: identity {len(body):>6}  {sizes}")
+
+    with app.test_client() as client:
+        body = client.get('/terms').data
+    static = StaticBody(body, "bench")
+    sizes = "  ".join(f"{encoding} {len(static.encoded(encoding)[0]):>8}" for encoding in SUPPORTED_ENCODINGS)
+    start = time.perf_counter()
+    static.encoded(SUPPORTED_ENCODINGS[-1])
+    cached_us = (time.perf_counter() - start) * 1e6
+    print(f"/terms ({len(terms)} terms) bytes: identity {len(body):>8}  {sizes}  "
+          f"(cached variant served in {cached_us:.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-keystroke cost of incremental sessions vs retranslating the text
+Types a sentence one character at a time into texts of growing length, at the
+end and in the middle, and checks the session agrees with translate_sentence
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_sentence, make_terms
+from ranchi_session import TranslationSession
+from ranchi_translator import RanchiTranslator
+
+
+def type_into(session: TranslationSession, position: int, typed: str) -> float:
+    """Insert typed one character at a time; returns ms per keystroke"""
+    start = time.perf_counter()
+    for i, ch in enumerate(typed):
+        session.edit(position + i, 0, ch)
+    return (time.perf_counter() - start) * 1000 / len(typed)
+
+
+def main():
+    rng = random.Random(42)
+    translator = RanchiTranslator()
+    terms = make_terms(10000, rng)
+    translator.terms_dict = terms
+    term_list = list(terms)
+    typed = make_sentence(term_list, rng, words=10, density=0.4) + " "
+
+    print(f"{'chars':>8} {'full ms':>9} {'end ms':>8} {'middle ms':>10}")
+    for sentences in (10, 100, 1000, 5000):
+        text = " ".join(make_sentence(term_list, rng) for _ in range(sentences))
+
+        start = time.perf_counter()
+        translator.translate_sentence(text)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        session = TranslationSession(translator, text)
+        end_ms = type_into(session, len(session.text), typed)
+        middle_ms = type_into(session, len(session.text) // 2, typed)
+        assert session.result() == translator.translate_sentence(session.text)
+
+        print(f"{len(text):>8} {full_ms:>9.3f} {end_ms:>8.3f} {middle_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Synthetic dictionaries and corpora for the Ranchi translator benchmarks
+Run directly to write a terms file and a corpus to disk
+"""
+
+import argparse
+import os
+import random
+from typing import Dict, Iterator, List
+
+SYLLABLES = ["ra", "nchi", "li", "tti", "cho", "kha", "dhu", "ska", "ba", "re",
+             "kai", "se", "ho", "the", "ek", "bha", "hut", "a", "cha", "pi"]
+
+FILLER_WORDS = ["aur", "hai", "yahan", "khao", "try", "very", "the", "is", "near", "good"]
+
+# Definition shapes covering every /terms category
+DEFINITIONS = [
+    "Traditional dish made from {}",
+    "Local snack, {} style",
+    "Casual greeting among friends ({})",
+    "Busy area near the {} chowk",
+    "Everyday phrase meaning {}"
+]
+
+
+def make_terms(count: int, rng: random.Random) -> Dict[str, str]:
+    """Generate a synthetic dictionary of one to three word phrases"""
+    terms = {}
+    while len(terms) < count:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(1, 3))]
+        phrase = " ".join(words)
+        terms[phrase] = rng.choice(DEFINITIONS).format(phrase)
+    return terms
+
+
+def make_sentence(terms: List[str], rng: random.Random, words: int = 20,
+                  density: float = 0.25) -> str:
+    """Build a sentence where roughly `density` of the words start a known term"""
+    parts = []
+    for _ in range(words):
+        if terms and rng.random() < density:
+            parts.append(rng.choice(terms).title())
+        else:
+            parts.append(rng.choice(FILLER_WORDS))
+    return " ".join(parts) + "."
+
+
+def make_corpus(terms: List[str], rng: random.Random, lines: int, words: int = 20,
+                density: float = 0.25) -> Iterator[str]:
+    """Lazily generate corpus lines"""
+    for _ in range(lines):
+        yield make_sentence(terms, rng, words, density)
+
+
+def write_terms_file(terms: Dict[str, str], path: str) -> None:
+    """Write terms in the markdown format RanchiTranslator parses"""
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("# Synthetic Ranchi terms\n\n")
+        for term, definition in terms.items():
+            file.write(f"- **{term}** = {definition}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic terms file and corpus")
+    parser.add_argument("--terms", type=int, default=10000, help="dictionary size")
+    parser.add_argument("--lines", type=int, default=100000, help="corpus lines")
+    parser.add_argument("--words", type=int, default=20, help="words per line")
+    parser.add_argument("--density", type=float, default=0.25, help="share of words that start a term")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out-dir", default=".", help="where to write terms.md and corpus.txt")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    terms = make_terms(args.terms, rng)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    terms_path = os.path.join(args.out_dir, "terms.md")
+    corpus_path = os.path.join(args.out_dir, "corpus.txt")
+    write_terms_file(terms, terms_path)
+    with open(corpus_path, 'w', encoding='utf-8') as file:
+        for line in make_corpus(list(terms), rng, args.lines, args.words, args.density):
+            file.write(line + "\n")
+
+    print(f"✅ Wrote {len(terms)} terms to {terms_path} and {args.lines} lines to {corpus_path}")
+
+
+if __name__ == "__main__":
+    main()
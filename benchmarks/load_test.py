@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Local HTTP load test for the translator API
+Runs concurrent keep-alive clients against one or more servers and reports
+requests/sec and latency percentiles, e.g. the Flask dev server vs serve.py:
+
+    python start_server.py                    # http://localhost:5000
+    python serve.py --bind 127.0.0.1:8000
+    python benchmarks/load_test.py http://localhost:5000 http://localhost:8000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Add repository root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_benchmarks import latency_stats
+
+SENTENCES = [
+    "Arre baba, Litti Chokha khao, bahut acha hai",
+    "Kaise ho re? Dhuska try kiya hai?",
+    "Theek ba dada, ghar aa jao",
+    "This sentence has no local terms",
+    "Arre baba, kaise ho re, dhuska aur litti chokha dono bahut acha hai"
+]
+
+
+def client(url: str, path: str, deadline: float, samples: list, errors: list, seed: int) -> None:
+    """One keep-alive connection sending requests until the deadline"""
+    rng = random.Random(seed)
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    while time.perf_counter() < deadline:
+        if path == '/translate':
+            body = json.dumps({'sentence': rng.choice(SENTENCES)})
+            args = ('POST', path, body, {'Content-Type': 'application/json'})
+        else:
+            args = ('GET', path)
+
+        start = time.perf_counter()
+        try:
+            connection.request(*args)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+            else:
+                samples.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    connection.close()
+
+
+def run(url: str, path: str, concurrency: int, duration: float) -> dict:
+    samples, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=client, args=(url, path, deadline, samples, errors, i))
+               for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = latency_stats(samples) if samples else {}
+    stats.update({"requests_per_sec": len(samples) / elapsed, "errors": len(errors)})
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load test for the translator API")
+    parser.add_argument("urls", nargs="+", help="server base URLs, e.g. http://localhost:5000")
+    parser.add_argument("--path", default="/translate", choices=["/translate", "/terms"])
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per server")
+    args = parser.parse_args()
+
+    print(f"{args.path}, {args.concurrency} connections, {args.duration:.0f}s per server")
+    print(f"{'server':<32} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for url in args.urls:
+        stats = run(url.rstrip('/'), args.path, args.concurrency, args.duration)
+        print(f"{url:<32} {stats['requests_per_sec']:>10,.0f} {stats.get('p50_ms', 0):>9.2f} "
+              f"{stats.get('p99_ms', 0):>9.2f} {stats['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the translation hot path
+Measures load_terms, find_terms_in_sentence, translate_sentence and the Flask
+/translate and /terms endpoints against synthetic dictionaries, and saves the
+results as JSON so runs from different commits can be compared.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+# Add repository root to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# Measure the real translation path, not the result cache
+os.environ.setdefault('RANCHI_CACHE_SIZE', '0')
+
+from corpus import make_sentence, make_terms, write_terms_file
+from ranchi_translator import RanchiTranslator
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+DEFAULT_DENSITIES = [0.0, 0.1, 0.5]
+
+
+def latency_stats(samples: List[float]) -> Dict:
+    """Percentiles (ms) and throughput for a list of per-call durations in seconds"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    return {
+        "calls": len(ordered),
+        "mean_ms": total / len(ordered) * 1000,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+        "throughput_per_sec": len(ordered) / total if total else float('inf')
+    }
+
+
+def time_calls(func: Callable, inputs: List) -> Dict:
+    """Call func once per input and summarize the latencies"""
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    return latency_stats(samples)
+
+
+def peak_memory(func: Callable) -> int:
+    """Peak bytes allocated by Python while running func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def quiet(func: Callable) -> Callable:
+    """Wrap func so the translator's load messages don't clutter the report"""
+    def wrapper(*args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def bench_load(terms_file: str, workdir: str) -> Dict:
+    """Parse the markdown file vs load the compiled artifact"""
+    load = quiet(RanchiTranslator)
+
+    start = time.perf_counter()
+    translator = load(terms_file, use_compiled=False)
+    parse_ms = (time.perf_counter() - start) * 1000
+
+    compiled_file = os.path.join(workdir, "terms.compiled")
+    translator.save_compiled(compiled_file, terms_file)
+    start = time.perf_counter()
+    load(terms_file, compiled_file=compiled_file)
+    compiled_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "parse_ms": parse_ms,
+        "compiled_ms": compiled_ms,
+        "parse_peak_bytes": peak_memory(lambda: load(terms_file, use_compiled=False)),
+        "compiled_peak_bytes": peak_memory(lambda: load(terms_file, compiled_file=compiled_file))
+    }, translator
+
+
+def bench_translator(translator: RanchiTranslator, sentences: List[str]) -> Dict:
+    """Latency of matching and of full translation"""
+    translate_all = lambda: [translator.translate_sentence(s) for s in sentences[:200]]
+    return {
+        "find_terms_in_sentence": time_calls(translator.find_terms_in_sentence, sentences),
+        "translate_sentence": time_calls(translator.translate_sentence, sentences),
+        "translate_peak_bytes": peak_memory(translate_all)
+    }
+
+
+def bench_flask(client, sentences: List[str], requests: int) -> Dict:
+    """Latency of the web endpoints through the Flask test client"""
+    bodies = [{'sentence': s} for s in sentences[:requests]]
+    return {
+        "translate": time_calls(lambda body: client.post('/translate', json=body), bodies),
+        "terms": time_calls(lambda _: client.get('/terms'), range(min(requests, 50))),
+        "terms_page": time_calls(lambda page: client.get(f'/terms?page={page % 5 + 1}&per_page=50'),
+                                 range(requests))
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def flatten(prefix: str, value, out: Dict) -> Dict:
+    """Flatten nested results into 'a.b.c' -> number"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flatten(f"{prefix}.{key}" if prefix else str(key), item, out)
+    elif isinstance(value, (int, float)):
+        out[prefix] = value
+    return out
+
+
+def compare(baseline_path: str, results: Dict) -> None:
+    """Print latency/throughput/memory changes against a previous results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    old = flatten("", baseline["runs"], {})
+    new = flatten("", results["runs"], {})
+    print(f"\n📊 Compared with {baseline['meta']['commit']} ({baseline_path}):")
+    for key in sorted(new):
+        if key not in old or not key.endswith(("p50_ms", "p99_ms", "throughput_per_sec", "_bytes")):
+            continue
+        if old[key]:
+            change = (new[key] - old[key]) / old[key] * 100
+            print(f"   {key:<60} {old[key]:>12.3f} → {new[key]:>12.3f}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Ranchi translator hot path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="dictionary sizes")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES,
+                        help="share of sentence words that start a term")
+    parser.add_argument("--sentences", type=int, default=500, help="sentences per density")
+    parser.add_argument("--requests", type=int, default=200, help="HTTP requests per endpoint")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as web_app
+    client = web_app.app.test_client()
+
+    rng = random.Random(args.seed)
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sentences": args.sentences,
+            "requests": args.requests
+        },
+        "runs": {}
+    }
+
+    for size in args.sizes:
+        terms = make_terms(size, rng)
+        term_list = list(terms)
+        run = {}
+
+        with tempfile.TemporaryDirectory() as workdir:
+            terms_file = os.path.join(workdir, "terms.md")
+            write_terms_file(terms, terms_file)
+            run["load_terms"], translator = bench_load(terms_file, workdir)
+
+        web_app.translator.terms_dict = translator.terms_dict
+
+        for density in args.densities:
+            sentences = [make_sentence(term_list, rng, density=density) for _ in range(args.sentences)]
+            run[f"density_{density}"] = {
+                **bench_translator(translator, sentences),
+                "flask": bench_flask(client, sentences, args.requests)
+            }
+
+        results["runs"][f"terms_{size}"] = run
+        translate = run[f"density_{args.densities[-1]}"]["translate_sentence"]
+        print(f"✅ {size:>7} terms: load {run['load_terms']['parse_ms']:.1f} ms "
+              f"(compiled {run['load_terms']['compiled_ms']:.1f} ms), translate p50 "
+              f"{translate['p50_ms']:.3f} ms / p99 {translate['p99_ms']:.3f} ms "
+              f"at density {args.densities[-1]}")
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results",
+        f"{results['meta']['commit']}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Shared test fixtures for the Ranchi Local Guide Translator
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from ranchi_translator import RanchiTranslator
+
+
+@pytest.fixture
+def make_translator():
+    """
+    Factory for translators built without their startup output
+    make_translator(path, **options) loads a terms file (or database); make_translator(terms)
+    starts from a dict of terms instead. Compiled artifacts are only used if use_compiled=True.
+    """
+    def make(source=None, **options):
+        options.setdefault("use_compiled", False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if source is None or isinstance(source, dict):
+                translator = RanchiTranslator("-missing-", **options)
+                if source is not None:
+                    translator.terms_dict = dict(source)
+            else:
+                translator = RanchiTranslator(str(source), **options)
+        return translator
+    return make
@@ -0,0 +1,45 @@
+"""
+Gunicorn settings for the Ranchi Local Guide Translator
+Used by serve.py, or directly: gunicorn -c gunicorn.conf.py asgi:application
+"""
+
+import gc
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get('RANCHI_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('RANCHI_WORKERS', multiprocessing.cpu_count()))
+backlog = int(os.environ.get('RANCHI_BACKLOG', '2048'))
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Import the app (and so load the dictionary) once in the master process;
+# forked workers share those pages copy-on-write instead of each loading them
+preload_app = True
+
+# /admin/reload reaches one worker; it announces the new dictionary in this file and the
+# other workers follow (set before the app is imported, so app.py sees it)
+os.environ.setdefault('RANCHI_RELOAD_FILE', os.path.join(tempfile.gettempdir(), f'ranchi-reload-{os.getpid()}'))
+
+try:
+    import uvicorn_worker  # noqa: F401
+    worker_class = 'uvicorn_worker.UvicornWorker'
+except ImportError:
+    worker_class = 'uvicorn.workers.UvicornWorker'
+
+
+def pre_fork(server, worker):
+    # Park everything loaded so far in the permanent GC generation, so collections in
+    # the workers don't write to (and un-share) the preloaded dictionary's pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork: restart the terms file watcher in each worker
+    from app import RELOAD_FILE, WATCH_INTERVAL, translator
+    if translator and WATCH_INTERVAL > 0:
+        translator.watch_terms_file(WATCH_INTERVAL)
+    if translator and RELOAD_FILE:
+        translator.follow_reloads(RELOAD_FILE)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compact term storage for the Ranchi Local Guide Translator
+Keeps large dictionaries in a few contiguous buffers instead of one Python
+string object per definition, and shares its term strings with the phrase matcher
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Iterator, Mapping as MappingType, Optional, Sequence, Tuple
+
+
+class CompactTermStore(Mapping):
+    """
+    Read-only term -> definition mapping packed into a UTF-8 buffer
+
+    Deduplicated definitions are stored back to back in one bytes object
+    addressed by an offset array. Terms are not copied: they are looked up in a
+    term table, normally the phrase matcher's term list, through an
+    open-addressing table of table positions keyed by the terms' hashes, so no
+    per-term dict entry or string is kept. Iteration follows the insertion
+    order of the source mapping.
+    """
+
+    def __init__(self, terms: MappingType[str, str], term_table: Optional[Sequence[str]] = None):
+        position = {term: index for index, term in enumerate(term_table or ())}
+        if term_table is None or any(term not in position for term in terms):
+            term_table = list(terms)
+            position = {term: index for index, term in enumerate(term_table)}
+        self._keys: Sequence[str] = term_table
+
+        definition_parts = []
+        definition_offsets = array('I', [0])
+        # Table position -> definition number (-1 for table terms not in this mapping)
+        definition_ids = array('i', [-1]) * len(term_table)
+        order = array('I')
+        seen = {}
+
+        for term, definition in terms.items():
+            definition_id = seen.get(definition)
+            if definition_id is None:
+                definition_id = seen[definition] = len(seen)
+                encoded = definition.encode('utf-8')
+                definition_parts.append(encoded)
+                definition_offsets.append(definition_offsets[-1] + len(encoded))
+            index = position[term]
+            definition_ids[index] = definition_id
+            order.append(index)
+
+        self._definitions = b''.join(definition_parts)
+        self._definition_offsets = definition_offsets
+        self._definition_ids = definition_ids
+        self._order = order
+        self._build_table()
+
+    def _build_table(self) -> None:
+        """Hash table of term positions, at most half full"""
+        size = 8
+        while size < 2 * len(self._order):
+            size *= 2
+        self._mask = size - 1
+        table = array('i', [-1]) * size
+
+        keys = self._keys
+        for index in self._order:
+            slot = hash(keys[index]) & self._mask
+            while table[slot] != -1:
+                slot = (slot + 1) & self._mask
+            table[slot] = index
+        self._table = table
+
+    def _find(self, term: str) -> int:
+        """Table position of term, or -1"""
+        keys, table, mask = self._keys, self._table, self._mask
+        slot = hash(term) & mask
+        while True:
+            index = table[slot]
+            if index == -1 or keys[index] == term:
+                return index
+            slot = (slot + 1) & mask
+
+    def _definition(self, index: int) -> str:
+        definition_id = self._definition_ids[index]
+        offsets = self._definition_offsets
+        return self._definitions[offsets[definition_id]:offsets[definition_id + 1]].decode('utf-8')
+
+    def __getitem__(self, term: str) -> str:
+        index = self._find(term) if isinstance(term, str) else -1
+        if index == -1:
+            raise KeyError(term)
+        return self._definition(index)
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and self._find(term) != -1
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._keys
+        for index in self._order:
+            yield keys[index]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """(term, definition) pairs in insertion order, without per-item lookups"""
+        keys = self._keys
+        for index in self._order:
+            yield keys[index], self._definition(index)
+
+    def nbytes(self) -> int:
+        """Bytes held by the definition buffer, offset arrays and hash table (the term table is shared)"""
+        arrays = (self._definition_offsets, self._definition_ids, self._order, self._table)
+        return len(self._definitions) + sum(len(a) * a.itemsize for a in arrays)
+
+    @property
+    def unique_definitions(self) -> int:
+        return len(self._definition_offsets) - 1
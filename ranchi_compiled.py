@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Compiled dictionary artifact for the Ranchi Local Guide Translator
+Stores the parsed terms, rendering templates and the prebuilt phrase matcher so
+startup is a single read
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+from ranchi_matcher import PhraseMatcher
+
+MAGIC = b"RLGDICT\0"
+FORMAT_VERSION = 3
+COMPILED_SUFFIX = ".compiled"
+
+# Magic, then the length of the JSON header that follows
+_PREFIX = struct.Struct(">8sI")
+
+
+def compiled_path_for(source_path: str) -> str:
+    """Default artifact location next to the source terms file"""
+    return source_path + COMPILED_SUFFIX
+
+
+def file_sha256(path: str) -> str:
+    """Checksum of a terms source file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_compiled(output_path: str, terms_dict: Dict[str, str], matcher: PhraseMatcher,
+                   source_path: Optional[str] = None, renderings: Optional[Dict[str, str]] = None) -> None:
+    """Write terms, templates and matcher state to output_path, stamped with the source checksum"""
+    payload = marshal.dumps({
+        "terms": dict(terms_dict.items()),
+        "renderings": dict(renderings or {}),
+        "matcher": matcher.to_state()
+    })
+
+    header = {
+        "version": FORMAT_VERSION,
+        "term_count": len(terms_dict),
+        "payload_crc32": zlib.crc32(payload),
+        "source_sha256": None,
+        "source_size": None,
+        "source_mtime_ns": None
+    }
+    if source_path and os.path.exists(source_path):
+        stat = os.stat(source_path)
+        header["source_sha256"] = file_sha256(source_path)
+        header["source_size"] = stat.st_size
+        header["source_mtime_ns"] = stat.st_mtime_ns
+
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    # Write to a temporary file first so readers never see a partial artifact
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        file.write(header_bytes)
+        file.write(payload)
+    os.replace(tmp_path, output_path)
+
+
+def read_header(data: bytes) -> Tuple[Dict, int]:
+    """Parse the artifact header; returns (header, payload offset)"""
+    magic, header_len = _PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a compiled Ranchi dictionary")
+    start = _PREFIX.size
+    header = json.loads(data[start:start + header_len].decode('utf-8'))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"unsupported dictionary format version {header.get('version')}")
+    return header, start + header_len
+
+
+def is_fresh(header: Dict, source_path: Optional[str]) -> bool:
+    """Check the artifact against its source; size and mtime first, checksum if they differ"""
+    if not source_path or not os.path.exists(source_path):
+        # Deployments may ship the artifact without the markdown source
+        return True
+    if header.get("source_sha256") is None:
+        return False
+
+    stat = os.stat(source_path)
+    if stat.st_size != header.get("source_size"):
+        return False
+    if stat.st_mtime_ns == header.get("source_mtime_ns"):
+        return True
+    return file_sha256(source_path) == header["source_sha256"]
+
+
+def load_compiled(path: str, source_path: Optional[str] = None
+                  ) -> Optional[Tuple[Dict[str, str], PhraseMatcher, Dict[str, str], Dict]]:
+    """
+    Load a compiled dictionary with a single read
+    Returns: (terms_dict, matcher, renderings, header), or None if the artifact is missing,
+    stale against source_path, or corrupt
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        header, offset = read_header(data)
+        if not is_fresh(header, source_path):
+            return None
+
+        payload = memoryview(data)[offset:]
+        if zlib.crc32(payload) != header["payload_crc32"]:
+            raise ValueError("payload checksum mismatch")
+
+        content = marshal.loads(payload)
+        return content["terms"], PhraseMatcher.from_state(content["matcher"]), content["renderings"], header
+
+    except Exception as e:
+        print(f"⚠️  Ignoring compiled dictionary {path}: {e}")
+        return None
+
+
+def main():
+    """Build a compiled dictionary from a terms file"""
+    from ranchi_translator import DEFAULT_TERMS_FILE, RanchiTranslator
+
+    parser = argparse.ArgumentParser(description="Compile a Ranchi terms file for fast startup")
+    parser.add_argument("terms_file", nargs="?", default=DEFAULT_TERMS_FILE,
+                        help="markdown/text terms file to compile")
+    parser.add_argument("-o", "--output", help=f"artifact path (default: <terms_file>{COMPILED_SUFFIX})")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.terms_file):
+        parser.error(f"{args.terms_file} not found")
+
+    output = args.output or compiled_path_for(args.terms_file)
+    translator = RanchiTranslator(args.terms_file, use_compiled=False)
+    translator.save_compiled(output)
+    print(f"✅ Compiled {len(translator.terms_dict)} terms to {output}")
+
+
+if __name__ == "__main__":
+    main()
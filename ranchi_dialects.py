@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Dialect dictionaries for the Ranchi Local Guide Translator
+Regional vocabularies (Nagpuri, Khortha, Sadri, ...) are separate terms files,
+each loaded (or compiled) on its own and layered over the base dictionary. Every
+stack of layers gets one merged snapshot with its own phrase matcher, so a
+sentence is matched once against the whole stack rather than per dictionary.
+"""
+
+import os
+import threading
+from collections import ChainMap, OrderedDict
+from typing import Dict, List, Sequence, Tuple, Union
+
+# Name of the translator's main dictionary in a stack
+BASE_LAYER = "base"
+
+# Merged stacks kept per translator; the least recently used is dropped first
+MAX_STACKS = 8
+
+# Files in a dialects directory that are loaded as shards (compiled artifacts are found next to them)
+SHARD_EXTENSIONS = (".db", ".md", ".txt")
+
+
+def discover_dialects(directory: str) -> Dict[str, str]:
+    """Dialect name -> terms file for each terms file in directory (nagpuri.md is "nagpuri")"""
+    if not directory or not os.path.isdir(directory):
+        return {}
+
+    shards = {}
+    for entry in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(entry)
+        name = name.lower()
+        if extension.lower() in SHARD_EXTENSIONS and name != BASE_LAYER:
+            # A database built from nagpuri.md sorts first and is preferred
+            shards.setdefault(name, os.path.join(directory, entry))
+    return shards
+
+
+class DialectStacks:
+    """
+    Merged dictionary snapshots for stacks of layers, built on first use
+
+    A stack lists layers lowest first; a term in a higher layer overrides the
+    same term below it. Shards are loaded once and shared by every stack using
+    them, and a stack's terms are a view over its layers, so definitions are
+    never copied. At most max_stacks merged snapshots are kept.
+
+    A stack is built outside the main lock, under a lock of its own, so lookups
+    of other stacks go on while it compiles. clear() starts a new generation;
+    stacks and shards loaded for an older one are returned but not kept.
+    """
+
+    def __init__(self, translator, shards: Dict[str, str], max_stacks: int = MAX_STACKS):
+        self.translator = translator
+        self.shards = dict(shards)
+        self.max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._layers: Dict = {}
+        self._stacks: "OrderedDict[Tuple[str, ...], object]" = OrderedDict()
+        # layers -> lock held while that stack is built
+        self._building: Dict[Tuple[str, ...], threading.Lock] = {}
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._stacks)
+
+    @property
+    def names(self) -> List[str]:
+        """Layers a stack can use"""
+        return [BASE_LAYER] + sorted(self.shards)
+
+    def resolve(self, dialect: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        """
+        Layers for a dialect: a name means the base dictionary plus that dialect,
+        a list names every layer, lowest first. ValueError for unknown layers.
+        """
+        if isinstance(dialect, str):
+            layers = [BASE_LAYER, dialect] if dialect.strip().lower() != BASE_LAYER else [BASE_LAYER]
+        elif isinstance(dialect, (list, tuple)) and dialect and all(isinstance(name, str) for name in dialect):
+            layers = list(dialect)
+        else:
+            raise ValueError("dialect must be a name or a non-empty list of layer names")
+
+        layers = tuple(name.strip().lower() for name in layers)
+        for name in layers:
+            if name != BASE_LAYER and name not in self.shards:
+                raise ValueError(f"unknown dialect '{name}' (available: {', '.join(self.names)})")
+        if len(set(layers)) != len(layers):
+            raise ValueError("a layer can appear only once in a dialect stack")
+        return layers
+
+    def snapshot(self, layers: Tuple[str, ...]):
+        """The merged snapshot for resolved layers, building it if it is not cached"""
+        # A clear() from here on (a reload, or the base being rebuilt by the next line) makes
+        # this build stale. The base is read before taking any lock, since rebuilding it clears.
+        generation = self._generation
+        base = self.translator.snapshot
+        if layers == (BASE_LAYER,):
+            return base
+
+        with self._lock:
+            snapshot = self._cached(layers)
+            if snapshot is not None:
+                return snapshot
+            building = self._building.setdefault(layers, threading.Lock())
+
+        # Concurrent requests for a new stack wait here for the first one to build it
+        with building:
+            with self._lock:
+                snapshot = self._cached(layers)
+                if snapshot is not None:
+                    return snapshot
+            try:
+                snapshot = self._build(layers, base, generation)
+            finally:
+                # Published in the same step, so no request finds neither the stack nor its builder
+                with self._lock:
+                    self._building.pop(layers, None)
+                    if snapshot is not None and generation == self._generation:
+                        self._stacks[layers] = snapshot
+                        while len(self._stacks) > self.max_stacks:
+                            self._stacks.popitem(last=False)
+            return snapshot
+
+    def _cached(self, layers: Tuple[str, ...]):
+        """The cached snapshot for layers, marked as used; call with the lock held"""
+        snapshot = self._stacks.get(layers)
+        if snapshot is not None:
+            self._stacks.move_to_end(layers)
+        return snapshot
+
+    def peek(self, layers: Tuple[str, ...]):
+        """The cached snapshot for layers, or None; does not count as a use"""
+        return self._stacks.get(layers)
+
+    def clear(self) -> None:
+        """Forget loaded shards and stacks, e.g. after the base dictionary was reloaded"""
+        with self._lock:
+            self._layers.clear()
+            self._stacks.clear()
+            self._generation += 1
+
+    def _layer(self, name: str, generation: int):
+        layer = self._layers.get(name)
+        if layer is None:
+            path = self.shards[name]
+            try:
+                layer = self.translator._load_snapshot(path, strict=True)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"dialect '{name}' could not be loaded: {e}") from e
+            with self._lock:
+                # Two stacks may load a shard at once; the first one stored is shared
+                if generation == self._generation:
+                    layer = self._layers.setdefault(name, layer)
+        return layer
+
+    def _build(self, layers: Tuple[str, ...], base, generation: int):
+        snapshots = [base if name == BASE_LAYER else self._layer(name, generation) for name in layers]
+        # ChainMap looks keys up in its first map first, so the top layer goes first
+        terms = ChainMap(*[snapshot.terms_dict for snapshot in reversed(snapshots)])
+        # A definition and its template go together: a layer redefining a term without
+        # a template of its own drops the template a lower layer gave it
+        renderings = {}
+        for snapshot in snapshots:
+            for term in [term for term in renderings if term in snapshot.terms_dict]:
+                del renderings[term]
+            renderings.update(snapshot.renderings)
+        return self.translator._stack_snapshot(layers, terms, renderings, snapshots)
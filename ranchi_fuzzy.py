@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Fuzzy matching for the Ranchi Local Guide Translator
+Finds dictionary terms typed in a different romanization ("dhooska" for
+"dhuska", "kaisan ho re" for "kaise ho re"). Words are reduced to phonetic
+keys, and a deletion-neighbourhood index over the term keys turns each
+candidate lookup into a few binary searches instead of comparing every term.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Collection, List, Optional, Sequence, Tuple
+
+# Spelling variants that romanized Hindi/Nagpuri uses interchangeably
+_KEY_RULES = [
+    (re.compile(r'([bcdgjkpt])h'), r'\1'),   # aspirates: dh/d, kh/k, chh/ch
+    (re.compile(r'sh'), 's'),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'[wz]'), lambda m: 'v' if m.group() == 'w' else 'j'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'oo|ou'), 'u'),
+    (re.compile(r'ee|ea'), 'i'),
+    (re.compile(r'y$'), 'i'),
+    (re.compile(r'(.)\1+'), r'\1'),          # doubled letters: aaja/aja, accha/acha
+    (re.compile(r'(?<=[aeiou])n$'), ''),     # nasal endings: hain/hai, kaisan/kaisa
+    (re.compile(r'(?<=\w{3})[aeiou]$'), ''), # final vowels: kaisa/kaise, chokha/chokh
+]
+_WORD = re.compile(r'\w+')
+
+# Longest term (in words) the sentence scan tries to match
+MAX_PHRASE_WORDS = 6
+
+# Keys this short must match exactly; one edit would make them something else
+MIN_FUZZY_LENGTH = 4
+
+# Window keys whose candidates are remembered per index (common words repeat a lot)
+CANDIDATE_CACHE_SIZE = 65536
+
+# Index entries pack a 39-bit key hash above a 24-bit term id
+_ID_BITS = 24
+_ID_MASK = (1 << _ID_BITS) - 1
+_HASH_MASK = (1 << 39) - 1
+
+
+@lru_cache(maxsize=65536)
+def phonetic_key(word: str) -> str:
+    """Spelling-insensitive key for one lowercase word"""
+    for pattern, replacement in _KEY_RULES:
+        word = pattern.sub(replacement, word)
+    return word
+
+
+def phrase_key(text: str) -> str:
+    """Phonetic keys of the words in text, space separated"""
+    return " ".join(phonetic_key(word) for word in _WORD.findall(text.lower()))
+
+
+def similarity(a: str, b: str, minimum: float = 0.0) -> float:
+    """
+    1 - Levenshtein distance / length of the longer string
+    Only the band of the distance table that can stay above minimum is filled;
+    returns 0.0 as soon as the result is known to be below minimum
+    """
+    if a == b:
+        return 1.0
+    longest = max(len(a), len(b))
+    limit = int((1.0 - minimum) * longest + 1e-9)
+    if abs(len(a) - len(b)) > limit:
+        return 0.0
+
+    # Common prefixes and suffixes never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+
+    over = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        row_best = current[0]
+        for j in range(low, high + 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != b[j - 1]))
+            current[j] = cost
+            if cost < row_best:
+                row_best = cost
+        if row_best > limit:
+            return 0.0
+        previous = current
+    distance = previous[-1]
+    return 1.0 - distance / longest if distance <= limit else 0.0
+
+
+def _variants(key: str) -> List[str]:
+    """The key itself and, unless it is short, every key one deletion away"""
+    if len(key) < MIN_FUZZY_LENGTH:
+        return [key]
+    return [key] + [key[:i] + key[i + 1:] for i in range(len(key))]
+
+
+class FuzzyIndex:
+    """
+    Deletion-neighbourhood index over the phonetic keys of dictionary terms
+
+    Two keys within one edit of each other share a one-deletion variant, so a
+    lookup probes the variants of the window's key and only scores the terms
+    found there. Entries are packed into one sorted array of 64-bit ints
+    (about 8 bytes per variant) instead of a dict. A second array holds the
+    variants of every word used in a term, so multi-word windows containing
+    a word that is nowhere near the dictionary are skipped without a lookup.
+
+    Term ids are positions in the sequence given to the constructor (the
+    PhraseMatcher's longest-first order).
+    """
+
+    # Fuzzy matches are never reported as certain as exact ones
+    MAX_CONFIDENCE = 0.95
+    # Share of the confidence given to the phonetic keys vs the spelling as typed
+    KEY_WEIGHT = 0.6
+
+    def __init__(self, terms: Sequence[str]):
+        if len(terms) > _ID_MASK:
+            raise ValueError(f"fuzzy index supports at most {_ID_MASK} terms")
+
+        self.terms = terms
+        self._keys: List[str] = []
+        self.max_words = 0
+        packed = []
+        words = set()
+
+        for term_id, term in enumerate(terms):
+            key = phrase_key(term)
+            self._keys.append(key)
+            self.max_words = max(self.max_words, min(key.count(" ") + 1, MAX_PHRASE_WORDS))
+            for variant in set(_variants(key)):
+                packed.append(((hash(variant) & _HASH_MASK) << _ID_BITS) | term_id)
+            words.update(key.split(" "))
+
+        packed.sort()
+        self._entries = array('q', packed)
+        self._word_entries = array('q', sorted({hash(variant) for word in words
+                                                for variant in _variants(word)}))
+        self._candidate_cache = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _near_word(self, word_key: str) -> bool:
+        """True if word_key is within one edit of a word used in some term"""
+        entries = self._word_entries
+        for variant in _variants(word_key):
+            value = hash(variant)
+            i = bisect_left(entries, value)
+            if i < len(entries) and entries[i] == value:
+                return True
+        return False
+
+    def _candidates(self, key: str) -> Tuple[int, ...]:
+        """Ids of terms sharing a one-deletion variant with key"""
+        cached = self._candidate_cache.get(key)
+        if cached is not None:
+            return cached
+
+        entries = self._entries
+        size = len(entries)
+        found = set()
+        for variant in _variants(key):
+            prefix = hash(variant) & _HASH_MASK
+            i = bisect_left(entries, prefix << _ID_BITS)
+            while i < size and entries[i] >> _ID_BITS == prefix:
+                found.add(entries[i] & _ID_MASK)
+                i += 1
+
+        if len(self._candidate_cache) >= CANDIDATE_CACHE_SIZE:
+            self._candidate_cache.clear()
+        found = self._candidate_cache[key] = tuple(found)
+        return found
+
+    def lookup(self, text_lower: str, key: str, min_confidence: float) -> Optional[Tuple[int, float]]:
+        """Best (term_id, confidence) for a window of text and its phonetic key, or None"""
+        best, best_confidence = None, 0.0
+        spelling_weight = 1 - self.KEY_WEIGHT
+        for term_id in self._candidates(key):
+            term_key = self._keys[term_id]
+            if term_key == key:
+                key_score = 1.0
+            elif len(key) < MIN_FUZZY_LENGTH:
+                continue
+            else:
+                # Keys sharing a one-deletion variant are at most two edits apart
+                key_score = similarity(key, term_key, 1 - 2 / max(len(key), len(term_key)))
+
+            # Score the spelling only as far as it can still beat the best candidate
+            needed = max(min_confidence, best_confidence) - self.KEY_WEIGHT * key_score
+            if needed > spelling_weight:
+                continue
+            spelling_score = similarity(text_lower, self.terms[term_id], max(needed, 0.0) / spelling_weight)
+            confidence = min(self.MAX_CONFIDENCE, self.KEY_WEIGHT * key_score + spelling_weight * spelling_score)
+            if confidence > best_confidence or (best is not None and confidence == best_confidence
+                                                and term_id < best):
+                best, best_confidence = term_id, confidence
+
+        if best is None or best_confidence < min_confidence:
+            return None
+        return best, best_confidence
+
+    def find_spans(self, text_lower: str, min_confidence: float,
+                   exact: Collection[Tuple[int, int]] = ()) -> List[Tuple[int, int, int, float]]:
+        """
+        Fuzzy matches in a lowercase sentence as (start, end, term_id, confidence)
+        Windows are runs of up to max_words words separated only by spaces or
+        hyphens; windows already in exact (as (start, end)) are skipped.
+        """
+        words = [(m.start(), m.end(), phonetic_key(m.group())) for m in _WORD.finditer(text_lower)]
+        near = [self.max_words > 1 and self._near_word(key) for _, _, key in words]
+        found = []
+
+        for i, (start, end, key) in enumerate(words):
+            for n in range(self.max_words):
+                if n:
+                    # Phrases only continue over dictionary-like words joined by spaces
+                    if i + n >= len(words) or not (near[i] and near[i + n]):
+                        break
+                    next_start, end, word_key = words[i + n]
+                    if text_lower[words[i + n - 1][1]:next_start].strip(" -\t"):
+                        break
+                    key = f"{key} {word_key}"
+                if (start, end) in exact:
+                    continue
+                match = self.lookup(text_lower[start:end], key, min_confidence)
+                if match is not None:
+                    found.append((start, end, match[0], match[1]))
+        return found
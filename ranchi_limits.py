@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Request admission for the Ranchi Local Guide Translator web API
+Each request is given a cost from the length of its input (fuzzy matching costs
+more). A per-client token bucket limits the cost a client may spend per second,
+a size cap rejects inputs that are too long to translate, and a budget on the
+total cost in flight makes further work wait briefly, then turns it away.
+"""
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# One cost unit per this many characters of input, plus one for the request itself
+COST_CHARS_PER_UNIT = 1000
+FUZZY_COST_FACTOR = 4
+
+# Buckets kept by the in-process store; the least recently seen client is dropped first
+MAX_TRACKED_CLIENTS = 100000
+
+
+def request_cost(chars: int, fuzzy: bool = False) -> int:
+    """Cost units for translating chars characters of input"""
+    cost = 1 + chars // COST_CHARS_PER_UNIT
+    return cost * FUZZY_COST_FACTOR if fuzzy else cost
+
+
+class Rejected(Exception):
+    """A request turned away by admission; status is the HTTP status to answer with"""
+
+    def __init__(self, status: int, reason: str, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def headers(self):
+        """(name, value) response headers, with Retry-After in whole seconds when known"""
+        if self.retry_after is None:
+            return []
+        return [('Retry-After', str(max(1, int(self.retry_after + 0.999))))]
+
+
+class ClientIdentity:
+    """
+    Rate limit key for a request: its peer address, or for a request relayed by a
+    trusted proxy, the client address that proxy added to its forwarding header
+    Each proxy appends the address it received the request from, so with hops
+    trusted proxies in a row the client is the hops-th entry from the right;
+    entries further left were sent by the client and are ignored.
+    """
+
+    def __init__(self, trusted_proxies: Sequence[str] = (), hops: int = 1):
+        self.trusted = [ipaddress.ip_network(proxy.strip(), strict=False)
+                        for proxy in trusted_proxies if proxy.strip()]
+        self.hops = max(1, hops)
+
+    def is_trusted(self, peer: Optional[str]) -> bool:
+        if not self.trusted or not peer:
+            return False
+        try:
+            address = ipaddress.ip_address(peer)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted)
+
+    def __call__(self, forwarded: Optional[str], peer: Optional[str]) -> str:
+        if forwarded and self.is_trusted(peer):
+            entries = [entry.strip() for entry in forwarded.split(",") if entry.strip()]
+            # Fewer entries than proxies: the request did not come through all of them
+            if len(entries) >= self.hops:
+                return entries[-self.hops]
+        return peer or "unknown"
+
+
+class MemoryBucketStore:
+    """
+    Token buckets kept in this process
+    With several worker processes each keeps its own buckets, so a client's
+    effective rate is the configured rate times the number of workers.
+    """
+
+    def __init__(self, max_clients: int = MAX_TRACKED_CLIENTS, clock: Callable[[], float] = time.monotonic):
+        self.max_clients = max_clients
+        self._clock = clock
+        self._lock = threading.Lock()
+        # client -> (tokens, updated_at)
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, client: str, cost: float, rate: float, burst: float) -> float:
+        """Spend cost tokens; returns 0 if they were there, else seconds until they will be"""
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(client, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[client] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# Refill and spend in one step on the server, using its clock so all workers agree
+_REDIS_TAKE = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local cost, rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared by every worker through Redis (pip install redis)
+    If Redis cannot be reached, requests are let through rather than failed.
+    """
+
+    def __init__(self, url: str, prefix: str = "ranchi:ratelimit:"):
+        if redis is None:
+            raise RuntimeError("the redis package is required for a Redis rate limit store")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+        self._warned = False
+
+    def take(self, client: str, cost: float, rate: float, burst: float) -> float:
+        try:
+            return float(self._take(keys=[self.prefix + client], args=[cost, rate, burst]))
+        except redis.RedisError as e:
+            if not self._warned:
+                print(f"⚠️  Rate limit store unavailable, not limiting: {e}")
+                self._warned = True
+            return 0.0
+
+
+class RateLimiter:
+    """
+    Per-client token bucket: rate cost units per second, up to burst at once
+    The store can be any object with take(client, cost, rate, burst) -> seconds to wait.
+    """
+
+    def __init__(self, rate: float, burst: float, store=None):
+        self.rate = rate
+        self.burst = burst
+        self.store = store if store is not None else MemoryBucketStore()
+
+    def check(self, client: str, cost: float) -> None:
+        """Spend a request's cost, or raise Rejected (429) if the client has run out"""
+        # A request costing more than the burst would never fit; it empties the bucket instead
+        wait = self.store.take(client, min(cost, self.burst), self.rate, self.burst)
+        if wait > 0:
+            raise Rejected(429, "rate_limited", "Too many requests, retry shortly", wait)
+
+
+class CostBudget:
+    """
+    Total cost of the translations running at once, across request threads
+    Work that would go over the budget waits up to max_wait seconds for running
+    work to finish, then is rejected (503). A request costing more than the whole
+    budget is admitted when nothing else is running.
+    """
+
+    def __init__(self, budget: float, max_wait: float = 2.0):
+        self.budget = budget
+        self.max_wait = max_wait
+        self.in_flight = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, cost: float) -> None:
+        """Hold cost against the budget, waiting up to max_wait; raises Rejected (503)"""
+        deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            while self.in_flight and self.in_flight + cost > self.budget:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Rejected(503, "over_budget", "Server busy, retry shortly", 1)
+                self._condition.wait(remaining)
+            self.in_flight += cost
+
+    def release(self, cost: float) -> None:
+        with self._condition:
+            self.in_flight -= cost
+            self._condition.notify_all()
+
+    @contextmanager
+    def admit(self, cost: float) -> Iterator[None]:
+        self.acquire(cost)
+        try:
+            yield
+        finally:
+            self.release(cost)
+
+
+class RequestLimits:
+    """Size cap, rate limit and cost budget applied to translation requests; None disables a check"""
+
+    def __init__(self, max_chars: Optional[int] = None, limiter: Optional[RateLimiter] = None,
+                 budget: Optional[CostBudget] = None):
+        self.max_chars = max_chars
+        self.limiter = limiter
+        self.budget = budget
+
+    def check(self, client: str, chars: int, fuzzy: bool = False, capped: bool = True) -> int:
+        """
+        Cost of a request with chars characters of input; raises Rejected (413/429)
+        capped=False skips the size cap, for inputs with a cap of their own (sessions)
+        """
+        if capped and self.max_chars and chars > self.max_chars:
+            raise Rejected(413, "too_large", f"Input longer than {self.max_chars} characters")
+        cost = request_cost(chars, fuzzy)
+        if self.limiter is not None:
+            self.limiter.check(client, cost)
+        return cost
+
+    def acquire(self, cost: int) -> None:
+        """Hold cost against the budget until release; raises Rejected (503)"""
+        if self.budget is not None:
+            self.budget.acquire(cost)
+
+    def release(self, cost: int) -> None:
+        if self.budget is not None:
+            self.budget.release(cost)
+
+    @contextmanager
+    def admit(self, cost: int) -> Iterator[None]:
+        """Hold cost against the budget while translating; raises Rejected (503)"""
+        self.acquire(cost)
+        try:
+            yield
+        finally:
+            self.release(cost)
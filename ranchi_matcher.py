@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Phrase matcher for the Ranchi Local Guide Translator
+Finds every dictionary term in a sentence with a single left-to-right scan
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Tags to_state() output; states of another layout are refused by from_state()
+STATE_VERSION = 2
+
+
+def is_word_char(ch: str) -> bool:
+    """Same notion of a word character as the regex \\w class"""
+    return ch.isalnum() or ch == '_'
+
+
+def is_boundary(text: str, pos: int) -> bool:
+    """True when a regex \\b would match at text[pos]"""
+    before = pos > 0 and is_word_char(text[pos - 1])
+    after = pos < len(text) and is_word_char(text[pos])
+    return before != after
+
+
+class TermMatch:
+    """One dictionary term accepted in a sentence"""
+    __slots__ = ('start', 'end', 'term', 'original', 'translation', 'confidence')
+
+    def __init__(self, start: int, end: int, term: str, original: str, translation: str,
+                 confidence: float = 1.0):
+        self.start = start
+        self.end = end
+        self.term = term
+        self.original = original
+        self.translation = translation
+        self.confidence = confidence
+
+    def __repr__(self) -> str:
+        return (f"TermMatch({self.start}, {self.end}, {self.term!r}, {self.original!r}, "
+                f"{self.translation!r}, {self.confidence!r})")
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over lowercase dictionary terms.
+
+    Built once per dictionary; matching a sentence costs O(len(sentence) + matches)
+    no matter how many terms are loaded.
+
+    Nodes are numbered depth first, so a node's first child is the next node. Most
+    nodes have a single child: for those only its character is kept (_edge), and
+    only nodes with several children keep a dict (_branches). The rest is indexed
+    by node: the failure link, the nearest node on the failure chain (itself
+    included) where a term ends, and that term (an int array, -1 where none ends).
+    The first two are lists, as the scan reads them for nearly every character.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        # Term ids follow the longest-first order used for reporting matches
+        self.terms: List[str] = sorted(dict.fromkeys(t for t in terms if t), key=len, reverse=True)
+        self.lengths: List[int] = [len(t) for t in self.terms]
+        self.max_term_length = self.lengths[0] if self.lengths else 0
+
+        self._edge: List[Optional[str]] = []
+        self._branches: Dict[int, Dict[str, int]] = {}
+        self._fail: List[int] = []
+        self._report: List[int] = []
+        self._term_at = array('i')
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def to_state(self) -> Tuple:
+        """Plain lists, dicts and bytes describing the automaton, safe to marshal"""
+        return (STATE_VERSION, self.terms, self.lengths, self._edge, self._branches,
+                self._fail, self._report, self._term_at.tobytes())
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> 'PhraseMatcher':
+        """
+        Rebuild a matcher from to_state() output without redoing the construction
+        Raises ValueError for the state of another matcher version
+        """
+        if not state or state[0] != STATE_VERSION:
+            raise ValueError("phrase matcher state from another version")
+        matcher = cls.__new__(cls)
+        (_, matcher.terms, matcher.lengths, matcher._edge, matcher._branches,
+         matcher._fail, matcher._report, term_at) = state
+        matcher._term_at = array('i')
+        matcher._term_at.frombytes(term_at)
+        matcher.max_term_length = matcher.lengths[0] if matcher.lengths else 0
+        return matcher
+
+    def _build(self) -> None:
+        """Build a dict trie with its failure links breadth-first, then pack it depth first"""
+        goto: List[Dict[str, int]] = [{}]
+        fail = [0]
+        term_at = [-1]
+
+        for term_id, term in enumerate(self.terms):
+            node = 0
+            for ch in term:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    term_at.append(-1)
+                node = nxt
+            term_at[node] = term_id
+
+        report = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            report[node] = node if term_at[node] >= 0 else report[fail[node]]
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fallback = goto[state].get(ch, 0)
+                fail[child] = fallback if fallback != child else 0
+
+        # Depth-first numbering: the first child popped is the next node
+        order = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(reversed(list(goto[node].values())))
+        number = [0] * len(goto)
+        for new, old in enumerate(order):
+            number[old] = new
+
+        edge = self._edge
+        for new, old in enumerate(order):
+            children = goto[old]
+            if len(children) == 1:
+                edge.append(next(iter(children)))
+            else:
+                edge.append(None)
+                if children:
+                    self._branches[new] = {ch: number[child] for ch, child in children.items()}
+        # Entries share number's int objects, so a list costs little more than an array
+        self._fail = [number[fail[old]] for old in order]
+        self._report = [number[report[old]] for old in order]
+        self._term_at = array('i', (term_at[old] for old in order))
+
+    def find_hits(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Every word-bounded occurrence of every term in an already lowercased text,
+        overlapping ones included, as unordered (term_id, start, end) tuples
+        """
+        edge, branches, fail = self._edge, self._branches, self._fail
+        term_at, report, lengths = self._term_at, self._report, self.lengths
+        # Transitions out of the root, where the scan spends most of its time
+        root_step = (branches.get(0) or ({edge[0]: 1} if edge and edge[0] is not None else {})).get
+        hits = []
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node:
+                single = edge[node]
+                if single == ch:
+                    node += 1
+                    break
+                if single is None:
+                    children = branches.get(node)
+                    if children is not None and ch in children:
+                        node = children[ch]
+                        break
+                node = fail[node]
+            else:
+                node = root_step(ch, 0)
+            found = report[node]
+            if found:
+                end = i + 1
+                while found:
+                    term_id = term_at[found]
+                    start = end - lengths[term_id]
+                    if is_boundary(text, start) and is_boundary(text, end):
+                        hits.append((term_id, start, end))
+                    found = report[fail[found]]
+
+        return hits
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find word-bounded occurrences of every term in an already lowercased text
+        Returns: List of (start, end, term_id) tuples, ordered longest term first
+        and by position within a term, like one regex pass per term would
+        """
+        return select_spans(self.find_hits(text))
+
+
+def select_spans(hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Order (term_id, start, end) hits the way find_spans reports them
+    Overlapping hits of the same term are dropped, as re.finditer never reports them
+    """
+    spans = []
+    last_id, last_end = -1, 0
+    for term_id, start, end in sorted(hits):
+        if term_id == last_id and start < last_end:
+            continue
+        spans.append((start, end, term_id))
+        last_id, last_end = term_id, end
+
+    return spans
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Metrics and profiling for the Ranchi Local Guide Translator
+Counters, gauges and histograms rendered in the Prometheus text format, plus a
+sampling profiler that can be switched on while the server is running
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter as _StackCounter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+# The profiler stops sampling on its own after this long, and keeps at most this many
+# distinct stacks (the rest are counted together)
+MAX_PROFILE_SECONDS = 60.0
+MAX_PROFILE_STACKS = 10000
+OTHER_STACKS = "[other stacks]"
+
+# Innermost frames of a thread waiting for work (in accept, select, a socket read or a
+# lock); such threads are left out of the samples
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("socket.py", "readinto"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+})
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time
+    kind="counter" exposes a total that is maintained elsewhere (e.g. cache hits)
+    """
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], Optional[float]],
+                 kind: str = "gauge"):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self) -> List[str]:
+        value = self.callback()
+        if value is None:
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram:
+    """Cumulative bucket histogram, optionally split by labels"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                 labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], Optional[float]],
+              kind: str = "gauge") -> Gauge:
+        return self.register(Gauge(name, help_text, callback, kind))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                  labels: Sequence[str] = ()) -> Histogram:
+        return self.register(Histogram(name, help_text, buckets, labels))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class TranslationMetrics:
+    """Time spent matching vs rewriting, and terms matched, per translate_sentence call"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.match_seconds = registry.histogram(
+            "ranchi_translate_match_seconds", "Time spent finding dictionary terms in a sentence")
+        self.rewrite_seconds = registry.histogram(
+            "ranchi_translate_rewrite_seconds", "Time spent resolving overlaps and rewriting a sentence")
+        self.terms_matched = registry.histogram(
+            "ranchi_translate_terms_matched", "Dictionary terms used per translated sentence", COUNT_BUCKETS)
+
+    def record(self, match_seconds: float, rewrite_seconds: float, terms_matched: int) -> None:
+        self.match_seconds.observe(match_seconds)
+        self.rewrite_seconds.observe(rewrite_seconds)
+        self.terms_matched.observe(terms_matched)
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the stacks of all other threads that are not idle
+    Results are in the collapsed-stack format understood by flamegraph.pl and speedscope.
+    Sampling stops by itself after its time limit; the stacks are kept until stop().
+    """
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: "_StackCounter[str]" = _StackCounter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        """True from start() to stop(), including after sampling reached its time limit"""
+        return self._thread is not None
+
+    def start(self, interval: float = 0.005, seconds: float = MAX_PROFILE_SECONDS) -> bool:
+        """Sample every interval seconds for up to seconds; returns False if still sampling"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+
+        self._stacks = _StackCounter()
+        self.samples = 0
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval, time.monotonic() + seconds),
+                                        name="ranchi-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks, hottest first"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def _run(self, interval: float, deadline: float) -> None:
+        own_id = threading.get_ident()
+        stacks = self._stacks
+        while not self._stop.wait(interval) and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                if key not in stacks and len(stacks) >= MAX_PROFILE_STACKS:
+                    key = OTHER_STACKS
+                stacks[key] += 1
+            self.samples += 1
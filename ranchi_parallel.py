@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parallel corpus translation for the Ranchi Local Guide Translator
+Spreads chunks of lines over a process pool; each worker loads the dictionary once
+"""
+
+import contextlib
+import os
+import tempfile
+from collections import deque
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union
+
+from ranchi_compiled import compiled_path_for, is_fresh, read_header
+from ranchi_sqlite import is_database
+from ranchi_translator import RanchiTranslator, iter_chunks
+
+# Set in each worker process by _init_worker
+_worker_translator: Optional[RanchiTranslator] = None
+
+
+def _init_worker(terms_file: str, compiled_file: Optional[str],
+                 dialects: Optional[Dict[str, str]] = None, dialect=None, results: Optional[str] = None) -> None:
+    """Load the dictionary (and the dialect stack, if any) and open the result store once per worker process"""
+    global _worker_translator
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        _worker_translator = RanchiTranslator(terms_file, compiled_file=compiled_file, dialects=dialects,
+                                              results=results)
+        _worker_translator.snapshot_for(dialect)
+
+
+def _translate_chunk(lines: list, fuzzy: bool = False, dialect=None) -> str:
+    """Translate a chunk in a worker; results come back as one JSONL string"""
+    return "".join(text + "\n" for text in _worker_translator.translate_lines(lines, fuzzy, dialect=dialect))
+
+
+def _artifact_is_fresh(compiled_file: str, terms_file: str) -> bool:
+    """True if compiled_file exists and still matches terms_file"""
+    if not os.path.exists(compiled_file):
+        return False
+    try:
+        with open(compiled_file, 'rb') as file:
+            header, _ = read_header(file.read(64 * 1024))
+        return is_fresh(header, terms_file)
+    except Exception:
+        return False
+
+
+def prepare_compiled(terms_file: str, workdir: str) -> Optional[str]:
+    """
+    Make sure workers can load a compiled dictionary instead of each parsing the source
+    Returns the artifact path, or None when the terms file does not exist or is a
+    dictionary database (which workers open directly, reading definitions on demand)
+    """
+    if not os.path.exists(terms_file) or is_database(terms_file):
+        return None
+
+    compiled_file = compiled_path_for(terms_file)
+    if _artifact_is_fresh(compiled_file, terms_file):
+        return compiled_file
+
+    # Build a private artifact once in the parent
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        translator = RanchiTranslator(terms_file, use_compiled=False)
+    compiled_file = os.path.join(workdir, "terms.compiled")
+    translator.save_compiled(compiled_file, terms_file)
+    return compiled_file
+
+
+def translate_parallel(lines: Iterable[str], terms_file: str, workers: Optional[int] = None,
+                       chunk_size: int = 1000, fuzzy: bool = False,
+                       dialects: Optional[Dict[str, str]] = None,
+                       dialect: Union[None, str, Sequence[str]] = None,
+                       results: Optional[str] = None) -> Iterator[str]:
+    """
+    Translate lines on a pool of worker processes
+    Yields one JSONL string per chunk, in input order. At most two chunks per
+    worker are in flight, so input is read lazily however large it is.
+    Each worker builds the merged stack for dialect when it starts (see ranchi_dialects.py)
+    and, with results, shares that result store file with the others (see ranchi_results.py).
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory(prefix="ranchi-") as workdir:
+        compiled_file = prepare_compiled(terms_file, workdir)
+
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(terms_file, compiled_file, dialects, dialect, results)) as pool:
+            pending = deque()
+            for chunk in iter_chunks(lines, chunk_size):
+                pending.append(pool.apply_async(_translate_chunk, (chunk, fuzzy, dialect)))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().get()
+
+            while pending:
+                yield pending.popleft().get()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Persistent translation results for the Ranchi Local Guide Translator
+Results are kept in a SQLite file under a content address: a hash of the
+sentence, the dictionary checksum and the matching options. A rerun over an
+archive translated before with the same dictionary reads its results back
+instead of translating them; gc removes results of dictionary versions no
+longer in use. The store remembers which dialect layers each dictionary
+checksum was computed for, so gc can tell the current version of every stack.
+"""
+
+import argparse
+import atexit
+import contextlib
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Part of every key; bump when the translator's output changes for the same dictionary
+RESULTS_VERSION = 1
+
+# New results are written together once this many are pending, or after FLUSH_INTERVAL seconds
+WRITE_BATCH = 1000
+FLUSH_INTERVAL = 5.0
+
+# Keys per SELECT in get_many (SQLite limits the parameters of one statement)
+LOOKUP_BATCH = 500
+
+# Idle connections kept open per process; threads beyond that open one for the call and close it
+POOL_SIZE = 4
+
+# A rowid table: results are too large for WITHOUT ROWID to pay off (about 4x slower to write)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    checksum TEXT PRIMARY KEY,
+    layers TEXT NOT NULL
+);
+"""
+
+
+def result_key(sentence: str, checksum: str, min_confidence: Optional[float] = None) -> Optional[bytes]:
+    """
+    Content address of a sentence's translation with one dictionary version
+    Sentences not in NFC form get None and bypass the store: a result holds the
+    sentence as given, so they cannot share the entry of their normalized form.
+    """
+    if not unicodedata.is_normalized("NFC", sentence):
+        return None
+    digest = hashlib.sha256(f"{RESULTS_VERSION}\0{checksum}\0{min_confidence!r}\0{sentence}".encode('utf-8'))
+    return digest.digest()[:16]
+
+
+class ResultStore:
+    """
+    Key -> result JSON, in a SQLite file shared by threads and processes
+    Connections are borrowed from a pool of at most pool_size per process (a
+    forked worker starts its own), so short-lived request threads do not each
+    leave one open. Results put are held in memory and written in one
+    transaction per batch; they are also written when the process exits.
+    """
+
+    def __init__(self, path: str, write_batch: int = WRITE_BATCH, flush_interval: float = FLUSH_INTERVAL,
+                 pool_size: int = POOL_SIZE):
+        self.path = path
+        self.write_batch = write_batch
+        self.flush_interval = flush_interval
+        self.pool_size = pool_size
+        # Lookups answered, by get and get_many (a key repeated within one get_many counts once)
+        self.hits = 0
+        self._lock = threading.Lock()
+        # key -> (checksum, result JSON), not yet written
+        self._pending: Dict[bytes, Tuple[str, str]] = {}
+        # checksum -> its layers joined by commas, not yet written; and every checksum queued so far
+        self._new_versions: Dict[str, str] = {}
+        self._recorded = set()
+        self._flushed_at = time.monotonic()
+        self._pool_lock = threading.Lock()
+        self._pool_pid: Optional[int] = None
+        self._idle: List[sqlite3.Connection] = []
+
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        atexit.register(self.flush)
+
+    @contextlib.contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """A connection from this process's pool, returned to it (or closed if the pool is full) after use"""
+        with self._pool_lock:
+            if self._pool_pid != os.getpid():
+                # The parent's connections must not be used after a fork
+                self._idle = []
+                self._pool_pid = os.getpid()
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            # Writers from other processes wait for each other instead of failing
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield connection
+        finally:
+            with self._pool_lock:
+                pooled = self._pool_pid == os.getpid() and len(self._idle) < self.pool_size
+                if pooled:
+                    self._idle.append(connection)
+            if not pooled:
+                connection.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Stored result JSON for key, or None"""
+        entry = self._pending.get(key)
+        if entry is not None:
+            text = entry[1]
+        else:
+            with self._connection() as connection:
+                row = connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            text = row[0] if row else None
+        if text is not None:
+            with self._lock:
+                self.hits += 1
+        return text
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, str]:
+        """
+        Stored result JSON for those of keys that have one, read LOOKUP_BATCH keys per query
+        A key given more than once is looked up and counted as a hit once.
+        """
+        keys = list(dict.fromkeys(keys))
+        # flush() swaps in a new dict; keep reading the one taken here
+        pending = self._pending
+        found = {}
+        missing = []
+        for key in keys:
+            entry = pending.get(key)
+            if entry is not None:
+                found[key] = entry[1]
+            else:
+                missing.append(key)
+        with self._connection() as connection:
+            for start in range(0, len(missing), LOOKUP_BATCH):
+                batch = missing[start:start + LOOKUP_BATCH]
+                found.update(connection.execute(
+                    f"SELECT key, result FROM results WHERE key IN ({','.join('?' * len(batch))})", batch))
+        with self._lock:
+            self.hits += len(found)
+        return found
+
+    def put(self, key: bytes, checksum: str, text: str, layers: Optional[Sequence[str]] = None) -> None:
+        """
+        Queue a result for writing; the batch is written once full or old enough
+        layers names the dialect stack checksum belongs to (empty for the base dictionary)
+        """
+        with self._lock:
+            self._pending[key] = (checksum, text)
+            if layers is not None and checksum not in self._recorded:
+                self._recorded.add(checksum)
+                self._new_versions[checksum] = ",".join(layers)
+            due = (len(self._pending) >= self.write_batch or
+                   time.monotonic() - self._flushed_at >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write the pending results in one transaction; returns how many were written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            versions, self._new_versions = self._new_versions, {}
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return 0
+
+        with self._connection() as connection, connection:
+            connection.executemany("INSERT OR IGNORE INTO versions (checksum, layers) VALUES (?, ?)",
+                                   versions.items())
+            connection.executemany("INSERT OR REPLACE INTO results (key, checksum, result) VALUES (?, ?, ?)",
+                                   ((key, checksum, text) for key, (checksum, text) in pending.items()))
+        return len(pending)
+
+    def versions(self) -> Dict[str, int]:
+        """Dictionary checksum -> number of stored results"""
+        self.flush()
+        with self._connection() as connection:
+            return dict(connection.execute("SELECT checksum, COUNT(*) FROM results GROUP BY checksum"))
+
+    def stacks(self) -> Dict[str, Tuple[str, ...]]:
+        """Dictionary checksum -> the dialect layers it was computed for, where recorded"""
+        self.flush()
+        with self._connection() as connection:
+            return {checksum: tuple(layers.split(",")) if layers else ()
+                    for checksum, layers in connection.execute("SELECT checksum, layers FROM versions")}
+
+    def gc(self, keep: Iterable[str]) -> int:
+        """Delete results of dictionary checksums not in keep and compact the file; returns how many went"""
+        self.flush()
+        keep = list(keep)
+        with self._connection() as connection:
+            with connection:
+                removed = connection.execute(
+                    f"DELETE FROM results WHERE checksum NOT IN ({','.join('?' * len(keep))})", keep).rowcount
+                connection.execute(
+                    f"DELETE FROM versions WHERE checksum NOT IN ({','.join('?' * len(keep))})", keep)
+            connection.execute("VACUUM")
+            # VACUUM goes through the write-ahead log; fold it back so the file shrinks now
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def close(self) -> None:
+        """Write pending results and close this process's idle connections"""
+        self.flush()
+        atexit.unregister(self.flush)
+        with self._pool_lock:
+            idle = self._idle if self._pool_pid == os.getpid() else []
+            self._idle = []
+        for connection in idle:
+            connection.close()
+
+
+def current_checksums(terms_file: str, dialects_dir: Optional[str],
+                      stacks: Iterable[Tuple[str, ...]] = ()) -> Tuple[List[str], List[Tuple[str, ...]]]:
+    """
+    Checksums of a terms file, of its stack with each dialect in dialects_dir and
+    of each of stacks (lists of layers, see DialectStacks.resolve)
+    Returns: (checksums, stacks that name a dialect not in dialects_dir). A terms
+    file that is missing or cannot be loaded raises instead of falling back to the
+    default terms, which would make every stored result look stale.
+    """
+    from ranchi_dialects import discover_dialects
+    from ranchi_translator import RanchiTranslator
+
+    unresolved = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        translator = RanchiTranslator(terms_file, dialects=discover_dialects(dialects_dir))
+        translator.load_terms(terms_file, strict=True)
+        checksums = [translator.snapshot.checksum]
+        checksums += [translator.snapshot_for(name).checksum for name in sorted(translator.dialects.shards)]
+        for layers in stacks:
+            try:
+                layers = translator.dialects.resolve(list(layers)) if layers else None
+            except ValueError:
+                unresolved.append(layers)
+                continue
+            checksums.append(translator.snapshot_for(layers).checksum)
+    return checksums, unresolved
+
+
+def main():
+    """Inspect a result store, or remove the results of old dictionary versions"""
+    from ranchi_translator import DEFAULT_DIALECTS_DIR, DEFAULT_TERMS_FILE
+
+    parser = argparse.ArgumentParser(description="Manage a Ranchi translation result store")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subcommands.add_parser("stats", help="count stored results per dictionary version")
+    stats_parser.add_argument("store", help="result store file")
+
+    gc_parser = subcommands.add_parser("gc", help="remove results of dictionary versions no longer in use")
+    gc_parser.add_argument("store", help="result store file")
+    gc_parser.add_argument("--terms", default=DEFAULT_TERMS_FILE, help="current terms file (kept)")
+    gc_parser.add_argument("--dialects-dir", default=DEFAULT_DIALECTS_DIR,
+                           help="its dialects; each dialect's stack over --terms is kept")
+    gc_parser.add_argument("--keep", action="append", default=[], metavar="CHECKSUM",
+                           help="also keep this dictionary checksum (repeatable)")
+    gc_parser.add_argument("--all", action="store_true",
+                           help="also remove results whose dialect stack is unknown (stored by an older "
+                                "version, or naming a dialect not in --dialects-dir)")
+    gc_parser.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.store):
+        parser.error(f"{args.store} not found")
+    store = ResultStore(args.store)
+    versions = store.versions()
+
+    if args.command == "stats":
+        for checksum, count in sorted(versions.items(), key=lambda item: -item[1]):
+            print(f"{checksum}  {count:>10,} results")
+        print(f"{sum(versions.values()):,} results for {len(versions)} dictionary versions", file=sys.stderr)
+        return
+
+    stacks = store.stacks()
+    try:
+        checksums, unresolved = current_checksums(args.terms, args.dialects_dir, set(stacks.values()))
+    except (OSError, ValueError) as e:
+        store.close()
+        parser.error(f"cannot load the current dictionary: {e}")
+    keep = set(checksums) | set(args.keep)
+
+    # Without a known stack there is no telling whether a version is current
+    unknown = {checksum for checksum in versions
+               if checksum not in keep and (checksum not in stacks or stacks[checksum] in unresolved)}
+    if unknown and not args.all:
+        keep |= unknown
+        print(f"Keeping {sum(versions[checksum] for checksum in unknown):,} results of {len(unknown)} "
+              f"dictionary versions with an unknown dialect stack (--all removes them)", file=sys.stderr)
+
+    stale = sum(count for checksum, count in versions.items() if checksum not in keep)
+    if args.dry_run:
+        print(f"Would remove {stale:,} results of {len(set(versions) - keep)} old dictionary versions")
+        return
+
+    size_before = os.path.getsize(args.store)
+    removed = store.gc(keep)
+    store.close()
+    print(f"✅ Removed {removed:,} results; {args.store} went from {size_before:,} to "
+          f"{os.path.getsize(args.store):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Response serialization for the Ranchi Local Guide Translator web API
+Translation bodies are assembled from a few C-encoded pieces instead of going
+through jsonify (which sorts a fresh dict and builds a Response per request).
+Bodies are compressed to match Accept-Encoding, and static bodies such as /terms
+keep their encoded and compressed copies.
+"""
+
+import json
+import zlib
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies are sent as they are; the savings would not pay for the CPU
+MIN_COMPRESS_BYTES = 1024
+
+# Dynamic bodies are compressed per request, static ones once per dictionary version
+DYNAMIC_LEVELS = {"br": 4, "gzip": 5}
+STATIC_LEVELS = {"br": 9, "gzip": 9}
+
+# Preferred first when the client accepts several equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Content coding to use for an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """body in the given content coding ("br" or "gzip")"""
+    levels = STATIC_LEVELS if static else DYNAMIC_LEVELS
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    # wbits=31 writes the gzip container
+    compressor = zlib.compressobj(levels["gzip"], zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def negotiate(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress a per-request body if the client accepts it and it is large enough; returns (body, coding)"""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return body, None
+    return compress(body, encoding), encoding
+
+
+class StaticBody:
+    """
+    A response body that does not change, such as /terms for one dictionary version
+    Each compressed variant is made on its first request, at a high level, and kept.
+    Variants get their own ETag, since they are different bytes.
+    """
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._variants: Dict[str, bytes] = {}
+
+    @property
+    def compressible(self) -> bool:
+        """True if the body sent depends on Accept-Encoding (responses should Vary on it)"""
+        return len(self.body) >= MIN_COMPRESS_BYTES
+
+    def encoded(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str], str]:
+        """(body, content coding or None, ETag) for a client's Accept-Encoding"""
+        encoding = choose_encoding(accept_encoding) if self.compressible else None
+        if encoding is None:
+            return self.body, None, self.etag
+
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = self._variants[encoding] = compress(self.body, encoding, static=True)
+        return variant, encoding, f"{self.etag}-{encoding}"
+
+
+# Lists of strings in one call to the C encoder; per-item caching measured slower
+_encode_list = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def translation_json(result: Dict, index: Optional[int] = None) -> str:
+    """
+    Success body for one translate_sentence result: the JSON jsonify would write
+    for it (sorted keys, compact, ASCII), minus the newline; index is added for batch lines
+    """
+    parts = ['{']
+    if "confidences" in result:
+        parts += ['"confidences":', _encode_list(result["confidences"]), ',']
+    parts += ['"explanations":', _encode_list(result["explanations"]),
+              ',"has_translations":', 'true' if result["has_translations"] else 'false', ',']
+    if index is not None:
+        parts += ['"index":', str(index), ',']
+    parts += ['"original":', encode_basestring_ascii(result["original"]),
+              ',"success":true,"terms_found":', _encode_list(result["terms_found"]),
+              ',"translated":', encode_basestring_ascii(result["translated"]), '}']
+    return "".join(parts)
+
+
+def error_json(error: str, index: Optional[int] = None) -> str:
+    """Failure body {"error": ..., "success": false}, encoded like translation_json"""
+    if index is None:
+        return f'{{"error":{encode_basestring_ascii(error)},"success":false}}'
+    return f'{{"error":{encode_basestring_ascii(error)},"index":{index},"success":false}}'
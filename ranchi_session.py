@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Incremental translation sessions for the Ranchi Local Guide Translator
+A session holds one text that changes by small edits (as when translating while
+the user types). Each edit re-matches only a window of the maximum term length
+around it and reports which matches appeared or disappeared.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ranchi_dialects import BASE_LAYER
+
+
+class EditConflict(Exception):
+    """An edit was made against an older version of the session text"""
+
+
+def _resolve(hits: List[list]) -> None:
+    """
+    Mark the hits [start, end, term_id, accepted] that translate_sentence would use
+    Same ordering and overlap rules as PhraseMatcher.find_spans followed by
+    RanchiTranslator._rewrite; hits must be whole groups of overlapping hits.
+    """
+    if not hits:
+        return
+    base = min(hit[0] for hit in hits)
+    claimed = bytearray(max(hit[1] for hit in hits) - base)
+    last_id, last_end = -1, 0
+
+    for hit in sorted(hits, key=lambda hit: (hit[2], hit[0], hit[1])):
+        start, end, term_id = hit[0], hit[1], hit[2]
+        hit[3] = False
+        # re.finditer never reports overlapping hits of the same term
+        if term_id == last_id and start < last_end:
+            continue
+        last_id, last_end = term_id, end
+        # Longer terms claim their characters first
+        if claimed.find(1, start - base, end - base) == -1:
+            claimed[start - base:end - base] = b'\x01' * (end - start)
+            hit[3] = True
+
+
+class TranslationSession:
+    """
+    A text kept translated across edits
+
+    Every term occurrence (overlapping ones included) is kept as a hit in a gap
+    buffer: hits before the last edit in _before with absolute offsets, hits
+    after it in _after with offsets counted from the end of the text, so an
+    edit never has to renumber them. An edit only touches hits within
+    max_term_length of it, plus any hits overlapping those, and moving the
+    gap costs as much as the number of hits the cursor moved over.
+    Hit offsets are offsets in the lowercased text, which only works while it is
+    as long as the text; otherwise every edit re-matches the whole text.
+    """
+
+    def __init__(self, translator, text: str = "", dialect: Optional[Tuple[str, ...]] = None):
+        self.translator = translator
+        self.dialect = dialect
+        self.version = 0
+        self.lock = threading.Lock()
+        # Matches the client last saw, kept when the session's dictionary was released
+        self._released: Optional[List[Dict]] = None
+        self._reset(text)
+
+    @property
+    def stale(self) -> bool:
+        """True if the dictionary changed since the text was matched (the next edit re-matches it all)"""
+        return (self._released is not None or
+                self.translator.snapshot_for(self.dialect) is not self.snapshot)
+
+    def superseded(self) -> bool:
+        """True if the session's dictionary is no longer in use; unlike stale, never builds a dialect stack"""
+        if self.snapshot is None:
+            return False
+        if self.dialect is None or self.dialect == (BASE_LAYER,):
+            return self.translator.snapshot is not self.snapshot
+        return self.translator.dialects.peek(self.dialect) is not self.snapshot
+
+    def release(self) -> None:
+        """
+        Let go of a replaced dictionary so it can be freed; the matches the client
+        saw are kept for the next edit, and the text is re-matched when next used
+        """
+        self._released = self._removed_matches()
+        self.snapshot = None
+        self._before, self._after = [], []
+
+    def _ensure_matched(self) -> None:
+        if self.snapshot is None:
+            self._reset(self.text)
+
+    def _reset(self, text: str) -> None:
+        """Match the whole text against the translator's current dictionary"""
+        self.snapshot = self.translator.snapshot_for(self.dialect)
+        self.text = text
+        self._lower = text.lower()
+        hits = [[start, end, term_id, False]
+                for term_id, start, end in self.snapshot.matcher.find_hits(self._lower)]
+        hits.sort()
+        _resolve(hits)
+        self._before: List[list] = hits
+        self._after: List[list] = []
+
+    def _move_gap(self, position: int) -> None:
+        """Put hits starting before position in _before and the rest in _after"""
+        n = len(self.text)
+        before, after = self._before, self._after
+        while before and before[-1][0] >= position:
+            start, end, term_id, accepted = before.pop()
+            after.append([n - start, n - end, term_id, accepted])
+        while after and n - after[-1][0] < position:
+            start, end, term_id, accepted = after.pop()
+            before.append([n - start, n - end, term_id, accepted])
+
+    def _match(self, hit: list) -> Dict:
+        """JSON-friendly description of an accepted hit"""
+        start, end, term_id = hit[0], hit[1], hit[2]
+        term = self.snapshot.matcher.terms[term_id]
+        original = self.text[start:end]
+        translation = self.snapshot.terms_dict[term]
+        return {
+            "start": start,
+            "end": end,
+            "term": term,
+            "original": original,
+            "translation": translation,
+            "rendering": self.snapshot.render(original, term, translation)
+        }
+
+    def _accepted(self) -> List[list]:
+        """Accepted hits with absolute offsets, in text order"""
+        n = len(self.text)
+        hits = [hit for hit in self._before if hit[3]]
+        hits.extend([n - hit[0], n - hit[1], hit[2], True] for hit in reversed(self._after) if hit[3])
+        return hits
+
+    def _removed_matches(self) -> List[Dict]:
+        """Every accepted match, in the form an edit lists removed matches in"""
+        return [{"start": hit[0], "end": hit[1], "term": self.snapshot.matcher.terms[hit[2]]}
+                for hit in self._accepted()]
+
+    def matches(self) -> List[Dict]:
+        """Every match currently used in the translation, in text order"""
+        self._ensure_matched()
+        return [self._match(hit) for hit in self._accepted()]
+
+    def result(self) -> Dict:
+        """The same result translate_sentence would give for the current text"""
+        self._ensure_matched()
+        spans = sorted(self._accepted(), key=lambda hit: (hit[2], hit[0]))
+        terms = self.snapshot.matcher.terms
+        return self.translator._rewrite(self.text, self.snapshot,
+                                        [(start, end, terms[term_id]) for start, end, term_id, _ in spans])
+
+    def edit(self, offset: int, delete: int = 0, insert: str = "",
+             base_version: Optional[int] = None) -> Dict:
+        """
+        Replace delete characters at offset with insert
+        Returns the new version and the change in matches: "removed" lists matches
+        that no longer apply (offsets in the text before the edit), "added" lists
+        new ones (offsets in the text after it). Matches in neither list still
+        apply; those starting at or after offset + delete moved by "delta".
+        """
+        if base_version is not None and base_version != self.version:
+            raise EditConflict(f"session is at version {self.version}, edit was made against {base_version}")
+        if not 0 <= offset <= len(self.text) or delete < 0 or offset + delete > len(self.text):
+            raise ValueError(f"edit at {offset}+{delete} is outside the text (length {len(self.text)})")
+
+        if self.stale:
+            return self._replace_all(offset, delete, insert, reloaded=True)
+        # Case mappings that change the length (e.g. "İ") would leave hit offsets off in the text
+        lower_insert = insert.lower()
+        if len(lower_insert) != len(insert) or len(self._lower) != len(self.text):
+            return self._replace_all(offset, delete, insert, reloaded=False)
+
+        matcher = self.snapshot.matcher
+        reach = matcher.max_term_length
+        old_length = len(self.text)
+        delta = len(insert) - delete
+        edit_end, new_end = offset + delete, offset + len(insert)
+
+        # Hits that could touch the edited characters are dropped and re-matched
+        self._move_gap(max(0, offset - reach))
+        after = self._after
+        dropped = []
+        while after and old_length - after[-1][0] <= edit_end + reach:
+            start, end, term_id, accepted = after.pop()
+            dropped.append((old_length - start, old_length - end, term_id, accepted))
+
+        self.text = self.text[:offset] + insert + self.text[edit_end:]
+        self._lower = self._lower[:offset] + lower_insert + self._lower[edit_end:]
+        length = len(self.text)
+
+        # One extra character on each side keeps word boundaries at the window edges right
+        window_start = max(0, offset - reach - 1)
+        window_end = min(length, new_end + 2 * reach + 1)
+        group = [[window_start + start, window_start + end, term_id, False]
+                 for term_id, start, end in matcher.find_hits(self._lower[window_start:window_end])
+                 if offset - reach <= window_start + start <= new_end + reach]
+
+        def moved_start(start: int) -> int:
+            if start < offset:
+                return start
+            return start + delta if start >= edit_end else offset
+
+        def moved_end(end: int) -> int:
+            if end <= offset:
+                return end
+            return end + delta if end > edit_end else new_end
+
+        # Widen to every hit overlapping the re-matched ones, since acceptance
+        # depends on overlaps; kept hits only have their flags recomputed
+        low = min([offset] + [hit[0] for hit in group] + [moved_start(hit[0]) for hit in dropped])
+        high = max([new_end] + [hit[1] for hit in group] + [moved_end(hit[1]) for hit in dropped])
+        neighbours, pool = [], []
+        while True:
+            while self._before and self._before[-1][0] > low - reach:
+                pool.append(self._before.pop())
+            while after and length - after[-1][0] < high:
+                start, end, term_id, accepted = after.pop()
+                pool.append([length - start, length - end, term_id, accepted])
+            overlapping = [hit for hit in pool if hit[0] < high and hit[1] > low]
+            if not overlapping:
+                break
+            pool = [hit for hit in pool if not (hit[0] < high and hit[1] > low)]
+            neighbours.extend(overlapping)
+            low = min([low] + [hit[0] for hit in overlapping])
+            high = max([high] + [hit[1] for hit in overlapping])
+
+        was_accepted = {}
+        for start, end, term_id, accepted in dropped:
+            if accepted:
+                was_accepted[start, end, term_id] = (moved_start(start), moved_end(end))
+        for hit in neighbours:
+            if hit[3]:
+                shift = 0 if hit[0] < offset else delta
+                was_accepted[hit[0] - shift, hit[1] - shift, hit[2]] = (hit[0], hit[1])
+
+        group.extend(neighbours)
+        _resolve(group)
+        now_accepted = {(hit[0], hit[1], hit[2]): hit for hit in group if hit[3]}
+
+        # Put everything back: hits starting before the gap go to _before
+        gap = max(0, offset - reach)
+        group.extend(pool)
+        group.sort()
+        self._before.extend(hit for hit in group if hit[0] < gap)
+        after.extend([length - hit[0], length - hit[1], hit[2], hit[3]]
+                     for hit in reversed(group) if hit[0] >= gap)
+
+        # Matches clear of the edited characters that are still accepted are unchanged
+        removed, kept = [], set()
+        for (start, end, term_id), (moved_to_start, moved_to_end) in sorted(was_accepted.items()):
+            key = (moved_to_start, moved_to_end, term_id)
+            if (end <= offset or start >= edit_end) and key in now_accepted:
+                kept.add(key)
+            else:
+                removed.append({"start": start, "end": end, "term": self.snapshot.matcher.terms[term_id]})
+        added = [self._match(hit) for key, hit in sorted(now_accepted.items()) if key not in kept]
+
+        self.version += 1
+        return {
+            "version": self.version,
+            "offset": offset,
+            "delta": delta,
+            "removed": removed,
+            "added": added
+        }
+
+    def _replace_all(self, offset: int, delete: int, insert: str, reloaded: bool) -> Dict:
+        """
+        Apply an edit by re-matching the whole text: after a dictionary reload (or
+        dialect stack rebuild), or where lowercasing changes the text's length
+        """
+        removed = self._released if self._released is not None else self._removed_matches()
+        self._released = None
+        self._reset(self.text[:offset] + insert + self.text[offset + delete:])
+        self.version += 1
+        return {
+            "version": self.version,
+            "offset": offset,
+            "delta": len(insert) - delete,
+            "removed": removed,
+            "added": self.matches(),
+            "reloaded": reloaded
+        }
+
+
+class SessionStore:
+    """Translation sessions by id, evicting the least recently used and idle ones"""
+
+    def __init__(self, max_sessions: int = 1000, idle_timeout: float = 1800,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        # id -> (session, last used)
+        self._sessions: "OrderedDict[str, Tuple[TranslationSession, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, translator, text: str = "",
+               dialect: Optional[Tuple[str, ...]] = None) -> Tuple[str, TranslationSession]:
+        session = TranslationSession(translator, text, dialect)
+        session_id = secrets.token_urlsafe(12)
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+            self._sessions[session_id] = (session, now)
+        return session_id, session
+
+    def get(self, session_id: str) -> TranslationSession:
+        """The session with this id; KeyError if it does not exist or has expired"""
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            session, _ = self._sessions[session_id]
+            self._sessions[session_id] = (session, now)
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def release_superseded(self) -> int:
+        """
+        Release the dictionaries of sessions whose dictionary was replaced, so idle
+        sessions do not keep old ones in memory; returns how many were released.
+        Sessions in use are skipped: their next edit re-matches them anyway.
+        """
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+        released = 0
+        for session in sessions:
+            if not session.lock.acquire(blocking=False):
+                continue
+            try:
+                if session.superseded():
+                    session.release()
+                    released += 1
+            finally:
+                session.lock.release()
+        return released
+
+    def _expire(self, now: float) -> None:
+        """Drop sessions idle for longer than idle_timeout; caller holds the lock"""
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._sessions[session_id]
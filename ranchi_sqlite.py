@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+SQLite dictionary backend for the Ranchi Local Guide Translator
+Keeps terms on disk in an indexed table, with an FTS5 index over definitions, so
+large regional vocabularies are not loaded in full into every worker: the phrase
+matcher is stored prebuilt and definitions are read when a term is matched.
+"""
+
+import argparse
+import marshal
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, Iterator, List, Mapping as MappingType, Optional, Tuple
+from urllib.parse import quote
+
+from ranchi_matcher import PhraseMatcher
+
+SQLITE_MAGIC = b"SQLite format 3\0"
+# 2: definitions are indexed without folding diacritics, as the in-memory search compares them
+SCHEMA_VERSION = 2
+
+# Definitions kept in memory per store; the least recently matched are dropped first
+DEFINITION_CACHE_SIZE = 4096
+
+# Terms per SELECT in definitions() (SQLite limits the parameters of one statement)
+LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    definition TEXT NOT NULL,
+    category TEXT NOT NULL,
+    rendering TEXT
+);
+"""
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE definitions_fts USING fts5(definition, content='terms', content_rowid='id',
+                                                tokenize='unicode61 remove_diacritics 0');
+INSERT INTO definitions_fts(definitions_fts) VALUES ('rebuild');
+"""
+# Letters and digits, the characters the FTS tokenizer keeps in a word
+_WORD = re.compile(r'[^\W_]+')
+
+
+def is_database(path: str) -> bool:
+    """True if path is a SQLite file (checked by its header, not its name)"""
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def search_words(query: str) -> List[str]:
+    """Lowercase words of a definition search, split as the FTS index splits definitions"""
+    return _WORD.findall(query.lower())
+
+
+def mentions(definition: str, words: List[str]) -> bool:
+    """True if each of words starts some word of definition: the FTS prefix query, without the index"""
+    definition_words = _WORD.findall(definition.lower())
+    return all(any(found.startswith(word) for found in definition_words) for word in words)
+
+
+def write_database(output_path: str, terms_dict: MappingType[str, str], matcher: PhraseMatcher,
+                   categories: Dict[str, List[str]], checksum: str,
+                   renderings: Optional[Dict[str, str]] = None) -> None:
+    """Write a dictionary database; terms keep their order, categories and templates"""
+    category_of = {term: category for category, terms in categories.items() for term in terms}
+    renderings = renderings or {}
+
+    # Build next to the target and swap it in, so open stores never see a partial file
+    tmp_path = output_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(_SCHEMA)
+        connection.executemany(
+            "INSERT INTO terms (term, definition, category, rendering) VALUES (?, ?, ?, ?)",
+            ((term, definition, category_of[term], renderings.get(term))
+             for term, definition in terms_dict.items()))
+        try:
+            connection.executescript(_FTS_SCHEMA)
+            has_fts = 1
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; definition search falls back to LIKE
+            has_fts = 0
+        connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+            ("schema_version", SCHEMA_VERSION),
+            ("term_count", len(terms_dict)),
+            ("checksum", checksum),
+            ("has_fts", has_fts),
+            ("matcher", marshal.dumps(matcher.to_state()))
+        ])
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, output_path)
+
+
+class SQLiteTermStore(Mapping):
+    """
+    Read-only term -> definition mapping backed by a dictionary database
+
+    Each thread (and each forked worker) opens its own read-only connection on
+    first use. Definitions are fetched through the unique index on term and the
+    last DEFINITION_CACHE_SIZE are kept in memory; iteration follows the order
+    the terms were written in.
+    """
+
+    def __init__(self, path: str, cache_size: int = DEFINITION_CACHE_SIZE):
+        self.path = path
+        self._local = threading.local()
+        meta = dict(self._connection().execute("SELECT key, value FROM meta"))
+        if meta.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(f"unsupported dictionary database version {meta.get('schema_version')}")
+
+        self.checksum: str = meta["checksum"]
+        self.has_fts = bool(meta["has_fts"])
+        self._size: int = meta["term_count"]
+        self._lookup = lru_cache(maxsize=cache_size)(self._query_definition)
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(f"file:{quote(os.path.abspath(self.path))}?mode=ro",
+                                               uri=True, check_same_thread=False)
+            local.pid = os.getpid()
+        return local.connection
+
+    def _query_definition(self, term: str) -> Optional[str]:
+        row = self._connection().execute("SELECT definition FROM terms WHERE term = ?", (term,)).fetchone()
+        return row[0] if row else None
+
+    def matcher(self) -> PhraseMatcher:
+        """The phrase matcher stored with the terms (rebuilt if it was stored by another version)"""
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'matcher'").fetchone()
+        try:
+            return PhraseMatcher.from_state(marshal.loads(row[0]))
+        except ValueError:
+            return PhraseMatcher(self)
+
+    def __getitem__(self, term: str) -> str:
+        definition = self._lookup(term) if isinstance(term, str) else None
+        if definition is None:
+            raise KeyError(term)
+        return definition
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and self._lookup(term) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (term,) in self._connection().execute("SELECT term FROM terms ORDER BY id"):
+            yield term
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """(term, definition) pairs in order, read in one query"""
+        return iter(self._connection().execute("SELECT term, definition FROM terms ORDER BY id"))
+
+    def renderings(self) -> Dict[str, str]:
+        """term -> template for the terms that have one"""
+        return dict(self._connection().execute(
+            "SELECT term, rendering FROM terms WHERE rendering IS NOT NULL"))
+
+    def definitions(self, terms: List[str]) -> Dict[str, str]:
+        """term -> definition for many terms, LOOKUP_BATCH per query; the matched-term cache is left alone"""
+        if len(terms) >= self._size:
+            return dict(self.items())
+        connection = self._connection()
+        found = {}
+        for start in range(0, len(terms), LOOKUP_BATCH):
+            batch = terms[start:start + LOOKUP_BATCH]
+            found.update(connection.execute(
+                f"SELECT term, definition FROM terms WHERE term IN ({','.join('?' * len(batch))})", batch))
+        return found
+
+    def categorized(self) -> Iterator[Tuple[str, str]]:
+        """(category, term) pairs in term order, as computed when the database was written"""
+        return iter(self._connection().execute("SELECT category, term FROM terms ORDER BY id"))
+
+    def prefix(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        """(term, definition) for terms starting with prefix, alphabetically; a range scan of the term index"""
+        return self._connection().execute(
+            "SELECT term, definition FROM terms WHERE term >= ? AND term < ? ORDER BY term LIMIT ?",
+            (prefix, prefix + "\U0010ffff", limit)).fetchall()
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, str]]:
+        """
+        (term, definition) in term order for definitions with a word starting with
+        each word of query (see mentions)
+        """
+        words = search_words(query)
+        if not words or limit <= 0:
+            return []
+        if self.has_fts:
+            return self._connection().execute(
+                "SELECT terms.term, terms.definition FROM definitions_fts "
+                "JOIN terms ON terms.id = definitions_fts.rowid "
+                "WHERE definitions_fts MATCH ? ORDER BY definitions_fts.rowid LIMIT ?",
+                (" ".join(f'"{word}"*' for word in words), limit)).fetchall()
+
+        # SQLite without FTS5: scan the definitions in order
+        found = []
+        for term, definition in self.items():
+            if mentions(definition, words):
+                found.append((term, definition))
+                if len(found) == limit:
+                    break
+        return found
+
+
+def main():
+    """Build a dictionary database from a terms file"""
+    from ranchi_translator import DEFAULT_TERMS_FILE, RanchiTranslator
+
+    parser = argparse.ArgumentParser(description="Build a SQLite dictionary from a Ranchi terms file")
+    parser.add_argument("terms_file", nargs="?", default=DEFAULT_TERMS_FILE,
+                        help="markdown/text terms file to convert")
+    parser.add_argument("-o", "--output", help="database path (default: <terms_file> with a .db suffix)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.terms_file):
+        parser.error(f"{args.terms_file} not found")
+
+    output = args.output or os.path.splitext(args.terms_file)[0] + ".db"
+    translator = RanchiTranslator(args.terms_file, use_compiled=False)
+    translator.save_database(output)
+    print(f"✅ Wrote {len(translator.terms_dict)} terms to {output}")
+
+
+if __name__ == "__main__":
+    main()
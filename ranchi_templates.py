@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Rendering templates for the Ranchi Local Guide Translator
+Each term can carry the natural English that replaces it in a translated
+sentence, e.g. "Dhuska (local rice pancakes)" or "{original} ({translation})".
+Templates are parsed once when the dictionary is loaded and rendered by
+joining their pieces, without any pattern matching per sentence.
+"""
+
+from string import Formatter
+from typing import Dict, Mapping, Tuple, Union
+
+# Placeholders a template may use; a rendering sees them in this order
+FIELDS = ("original", "term", "translation")
+
+
+class RenderTemplate:
+    """
+    A compiled template: literal strings and field indexes, in order
+    {original} is the text as it appeared in the sentence, {term} the
+    dictionary term it matched and {translation} the term's definition.
+    """
+
+    __slots__ = ("source", "_parts", "_static")
+
+    def __init__(self, source: str):
+        parts: list = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if field not in FIELDS or spec or conversion:
+                raise ValueError(f"unknown placeholder {{{field}}} in template {source!r}; "
+                                 f"use {', '.join('{' + name + '}' for name in FIELDS)}")
+            parts.append(FIELDS.index(field))
+
+        self.source = source
+        self._parts: Tuple[Union[str, int], ...] = tuple(parts)
+        # Most templates are plain text; joined from the parts, so {{ and }} come out single
+        self._static = "".join(parts) if all(isinstance(part, str) for part in parts) else None
+
+    def render(self, original: str, term: str, translation: str) -> str:
+        if self._static is not None:
+            return self._static
+        values = (original, term, translation)
+        return "".join(part if isinstance(part, str) else values[part] for part in self._parts)
+
+    def __repr__(self) -> str:
+        return f"RenderTemplate({self.source!r})"
+
+
+def compile_templates(sources: Mapping[str, str]) -> Dict[str, RenderTemplate]:
+    """
+    Compile term -> template source; invalid templates are reported and skipped,
+    so their terms are rendered as they appear in the sentence
+    """
+    templates = {}
+    for term, source in sources.items():
+        try:
+            templates[term] = RenderTemplate(source)
+        except ValueError as e:
+            print(f"⚠️  Ignoring template for '{term}': {e}")
+    return templates
@@ -4,37 +4,585 @@ Ranchi Local Guide Translator
 Translates local Ranchi slang, food terms, and phrases to standard English/Hindi
 """
 
+import argparse
+import contextlib
+import hashlib
+import json
 import re
 import os
-from typing import Dict, List, Tuple, Optional
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional, Union
+
+from ranchi_cache import TranslationCache
+from ranchi_compiled import compiled_path_for, load_compiled, write_compiled
+from ranchi_compact import CompactTermStore
+from ranchi_dialects import MAX_STACKS, DialectStacks, discover_dialects
+from ranchi_fuzzy import FuzzyIndex
+from ranchi_matcher import PhraseMatcher, TermMatch
+from ranchi_results import ResultStore, result_key
+from ranchi_sqlite import SQLiteTermStore, is_database, mentions, search_words, write_database
+from ranchi_templates import RenderTemplate, compile_templates
+
+DEFAULT_TERMS_FILE = "product.md/namaste world htlm.txt"
+DEFAULT_DIALECTS_DIR = "dialects"
+
+# Term categories, checked in order; a definition mentioning any keyword joins the category
+TERM_CATEGORIES = [
+    ("Food & Drinks", ['dish', 'food', 'drink', 'rice', 'beer', 'snack', 'curry']),
+    ("Greetings & Slang", ['greeting', 'friend', 'brother', 'sister', 'how are']),
+    ("Places & Locations", ['road', 'area', 'lake', 'ground', 'chowk'])
+]
+DEFAULT_CATEGORY = "Common Phrases"
+
+# Fuzzy matches below this confidence are ignored
+DEFAULT_MIN_CONFIDENCE = 0.75
+
+# Renderings for well-known terms, used when the terms file gives no "=> template"
+DEFAULT_RENDERINGS = {
+    "arre baba": "Hey friend",
+    "kaise ho re": "How are you",
+    "theek ba": "I'm fine",
+    "bahut acha": "very good",
+    "khana khaao": "have some food",
+    "paani piyoo": "drink water",
+    "aaja bhai": "come here brother",
+    "kahaan jaat ho": "where are you going",
+    "ghar aa jao": "come to my home",
+    "litti chokha": "Litti Chokha (traditional Ranchi dish)",
+    "dhuska": "Dhuska (local rice pancakes)"
+}
+# Then, in order, for any other term containing one of these (e.g. "garam dhuska")
+DEFAULT_FRAGMENT_RENDERINGS = (
+    ("litti chokha", "Litti Chokha (traditional Ranchi dish)"),
+    ("dhuska", "Dhuska (local rice pancakes)")
+)
+CATEGORY_ICONS = {
+    "Food & Drinks": "🍽️",
+    "Greetings & Slang": "👋",
+    "Places & Locations": "🏛️",
+    "Common Phrases": "💬"
+}
+
+def _file_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def categorize(definition: str) -> str:
+    """Pick the category for a term from its definition"""
+    definition_lower = definition.lower()
+    for category, keywords in TERM_CATEGORIES:
+        if any(word in definition_lower for word in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+class TermsDict(dict):
+    """
+    Term -> definition dict that counts its edits, so the translator can tell
+    its snapshot is out of date even when an edit left the size unchanged
+    """
+    
+    generation = 0
+    
+    def __setitem__(self, term, definition):
+        super().__setitem__(term, definition)
+        self.generation += 1
+    
+    def __delitem__(self, term):
+        super().__delitem__(term)
+        self.generation += 1
+    
+    def __ior__(self, other):
+        super().__ior__(other)
+        self.generation += 1
+        return self
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.generation += 1
+    
+    def setdefault(self, term, definition=None):
+        self.generation += 1
+        return super().setdefault(term, definition)
+    
+    def pop(self, *args):
+        self.generation += 1
+        return super().pop(*args)
+    
+    def popitem(self):
+        self.generation += 1
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self.generation += 1
+
+
+class DictionarySnapshot:
+    """
+    One loaded dictionary: terms, phrase matcher, rendering templates, category index and checksum
+    Built completely before it is installed, so a translation that grabbed a
+    snapshot always sees one consistent dictionary. Plain dicts are copied into a
+    TermsDict; generation is the edit count it was built at (None for read-only stores).
+    renderings holds the template sources given with the terms (term -> template);
+    DEFAULT_RENDERINGS, then DEFAULT_FRAGMENT_RENDERINGS, fill in for terms without one. A SQLiteTermStore brings
+    its categories and checksum with it, so its definitions are never read in full.
+    layers names the dialect stack a merged snapshot was built for (empty for the base);
+    stack holds the snapshots of those layers, lowest first, and terms_dict is then a
+    view over theirs. A merged snapshot takes its terms, categories and checksum from
+    the layers, so it never reads a database layer's definitions in full.
+    """
+    
+    def __init__(self, terms_dict: Dict[str, str], matcher: Optional[PhraseMatcher] = None,
+                 compact: bool = False, fuzzy: bool = False,
+                 renderings: Optional[Dict[str, str]] = None, layers: Tuple[str, ...] = (),
+                 stack: Sequence["DictionarySnapshot"] = ()):
+        if type(terms_dict) is dict:
+            terms_dict = TermsDict(terms_dict)
+        self.generation: Optional[int] = getattr(terms_dict, 'generation', None)
+        if matcher is None:
+            # A stack's terms are its layers' terms, in the order a view over them iterates
+            keys = (term for layer in stack for term in layer.matcher.terms) if stack else terms_dict.keys()
+            matcher = PhraseMatcher(keys)
+        self.matcher = matcher
+        self.size = len(matcher.terms) if stack else len(terms_dict)
+        self.layers = layers
+        self.renderings = dict(renderings or {})
+        
+        sources = {term: source for term, source in DEFAULT_RENDERINGS.items() if term in terms_dict}
+        for term in self.matcher.terms:
+            if term not in sources:
+                for fragment, source in DEFAULT_FRAGMENT_RENDERINGS:
+                    if fragment in term:
+                        sources[term] = source
+                        break
+        # A stack's renderings all come from its layers, so only a single dictionary's need checking
+        sources.update((term, source) for term, source in self.renderings.items() if stack or term in terms_dict)
+        self.templates: Dict[str, RenderTemplate] = compile_templates(sources)
+        
+        self._sorted_terms: Optional[List[str]] = None
+        self._stack = tuple(stack)
+        if stack:
+            # Categories are merged from the layers on first use
+            self._categories = None
+            self.checksum = hashlib.sha256("\n".join(layer.checksum for layer in stack).encode('utf-8')).hexdigest()
+            self.terms_dict = terms_dict
+            self._fuzzy_index = FuzzyIndex(self.matcher.terms) if fuzzy else None
+            return
+        
+        if isinstance(terms_dict, SQLiteTermStore):
+            # Indexed when the database was written; categories are read on first use
+            self._categories: Optional[Dict[str, List[str]]] = None
+            self.checksum = terms_dict.checksum
+            self.terms_dict = terms_dict
+            self._fuzzy_index = FuzzyIndex(self.matcher.terms) if fuzzy else None
+            return
+        
+        categories = self._empty_categories()
+        digest = hashlib.sha256()
+        
+        for term, definition in terms_dict.items():
+            categories[categorize(definition)].append(term)
+            template = self.templates.get(term)
+            if template is None:
+                digest.update(f"{term}\t{definition}\n".encode('utf-8'))
+            else:
+                digest.update(f"{term}\t{definition}\t{template.source}\n".encode('utf-8'))
+        
+        self._categories = categories
+        self.checksum = digest.hexdigest()
+        
+        # Packed after indexing; the store looks terms up in the matcher's term list
+        if compact and not isinstance(terms_dict, CompactTermStore):
+            terms_dict = CompactTermStore(terms_dict, self.matcher.terms)
+            self.generation = None
+        self.terms_dict = terms_dict
+        self._fuzzy_index = FuzzyIndex(self.matcher.terms) if fuzzy else None
+    
+    @staticmethod
+    def _empty_categories() -> Dict[str, List[str]]:
+        categories = {category: [] for category, _ in TERM_CATEGORIES}
+        categories[DEFAULT_CATEGORY] = []
+        return categories
+    
+    @property
+    def categories(self) -> Dict[str, List[str]]:
+        """Category name -> terms"""
+        if self._categories is None:
+            categories = self._empty_categories()
+            if self._stack:
+                # A term takes the category of its definition in the highest layer defining it
+                category_of = {}
+                for layer in reversed(self._stack):
+                    for category, terms in layer.categories.items():
+                        for term in terms:
+                            category_of.setdefault(term, category)
+                for term in self.matcher.terms:
+                    categories[category_of[term]].append(term)
+            else:
+                for category, term in self.terms_dict.categorized():
+                    categories.setdefault(category, []).append(term)
+            self._categories = categories
+        return self._categories
+    
+    @property
+    def fuzzy_index(self) -> FuzzyIndex:
+        """Spelling-tolerant index over the matcher's terms, built on first use"""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex(self.matcher.terms)
+        return self._fuzzy_index
+    
+    def render(self, original: str, term: str, translation: str) -> str:
+        """Natural English for one matched term, or the text as it appeared in the sentence"""
+        template = self.templates.get(term)
+        return original if template is None else template.render(original, term, translation)
+    
+    def definitions(self, terms: List[str]) -> Dict[str, str]:
+        """term -> definition for terms; a database is read in a few queries, not one per term"""
+        if isinstance(self.terms_dict, SQLiteTermStore):
+            return self.terms_dict.definitions(terms)
+        return self.terms_dict
+    
+    def search(self, query: str, limit: int) -> List[Tuple[str, str]]:
+        """
+        Terms starting with query (alphabetically), then terms whose definition has
+        a word starting with each word of query (in dictionary order), as
+        (term, definition) pairs; a database gives the same results through its indexes
+        """
+        query = query.strip().lower()
+        if not query or limit <= 0:
+            return []
+        terms_dict = self.terms_dict
+        database = isinstance(terms_dict, SQLiteTermStore)
+        
+        if database:
+            found = terms_dict.prefix(query, limit)
+        else:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self.matcher.terms)
+            sorted_terms = self._sorted_terms
+            found = []
+            index = bisect_left(sorted_terms, query)
+            while index < len(sorted_terms) and len(found) < limit and sorted_terms[index].startswith(query):
+                found.append((sorted_terms[index], terms_dict[sorted_terms[index]]))
+                index += 1
+        
+        words = search_words(query)
+        if len(found) < limit and words:
+            seen = {term for term, _ in found}
+            if database:
+                # Prefix matches may come back again; ask for enough to fill up after skipping them
+                mentioning = terms_dict.search(query, limit + len(found))
+            else:
+                mentioning = ((term, definition) for term, definition in terms_dict.items()
+                              if mentions(definition, words))
+            for term, definition in mentioning:
+                if term not in seen:
+                    found.append((term, definition))
+                    if len(found) == limit:
+                        break
+        return found
 
 class RanchiTranslator:
-    def __init__(self, terms_file: str = "product.md/namaste world htlm.txt"):
-        """Initialize the translator with terms from the file"""
-        self.terms_dict = {}
+    def __init__(self, terms_file: str = DEFAULT_TERMS_FILE, use_compiled: bool = True,
+                 compiled_file: Optional[str] = None, cache_size: int = 0,
+                 cache_max_bytes: int = 32 * 1024 * 1024, cache_ttl: Optional[float] = None,
+                 compact: bool = False, fuzzy_index: bool = False,
+                 dialects: Optional[Dict[str, str]] = None, max_dialect_stacks: int = MAX_STACKS,
+                 results: Union[None, str, ResultStore] = None):
+        """
+        Initialize the translator with terms from the file
+        A compiled artifact (see ranchi_compiled.py) is used instead of parsing
+        the file when one exists and matches the file's checksum.
+        With cache_size > 0, translate_sentence results are kept in an LRU cache
+        bounded by cache_size entries and cache_max_bytes, expiring after cache_ttl seconds.
+        With compact=True, definitions are kept in a CompactTermStore (read-only)
+        instead of a dict, which saves memory on large dictionaries.
+        With fuzzy_index=True, the index used by fuzzy matching is built with every
+        dictionary load instead of on the first fuzzy translation.
+        dialects maps dialect names to terms files layered over this dictionary
+        (see ranchi_dialects.py); at most max_dialect_stacks merged stacks are kept.
+        results is a result store (or its path, see ranchi_results.py) consulted
+        before translating a sentence and given every new translation.
+        """
+        self.use_compiled = use_compiled
+        self.compact = compact
+        self.fuzzy_index = fuzzy_index
+        self.compiled_file = compiled_file
+        self.cache: Optional[TranslationCache] = None
+        if cache_size > 0:
+            self.cache = TranslationCache(cache_size, cache_max_bytes, cache_ttl)
+        self.results: Optional[ResultStore] = ResultStore(results) if isinstance(results, str) else results
+        
+        # Optional recorder of per-sentence timings, e.g. ranchi_metrics.TranslationMetrics
+        self.metrics = None
+        # Called with no arguments after a new dictionary is installed, e.g. SessionStore.release_superseded
+        self.install_listeners: List[Callable[[], None]] = []
+        
+        self._snapshot = DictionarySnapshot({})
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        # The terms file's mtime when the current dictionary was read from it
+        self._loaded_mtime: Optional[int] = None
+        self._follower: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.dialects = DialectStacks(self, dialects or {}, max_dialect_stacks)
         self.load_terms(terms_file)
     
-    def load_terms(self, filename: str) -> None:
-        """Load terms and their translations from the file"""
+    @property
+    def terms_dict(self) -> Dict[str, str]:
+        """Terms of the current dictionary"""
+        return self._snapshot.terms_dict
+    
+    @terms_dict.setter
+    def terms_dict(self, terms_dict: Dict[str, str]) -> None:
+        self._install(self._new_snapshot(terms_dict))
+    
+    @property
+    def categories(self) -> Dict[str, List[str]]:
+        """Category name -> terms, computed when the dictionary was loaded"""
+        return self.snapshot.categories
+    
+    @property
+    def dictionary_checksum(self) -> str:
+        """sha256 over the current terms and definitions"""
+        return self.snapshot.checksum
+    
+    @property
+    def snapshot(self) -> DictionarySnapshot:
+        """The current dictionary snapshot, rebuilt first if terms_dict was edited in place"""
+        snapshot = self._snapshot
+        if snapshot.generation is not None and snapshot.terms_dict.generation != snapshot.generation:
+            self.rebuild_index()
+            snapshot = self._snapshot
+        return snapshot
+    
+    def snapshot_for(self, dialect: Union[None, str, Sequence[str]] = None) -> DictionarySnapshot:
+        """
+        The snapshot to translate with for a dialect name or a list of layers
+        (see DialectStacks.resolve); None is the base dictionary
+        """
+        if dialect is None:
+            return self.snapshot
+        return self.dialects.snapshot(self.dialects.resolve(dialect))
+    
+    def load_terms(self, filename: str, strict: bool = False) -> None:
+        """Load terms and their translations from the file (see _load_snapshot for strict)"""
+        # Taken before reading, so an edit made while loading still counts as a change
+        mtime = _file_mtime(filename)
+        snapshot = self._load_snapshot(filename, strict)
+        self.terms_file = filename
+        self._loaded_mtime = mtime
+        self._install(snapshot)
+    
+    def _new_snapshot(self, terms_dict: Dict[str, str], matcher: Optional[PhraseMatcher] = None,
+                      renderings: Optional[Dict[str, str]] = None) -> DictionarySnapshot:
+        return DictionarySnapshot(terms_dict, matcher, compact=self.compact, fuzzy=self.fuzzy_index,
+                                  renderings=renderings)
+    
+    def _load_snapshot(self, filename: str, strict: bool = False) -> DictionarySnapshot:
+        """
+        Read the terms file (or its compiled artifact, or a dictionary database) into a new snapshot
+        With strict=True, a file that is missing, unreadable or without any terms raises;
+        otherwise (at startup) the default terms are used instead.
+        """
+        if is_database(filename):
+            return self._load_database(filename)
+        if self.use_compiled:
+            snapshot = self._load_compiled(filename)
+            if snapshot is not None:
+                return snapshot
+        
+        renderings = {}
         try:
             if not os.path.exists(filename):
+                if strict:
+                    raise FileNotFoundError(f"{filename} not found")
                 print(f"Warning: {filename} not found. Using default terms.")
-                self._load_default_terms()
-                return
-            
-            with open(filename, 'r', encoding='utf-8') as file:
-                content = file.read()
-                self._parse_content(content)
-            
-            print(f"✅ Loaded {len(self.terms_dict)} terms from Ranchi guide")
+                terms_dict = self._default_terms()
+            else:
+                with open(filename, 'r', encoding='utf-8') as file:
+                    content = file.read()
+                    terms_dict, renderings = self._parse_content(content)
+                if strict and not terms_dict:
+                    raise ValueError(f"no terms found in {filename}")
+                
+                print(f"✅ Loaded {len(terms_dict)} terms from Ranchi guide")
         
         except Exception as e:
+            if strict:
+                raise
             print(f"❌ Error loading terms file: {e}")
             print("Using default terms instead.")
-            self._load_default_terms()
+            terms_dict, renderings = self._default_terms(), {}
+        
+        return self._new_snapshot(terms_dict, renderings=renderings)
+    
+    def _load_compiled(self, filename: str) -> Optional[DictionarySnapshot]:
+        """Load terms and matcher from the compiled artifact for filename, if usable"""
+        compiled_file = self.compiled_file or compiled_path_for(filename)
+        loaded = load_compiled(compiled_file, filename)
+        if loaded is None:
+            return None
+        
+        terms_dict, matcher, renderings, _ = loaded
+        print(f"✅ Loaded {len(terms_dict)} terms from compiled dictionary")
+        return self._new_snapshot(terms_dict, matcher, renderings)
+    
+    def _stack_snapshot(self, layers: Tuple[str, ...], terms_dict: Dict[str, str],
+                        renderings: Dict[str, str],
+                        stack: Sequence[DictionarySnapshot]) -> DictionarySnapshot:
+        """Merged snapshot for a dialect stack; terms_dict is a view over the layers and stays unpacked"""
+        return DictionarySnapshot(terms_dict, fuzzy=self.fuzzy_index, renderings=renderings, layers=layers,
+                                  stack=stack)
+    
+    def _load_database(self, filename: str) -> DictionarySnapshot:
+        """Open a dictionary database; definitions stay on disk until a term is matched"""
+        store = SQLiteTermStore(filename)
+        print(f"✅ Opened {len(store)} terms from dictionary database")
+        return self._new_snapshot(store, store.matcher(), store.renderings())
+    
+    def _install(self, snapshot: DictionarySnapshot) -> None:
+        """Swap in a fully built snapshot; a single attribute store, so readers never block"""
+        self._snapshot = snapshot
+        # Stacks include the base dictionary; shards are re-read too, so a reload picks up their edits
+        self.dialects.clear()
+        if self.cache is not None:
+            self.cache.clear()
+        for listener in self.install_listeners:
+            listener()
+    
+    def save_compiled(self, output_path: str, source_file: Optional[str] = None) -> None:
+        """Write the current terms, matcher and templates as a compiled artifact"""
+        snapshot = self.snapshot
+        write_compiled(output_path, snapshot.terms_dict, snapshot.matcher, source_file or self.terms_file,
+                       snapshot.renderings)
+    
+    def save_database(self, output_path: str) -> None:
+        """Write the current dictionary as a SQLite database (see ranchi_sqlite.py)"""
+        snapshot = self.snapshot
+        write_database(output_path, snapshot.terms_dict, snapshot.matcher, snapshot.categories,
+                       snapshot.checksum, snapshot.renderings)
+    
+    def rebuild_index(self) -> None:
+        """Rebuild the phrase matcher and category index after terms_dict was edited in place"""
+        self._install(self._new_snapshot(self._snapshot.terms_dict, renderings=self._snapshot.renderings))
+    
+    def reload_terms(self, filename: Optional[str] = None,
+                     background: bool = False) -> Optional[threading.Thread]:
+        """
+        Reload the dictionary from its file without interrupting translation
+        The new snapshot is built on the side and swapped in atomically; requests
+        in flight finish on the old one. If the file is missing or cannot be read
+        or parsed, the current dictionary stays and the error is raised. With
+        background=True the build runs in a thread (which is returned) and errors
+        are printed instead.
+        """
+        if background:
+            thread = threading.Thread(target=self._reload_or_report, args=(filename,),
+                                      name="ranchi-reload", daemon=True)
+            thread.start()
+            return thread
+        
+        with self._reload_lock:
+            self.load_terms(filename or self.terms_file, strict=True)
+        return None
+    
+    def _reload_or_report(self, filename: Optional[str] = None) -> None:
+        try:
+            self.reload_terms(filename)
+        except Exception as e:
+            print(f"❌ Error reloading terms file, keeping the current dictionary: {e}")
+    
+    def announce_reload(self, path: str) -> None:
+        """Record the current dictionary's checksum in path, for processes following it (follow_reloads)"""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(self.dictionary_checksum)
+        os.replace(temporary, path)
+    
+    def follow_reloads(self, path: str, interval: float = 1.0) -> None:
+        """
+        Reload the dictionary whenever another process announces a reload in path
+        (announce_reload) and this one does not have that dictionary yet
+        An announcement made before the call is checked at once: a worker forked
+        from a process that loaded the dictionary earlier catches up with it.
+        """
+        if self._follower is not None and self._follower.is_alive():
+            return
+        
+        def poll():
+            last_mtime = None
+            while True:
+                mtime = _file_mtime(path)
+                if mtime is not None and mtime != last_mtime:
+                    last_mtime = mtime
+                    try:
+                        with open(path, encoding='utf-8') as f:
+                            checksum = f.read().strip()
+                    except OSError:
+                        checksum = None
+                    if checksum and checksum != self.dictionary_checksum:
+                        self._reload_or_report()
+                if self._stop_watching.wait(interval):
+                    return
+        
+        self._stop_watching.clear()
+        self._follower = threading.Thread(target=poll, name="ranchi-follow", daemon=True)
+        self._follower.start()
+    
+    def _terms_file_mtime(self) -> Optional[int]:
+        return _file_mtime(self.terms_file)
     
-    def _parse_content(self, content: str) -> None:
-        """Parse content and extract term definitions"""
+    def watch_terms_file(self, interval: float = 2.0) -> None:
+        """
+        Reload the dictionary whenever the terms file's mtime changes
+        The file is compared with the dictionary in use at once: a worker forked
+        from a process that loaded an older version of it reloads straight away.
+        """
+        # A watcher copied into a forked child is no longer running; start a new one
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        
+        def poll():
+            last_mtime = self._loaded_mtime
+            while True:
+                mtime = self._terms_file_mtime()
+                if mtime is not None and mtime != last_mtime:
+                    last_mtime = mtime
+                    self._reload_or_report()
+                if self._stop_watching.wait(interval):
+                    return
+        
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=poll, name="ranchi-watch", daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self) -> None:
+        """Stop the threads started by watch_terms_file and follow_reloads"""
+        self._stop_watching.set()
+        for thread in (self._watcher, self._follower):
+            if thread is not None:
+                thread.join()
+        self._watcher = self._follower = None
+    
+    def cache_stats(self) -> Optional[Dict]:
+        """Hit/miss/eviction counters of the result cache, or None if caching is off"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def _parse_content(self, content: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Parse content and extract term definitions
+        A definition may end with "=> template", the natural English that replaces
+        the term in translations ({original}, {term} and {translation} are filled in)
+        Returns: (terms_dict, renderings) with renderings mapping term -> template
+        """
+        terms_dict = TermsDict()
+        renderings = {}
         lines = content.split('\n')
         
         for line in lines:
@@ -48,18 +596,18 @@ class RanchiTranslator:
                     # Get definition after =
                     if '=' in line:
                         definition = line.split('=', 1)[1].strip()
-                        # Clean up quotes if present
-                        term_clean = term.replace('"', '').strip()
-                        self.terms_dict[term_clean.lower()] = definition
-                        
-                        # Also store quoted versions
-                        if '"' in term:
-                            quoted_term = term.replace('"', '').strip()
-                            self.terms_dict[quoted_term.lower()] = definition
-    
-    def _load_default_terms(self) -> None:
-        """Load default terms if file is not available"""
-        default_terms = {
+                        definition, _, template = definition.partition('=>')
+                        # Clean up quotes if present ("Litti Chokha" is stored as litti chokha)
+                        term_clean = term.replace('"', '').strip().lower()
+                        terms_dict[term_clean] = definition.strip()
+                        if template.strip():
+                            renderings[term_clean] = template.strip()
+        
+        return terms_dict, renderings
+    
+    def _default_terms(self) -> Dict[str, str]:
+        """Default terms if file is not available"""
+        return {
             "arre baba": "Hey friend (casual greeting)",
             "litti chokha": "Traditional dish with roasted wheat balls and mashed vegetables",
             "dhuska": "Fried rice pancakes, local breakfast item",
@@ -67,111 +615,282 @@ class RanchiTranslator:
             "kaise ho re": "How are you? (local informal)",
             "theek ba": "All good/I'm fine"
         }
-        self.terms_dict = default_terms
+    
+    def _find_term_spans(self, sentence: str,
+                         snapshot: Optional[DictionarySnapshot] = None) -> List[Tuple[int, int, str]]:
+        """
+        Find local terms in the sentence with their positions
+        Returns: List of (start, end, matched_term) tuples, longest terms first
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        matcher = snapshot.matcher
+        terms = matcher.terms
+        return [(start, end, terms[term_id])
+                for start, end, term_id in matcher.find_spans(sentence.lower())]
+    
+    def _find_fuzzy_spans(self, sentence: str, snapshot: DictionarySnapshot,
+                          min_confidence: float) -> Tuple[List[Tuple[int, int, str]], List[float]]:
+        """
+        Exact matches (confidence 1.0) plus spelling-variant matches, longest spans first
+        Returns: (spans, confidences) with one confidence per span
+        """
+        exact = self._find_term_spans(sentence, snapshot)
+        terms = snapshot.matcher.terms
+        fuzzy = snapshot.fuzzy_index.find_spans(sentence.lower(), min_confidence,
+                                                {(start, end) for start, end, _ in exact})
+        
+        # Stable sort: at equal length exact matches keep their order and come first
+        ranked = [(start, end, term, 1.0) for start, end, term in exact]
+        ranked.extend((start, end, terms[term_id], confidence) for start, end, term_id, confidence in fuzzy)
+        ranked.sort(key=lambda span: (span[0] - span[1], -span[3]))
+        return [span[:3] for span in ranked], [span[3] for span in ranked]
+    
+    def find_fuzzy_terms(self, sentence: str,
+                         min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> List[Tuple[str, str, str, float]]:
+        """
+        Like find_terms_in_sentence, but also finds terms typed in another romanization
+        Returns: List of (original_term, matched_term, translation, confidence) tuples
+        """
+        snapshot = self.snapshot
+        terms_dict = snapshot.terms_dict
+        spans, confidences = self._find_fuzzy_spans(sentence, snapshot, min_confidence)
+        return [(sentence[start:end], term, terms_dict[term], confidence)
+                for (start, end, term), confidence in zip(spans, confidences)]
+    
+    def search_terms(self, query: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Autocomplete lookup: terms starting with query, then terms whose definition mentions it
+        Returns: List of (term, translation) tuples, at most limit of them
+        """
+        return self.snapshot.search(query, limit)
     
     def find_terms_in_sentence(self, sentence: str) -> List[Tuple[str, str, str]]:
         """
         Find local terms in the sentence and return matches with their translations
         Returns: List of (original_term, matched_term, translation) tuples
         """
-        sentence_lower = sentence.lower()
-        found_terms = []
+        snapshot = self.snapshot
+        terms_dict = snapshot.terms_dict
+        # Longer phrases come first, matched on word boundaries
+        return [(sentence[start:end], term, terms_dict[term])
+                for start, end, term in self._find_term_spans(sentence, snapshot)]
+    
+    def translate_sentence(self, sentence: str, fuzzy: bool = False,
+                           min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                           dialect: Union[None, str, Sequence[str]] = None) -> Dict:
+        """
+        Translate a sentence containing local Ranchi terms
+        Returns a dictionary with translation details
+        With fuzzy=True, spelling variants of terms are matched too and the result
+        carries a "confidences" list (1.0 for exact matches) next to "terms_found"
+        dialect picks a dialect ("nagpuri") or a list of layers (["base", "sadri"])
+        """
+        return self._translate(sentence, self.snapshot_for(dialect), min_confidence if fuzzy else None)
+    
+    def translate_many(self, sentences: Iterable[str], fuzzy: bool = False,
+                       min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                       dialect: Union[None, str, Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Translate sentences one by one, sharing one dictionary snapshot across all of them
+        Yields one result per input, in order; an input that cannot be translated
+        yields {"original": ..., "error": ...} instead of stopping the batch
+        """
+        snapshot = self.snapshot_for(dialect)
+        fuzziness = min_confidence if fuzzy else None
         
-        # Sort terms by length (longest first) to match longer phrases first
-        sorted_terms = sorted(self.terms_dict.keys(), key=len, reverse=True)
+        for sentence in sentences:
+            try:
+                if not isinstance(sentence, str):
+                    raise TypeError(f"expected a string, got {type(sentence).__name__}")
+                yield self._translate(sentence, snapshot, fuzziness)
+            except Exception as e:
+                yield {
+                    "original": sentence,
+                    "error": str(e)
+                }
+    
+    def translate_lines(self, sentences: List[str], fuzzy: bool = False,
+                        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                        dialect: Union[None, str, Sequence[str]] = None) -> List[str]:
+        """
+        Translate a list of sentences into JSON texts, one object per sentence (see translate_many)
+        With a result store, the stored results for the whole list are read in one go
+        and used as they are, a sentence repeated in the list is translated once, and
+        the new results are written together at the end (the result cache is bypassed).
+        """
+        results = self.results
+        if results is None:
+            return [json.dumps(result, ensure_ascii=False)
+                    for result in self.translate_many(sentences, fuzzy, min_confidence, dialect)]
         
-        for term in sorted_terms:
-            # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(term) + r'\b'
-            matches = re.finditer(pattern, sentence_lower)
-            
-            for match in matches:
-                original_term = sentence[match.start():match.end()]
-                found_terms.append((original_term, term, self.terms_dict[term]))
+        snapshot = self.snapshot_for(dialect)
+        fuzziness = min_confidence if fuzzy else None
+        keys = [result_key(sentence, snapshot.checksum, fuzziness) if isinstance(sentence, str) else None
+                for sentence in sentences]
+        texts = results.get_many([key for key in keys if key is not None])
         
-        return found_terms
+        lines = []
+        for sentence, key in zip(sentences, keys):
+            text = texts.get(key) if key is not None else None
+            if text is None:
+                try:
+                    if not isinstance(sentence, str):
+                        raise TypeError(f"expected a string, got {type(sentence).__name__}")
+                    text = json.dumps(self._translate_uncached(sentence, snapshot, fuzziness), ensure_ascii=False)
+                    if key is not None:
+                        texts[key] = text
+                        results.put(key, snapshot.checksum, text, snapshot.layers)
+                except Exception as e:
+                    text = json.dumps({"original": sentence, "error": str(e)}, ensure_ascii=False)
+            lines.append(text)
+        results.flush()
+        return lines
     
-    def translate_sentence(self, sentence: str) -> Dict:
+    def _translate(self, sentence: str, snapshot: DictionarySnapshot,
+                   min_confidence: Optional[float] = None) -> Dict:
         """
-        Translate a sentence containing local Ranchi terms
-        Returns a dictionary with translation details
+        Translate one sentence against a snapshot, going through the cache if enabled
+        min_confidence switches on fuzzy matching (None means exact matches only)
         """
-        found_terms = self.find_terms_in_sentence(sentence)
+        cache = self.cache
+        if cache is None:
+            return self._translate_stored(sentence, snapshot, min_confidence)
+        
+        if min_confidence is None and not snapshot.layers:
+            key = sentence
+        else:
+            key = (sentence, min_confidence, snapshot.layers)
+        cached = cache.get(key)
+        if cached is None:
+            # Results computed against a dictionary that was reloaded meanwhile are not stored
+            generation = cache.generation
+            cached = self._translate_stored(sentence, snapshot, min_confidence)
+            if self._is_current(snapshot):
+                cache.put(key, cached, generation)
         
-        if not found_terms:
-            return {
+        # Callers get their own lists; the cached entry stays untouched
+        result = {
+            **cached,
+            "terms_found": list(cached["terms_found"]),
+            "explanations": list(cached["explanations"])
+        }
+        if "confidences" in cached:
+            result["confidences"] = list(cached["confidences"])
+        return result
+    
+    def _translate_stored(self, sentence: str, snapshot: DictionarySnapshot,
+                          min_confidence: Optional[float] = None) -> Dict:
+        """Translate one sentence, reading the result from the result store if it is there"""
+        results = self.results
+        key = result_key(sentence, snapshot.checksum, min_confidence) if results is not None else None
+        if key is None:
+            return self._translate_uncached(sentence, snapshot, min_confidence)
+        
+        stored = results.get(key)
+        if stored is not None:
+            return json.loads(stored)
+        # Keyed by checksum, so a result stays valid even if the dictionary was reloaded meanwhile
+        result = self._translate_uncached(sentence, snapshot, min_confidence)
+        results.put(key, snapshot.checksum, json.dumps(result, ensure_ascii=False), snapshot.layers)
+        return result
+    
+    def _is_current(self, snapshot: DictionarySnapshot) -> bool:
+        """True while new translations would still use snapshot"""
+        if not snapshot.layers:
+            return snapshot is self._snapshot
+        return self.dialects.peek(snapshot.layers) is snapshot
+    
+    def _translate_uncached(self, sentence: str, snapshot: DictionarySnapshot,
+                            min_confidence: Optional[float] = None) -> Dict:
+        """Translate one sentence against a snapshot, timing both phases when metrics are on"""
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else 0.0
+        
+        if min_confidence is None:
+            found_spans, confidences = self._find_term_spans(sentence, snapshot), None
+        else:
+            found_spans, confidences = self._find_fuzzy_spans(sentence, snapshot, min_confidence)
+        
+        if metrics is None:
+            return self._rewrite(sentence, snapshot, found_spans, confidences)
+        
+        matched = time.perf_counter()
+        result = self._rewrite(sentence, snapshot, found_spans, confidences)
+        metrics.record(matched - started, time.perf_counter() - matched, len(result["terms_found"]))
+        return result
+    
+    def _rewrite(self, sentence: str, snapshot: DictionarySnapshot,
+                 found_spans: List[Tuple[int, int, str]],
+                 confidences: Optional[List[float]] = None) -> Dict:
+        """
+        Resolve overlapping matches and build the translation result
+        Spans are taken in priority order; confidences, when given, come from fuzzy
+        matching and are reported alongside terms_found
+        """
+        if not found_spans:
+            result = {
                 "original": sentence,
                 "translated": sentence,
                 "terms_found": [],
                 "explanations": [],
                 "has_translations": False
             }
+            if confidences is not None:
+                result["confidences"] = []
+            return result
         
-        translated_sentence = sentence
         explanations = []
-        terms_info = []
+        matches = []
         
-        # Process terms and create translated sentence
-        processed_positions = set()
+        # One flag per character; longer terms claim their span first
+        processed = bytearray(max(len(sentence), max(span[1] for span in found_spans)))
         
-        for original_term, matched_term, translation in found_terms:
-            # Find the position of this term in the original sentence
-            term_pos = sentence.lower().find(matched_term)
+        for index, (start, end, matched_term) in enumerate(found_spans):
+            # Skip terms overlapping an already accepted (longer) term
+            if processed.find(1, start, end) != -1:
+                continue
+            processed[start:end] = b'\x01' * (end - start)
             
-            # Check if this position overlaps with already processed terms
-            term_range = set(range(term_pos, term_pos + len(matched_term)))
-            if not term_range.intersection(processed_positions):
-                # Mark this range as processed
-                processed_positions.update(term_range)
-                
-                # Create explanation
+            original_term = sentence[start:end]
+            translation = snapshot.terms_dict[matched_term]
+            confidence = confidences[index] if confidences is not None else 1.0
+            
+            # Create explanation
+            if confidence < 1.0:
+                explanations.append(f"'{original_term}' ≈ '{matched_term}' → {translation} "
+                                    f"({confidence:.0%} sure)")
+            else:
                 explanations.append(f"'{original_term}' → {translation}")
-                terms_info.append({
-                    "original": original_term,
-                    "translation": translation
-                })
+            matches.append(TermMatch(start, end, matched_term, original_term, translation, confidence))
         
         # Create a more natural translated sentence
-        translated_sentence = self._create_natural_translation(sentence, terms_info)
+        translated_sentence = self._create_natural_translation(sentence, matches, snapshot)
         
-        return {
+        result = {
             "original": sentence,
             "translated": translated_sentence,
-            "terms_found": [term["original"] for term in terms_info],
+            "terms_found": [match.original for match in matches],
             "explanations": explanations,
             "has_translations": len(explanations) > 0
         }
+        if confidences is not None:
+            result["confidences"] = [round(match.confidence, 3) for match in matches]
+        return result
     
-    def _create_natural_translation(self, sentence: str, terms_info: List[Dict]) -> str:
-        """Create a more natural English translation"""
-        translated = sentence
-        
-        # Simple replacements for common terms
-        replacements = {
-            "arre baba": "Hey friend",
-            "kaise ho re": "How are you",
-            "theek ba": "I'm fine",
-            "bahut acha": "very good",
-            "khana khaao": "have some food",
-            "paani piyoo": "drink water",
-            "aaja bhai": "come here brother",
-            "kahaan jaat ho": "where are you going",
-            "ghar aa jao": "come to my home"
-        }
+    def _create_natural_translation(self, sentence: str, matches: List[TermMatch],
+                                    snapshot: DictionarySnapshot) -> str:
+        """Create a more natural English translation by splicing each term's rendering in once"""
+        parts = []
+        position = 0
         
-        for term_info in terms_info:
-            original = term_info["original"]
-            original_lower = original.lower()
-            
-            if original_lower in replacements:
-                # Replace with natural English
-                translated = re.sub(re.escape(original), replacements[original_lower], translated, flags=re.IGNORECASE)
-            elif "litti chokha" in original_lower:
-                translated = re.sub(re.escape(original), "Litti Chokha (traditional Ranchi dish)", translated, flags=re.IGNORECASE)
-            elif "dhuska" in original_lower:
-                translated = re.sub(re.escape(original), "Dhuska (local rice pancakes)", translated, flags=re.IGNORECASE)
+        for match in sorted(matches, key=lambda match: match.start):
+            parts.append(sentence[position:match.start])
+            parts.append(snapshot.render(match.original, match.term, match.translation))
+            position = match.end
         
-        return translated
+        parts.append(sentence[position:])
+        return "".join(parts)
     
     def interactive_mode(self):
         """Run the translator in interactive mode"""
@@ -227,37 +946,102 @@ class RanchiTranslator:
         print("\n📚 Available Ranchi Local Terms:")
         print("=" * 50)
         
-        # Categorize terms
-        categories = {
-            "🍽️ Food & Drinks": [],
-            "👋 Greetings & Slang": [],
-            "🏛️ Places & Locations": [],
-            "💬 Common Phrases": []
-        }
-        
-        for term, translation in self.terms_dict.items():
-            term_title = term.title()
-            short_translation = translation[:60] + "..." if len(translation) > 60 else translation
-            
-            if any(word in translation.lower() for word in ['dish', 'food', 'drink', 'rice', 'beer', 'snack']):
-                categories["🍽️ Food & Drinks"].append(f"   • {term_title}: {short_translation}")
-            elif any(word in translation.lower() for word in ['greeting', 'friend', 'brother', 'sister', 'how are']):
-                categories["👋 Greetings & Slang"].append(f"   • {term_title}: {short_translation}")
-            elif any(word in translation.lower() for word in ['road', 'area', 'lake', 'ground', 'chowk']):
-                categories["🏛️ Places & Locations"].append(f"   • {term_title}: {short_translation}")
-            else:
-                categories["💬 Common Phrases"].append(f"   • {term_title}: {short_translation}")
-        
-        for category, terms in categories.items():
+        snapshot = self.snapshot
+        for category, terms in snapshot.categories.items():
             if terms:
-                print(f"\n{category}:")
-                for term in sorted(terms)[:8]:  # Show max 8 per category
-                    print(term)
+                print(f"\n{CATEGORY_ICONS[category]} {category}:")
+                lines = []
+                for term in terms:
+                    translation = snapshot.terms_dict[term]
+                    short_translation = translation[:60] + "..." if len(translation) > 60 else translation
+                    lines.append(f"   • {term.title()}: {short_translation}")
+                for line in sorted(lines)[:8]:  # Show max 8 per category
+                    print(line)
                 if len(terms) > 8:
                     print(f"   ... and {len(terms) - 8} more terms")
 
-def main():
-    """Main function to run the translator"""
+def read_lines(path: str) -> Iterator[str]:
+    """Lazily yield lines (without line endings) from a file, or stdin for '-'"""
+    if path == '-':
+        for line in sys.stdin:
+            yield line.rstrip('\r\n')
+        return
+    
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def translate_stream(translator: RanchiTranslator, lines: Iterable[str], out,
+                     chunk_size: int = 1000, fuzzy: bool = False,
+                     dialect: Union[None, str, Sequence[str]] = None) -> int:
+    """
+    Translate lines chunk by chunk, writing one JSON object per line to out
+    Only one chunk is held in memory at a time; returns the number of lines written
+    With a result store, each chunk's stored results are read in one go (see translate_lines)
+    """
+    count = 0
+    for chunk in iter_chunks(lines, chunk_size):
+        out.write("".join(text + "\n" for text in translator.translate_lines(chunk, fuzzy, dialect=dialect)))
+        count += len(chunk)
+    return count
+
+def run_translate_command(args) -> None:
+    """Non-interactive mode: translate a file or stdin to JSONL"""
+    # Keep stdout clean for JSONL when writing there
+    log = sys.stderr if args.out == '-' else sys.stdout
+    
+    dialects = discover_dialects(args.dialects_dir)
+    # "sadri" is base + sadri; "base,nagpuri,sadri" lists every layer
+    dialect = args.dialect.split(",") if args.dialect and "," in args.dialect else args.dialect
+    if dialect is not None:
+        try:
+            DialectStacks(None, dialects).resolve(dialect)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+    
+    start = time.perf_counter()
+    reused = None
+    with contextlib.ExitStack() as stack:
+        out = sys.stdout if args.out == '-' else stack.enter_context(open(args.out, 'w', encoding='utf-8'))
+        
+        if args.workers > 1:
+            from ranchi_parallel import translate_parallel
+            
+            count = 0
+            for block in translate_parallel(read_lines(args.input), args.terms, args.workers,
+                                            args.chunk_size, args.fuzzy, dialects, dialect, args.results):
+                out.write(block)
+                count += block.count("\n")  # one JSON object per line
+        else:
+            with contextlib.redirect_stdout(log):
+                translator = RanchiTranslator(args.terms, dialects=dialects, results=args.results)
+                # Load the dialect shards now, while their messages go to the log
+                translator.snapshot_for(dialect)
+            count = translate_stream(translator, read_lines(args.input), out, args.chunk_size, args.fuzzy,
+                                     dialect)
+            if translator.results is not None:
+                reused = translator.results.hits
+                translator.results.close()
+    elapsed = time.perf_counter() - start
+    
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ Translated {count} lines in {elapsed:.2f}s ({rate:,.0f} lines/sec)", file=sys.stderr)
+    if reused is not None:
+        print(f"   {reused} result lookups were answered from {args.results}", file=sys.stderr)
+
+def run_interactive():
+    """Show an example translation, then start interactive mode"""
     print("🚀 Starting Ranchi Local Guide Translator...")
     
     # Initialize translator
@@ -280,5 +1064,30 @@ def main():
     # Start interactive mode
     translator.interactive_mode()
 
+def main():
+    """Main function to run the translator"""
+    parser = argparse.ArgumentParser(description="Ranchi Local Guide Translator")
+    subcommands = parser.add_subparsers(dest="command")
+    
+    translate_parser = subcommands.add_parser("translate", help="translate a file or stdin to JSONL")
+    translate_parser.add_argument("--in", dest="input", default="-", help="input text file, one sentence per line (default: stdin)")
+    translate_parser.add_argument("--out", default="-", help="output JSONL file (default: stdout)")
+    translate_parser.add_argument("--terms", default=DEFAULT_TERMS_FILE, help="terms file to load")
+    translate_parser.add_argument("--chunk-size", type=int, default=1000, help="lines translated per chunk")
+    translate_parser.add_argument("--workers", type=int, default=1, help="worker processes for large corpora (default: 1)")
+    translate_parser.add_argument("--fuzzy", action="store_true", help="also match terms typed in other romanizations")
+    translate_parser.add_argument("--dialect", help="dialect to layer over the terms, or comma-separated layers (e.g. base,sadri)")
+    translate_parser.add_argument("--dialects-dir", default=DEFAULT_DIALECTS_DIR,
+                                  help=f"directory of dialect terms files (default: {DEFAULT_DIALECTS_DIR})")
+    translate_parser.add_argument("--results", help="result store file: reuse stored results and add new ones "
+                                                    "(reruns over the same archive then only read them back)")
+    
+    args = parser.parse_args()
+    
+    if args.command == "translate":
+        run_translate_command(args)
+    else:
+        run_interactive()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Production server for the Ranchi Local Guide Translator
+Runs asgi.py under gunicorn with preloaded uvicorn workers, or under a single
+uvicorn process where gunicorn is not available (e.g. Windows)
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Ranchi translator API for production")
+    parser.add_argument("--bind", default=os.environ.get('RANCHI_BIND', '0.0.0.0:5000'),
+                        help="host:port to listen on")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--single", action="store_true", help="run one uvicorn process without gunicorn")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    try:
+        import asgiref  # noqa: F401
+    except ImportError:
+        print("❌ Production serving needs asgiref for the routes passed to Flask:")
+        print("   pip install -r requirements.txt")
+        sys.exit(1)
+
+    try:
+        if args.single:
+            raise ImportError("single process requested")
+        from gunicorn.app.wsgiapp import WSGIApplication
+    except ImportError:
+        try:
+            import uvicorn
+        except ImportError:
+            print("❌ Production serving needs uvicorn (and gunicorn for multiple workers):")
+            print("   pip install uvicorn gunicorn")
+            sys.exit(1)
+
+        host, _, port = args.bind.rpartition(':')
+        print(f"🚀 Serving on http://{args.bind} (single uvicorn process)")
+        uvicorn.run("asgi:application", host=host or '0.0.0.0', port=int(port), log_level="warning")
+        return
+
+    argv = ["gunicorn", "-c", os.path.join(ROOT, "gunicorn.conf.py"), "--bind", args.bind]
+    if args.workers:
+        argv += ["--workers", str(args.workers)]
+    sys.argv = argv + ["asgi:application"]
+
+    print(f"🚀 Serving on http://{args.bind} (gunicorn + uvicorn workers, dictionary preloaded)")
+    WSGIApplication("%(prog)s [OPTIONS] [APP_MODULE]").run()
+
+
+if __name__ == "__main__":
+    main()
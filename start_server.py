@@ -5,16 +5,16 @@ Simple script to start the Ranchi Translator web server
 
 import os
 import sys
-from app import app
+from app import app, translator
 
 def main():
     print("🚀 Starting Ranchi Local Guide Translator Web Server...")
     print("=" * 60)
     
     try:
-        # Check if translator is working
-        from ranchi_translator import RanchiTranslator
-        translator = RanchiTranslator()
+        # Check if translator is working (app.py already loaded it; don't parse the terms twice)
+        if not translator:
+            raise RuntimeError("Translator failed to initialize")
         print(f"✅ Translator loaded with {len(translator.terms_dict)} terms")
         
         print("\n🌐 Server will be available at:")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+ASGI serving: the native routes must send the same bodies as the Flask routes
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("asgiref")
+
+import app as web_app  # noqa: E402
+from asgi import TranslatorASGI  # noqa: E402
+
+
+def asgi_request(method, path, query=b"", body=b""):
+    """(status, body) of one request through the ASGI app"""
+    scope = {"type": "http", "method": method, "path": path, "query_string": query,
+             "headers": [(b"content-type", b"application/json")], "client": ("127.0.0.1", 1234)}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(TranslatorASGI()(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    return status, b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+
+
+@pytest.mark.parametrize("method, path, query, body", [
+    ("POST", "/translate", b"", json.dumps({"sentence": ""}).encode()),
+    ("POST", "/translate", b"", json.dumps({"sentence": "Arre baba, dhuska khao"}).encode()),
+    ("GET", "/terms", b"", b""),
+    ("GET", "/terms", b"page=1&per_page=2", b""),
+    ("GET", "/terms", b"page=0", b""),
+    ("GET", "/terms/search", b"q=dhu&limit=5", b""),
+    ("GET", "/terms/search", b"q=dhu&limit=0", b""),
+])
+def test_native_routes_match_flask(method, path, query, body):
+    client = web_app.app.test_client()
+    url = f"{path}?{query.decode()}" if query else path
+    flask = client.open(url, method=method, data=body, content_type="application/json")
+    status, asgi_body = asgi_request(method, path, query, body)
+    assert (status, asgi_body) == (flask.status_code, flask.data)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Result cache: bounded by entries, bytes and age, emptied on reload, and never
+handing out an entry a caller can modify
+"""
+
+from ranchi_cache import TranslationCache, estimate_size
+
+TERMS = {"dhuska": "Fried rice pancakes", "litti chokha": "Roasted wheat balls", "khao": "Eat"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TranslationCache(max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1, 1)
+
+
+def test_memory_bound_and_oversized_results():
+    entry = {"translated": "x" * 100}
+    cache = TranslationCache(max_bytes=estimate_size("k0", entry) * 3)
+    for i in range(10):
+        cache.put(f"k{i}", entry)
+    assert len(cache) == 3 and cache.stats()["bytes"] <= cache.max_bytes
+
+    cache.put("huge", {"translated": "x" * cache.max_bytes})
+    assert cache.get("huge") is None and len(cache) == 3
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TranslationCache(ttl=10, clock=clock)
+    cache.put("a", {"n": 1})
+    clock.now = 9.9
+    assert cache.get("a") == {"n": 1}
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1 and len(cache) == 0
+
+
+def test_results_of_an_older_generation_are_not_stored():
+    cache = TranslationCache()
+    generation = cache.generation
+    cache.clear()
+    cache.put("a", {"n": 1}, generation)
+    assert cache.get("a") is None
+
+
+def test_translator_cache_hits_copies_and_reload(make_translator):
+    translator = make_translator(TERMS, cache_size=100)
+    first = translator.translate_sentence("Dhuska khao")
+    first["terms_found"].append("tampered")
+    second = translator.translate_sentence("Dhuska khao")
+
+    assert "tampered" not in second["terms_found"]
+    assert translator.cache_stats()["hits"] == 1
+
+    # Installing a new dictionary empties the cache, so no stale translation is served
+    translator.terms_dict = {**TERMS, "dhuska": "Rice pancakes"}
+    assert translator.cache_stats()["entries"] == 0
+    assert "Rice pancakes" in str(translator.translate_sentence("Dhuska khao"))
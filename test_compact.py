@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compact storage: the packed matcher and term store must behave like the plain ones
+"""
+
+import marshal
+
+import pytest
+
+from ranchi_compact import CompactTermStore
+from ranchi_matcher import PhraseMatcher
+
+TERMS = {
+    "litti chokha": "Traditional dish",
+    "litti": "Roasted wheat ball",
+    "dhuska": "Fried rice pancake",
+    "kaisan ba": "How are you",
+    "ba": "Is",
+    "jharkhand": "Traditional dish",
+}
+
+
+def test_store_shares_the_matcher_terms():
+    matcher = PhraseMatcher(TERMS)
+    store = CompactTermStore(TERMS, matcher.terms)
+    assert list(store) == list(TERMS)
+    assert dict(store.items()) == TERMS
+    assert all(store[term] == definition for term, definition in TERMS.items())
+    assert "litti chok" not in store and 7 not in store
+    assert store.unique_definitions == len(TERMS) - 1
+    assert all(any(term is key for key in matcher.terms) for term in store)
+
+
+def test_store_of_a_subset_of_the_table():
+    matcher = PhraseMatcher(TERMS)
+    subset = {"dhuska": "Pancake", "ba": "Is"}
+    store = CompactTermStore(subset, matcher.terms)
+    assert dict(store.items()) == subset
+    assert "litti" not in store
+    # Terms missing from the table: the store keeps its own
+    assert dict(CompactTermStore({"new term": "x"}, matcher.terms).items()) == {"new term": "x"}
+
+
+def test_matcher_state_round_trip():
+    matcher = PhraseMatcher(TERMS)
+    text = "kaisan ba, litti chokha aur dhuska? ba ba"
+    restored = PhraseMatcher.from_state(marshal.loads(marshal.dumps(matcher.to_state())))
+    assert sorted(restored.find_hits(text)) == sorted(matcher.find_hits(text))
+    assert {matcher.terms[term_id] for term_id, _, _ in matcher.find_hits(text)} == {
+        "kaisan ba", "ba", "litti chokha", "litti", "dhuska"}
+    with pytest.raises(ValueError):
+        PhraseMatcher.from_state((1,) + matcher.to_state()[1:])
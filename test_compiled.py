@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compiled dictionaries: an artifact must load the dictionary it was built from, and
+never one that no longer matches its source
+"""
+
+import os
+
+from ranchi_compiled import compiled_path_for, load_compiled
+
+TERMS = """- **dhuska** = Fried rice pancakes => Dhuska ({translation})
+- **litti chokha** = Roasted wheat balls with mashed vegetables
+- **kaisan ba** = How are you
+"""
+
+
+def write_terms(tmp_path, content=TERMS):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(content, encoding="utf-8")
+    return terms_file
+
+
+def test_artifact_loads_the_same_dictionary(tmp_path, make_translator):
+    terms_file = write_terms(tmp_path)
+    parsed = make_translator(terms_file)
+    parsed.save_compiled(compiled_path_for(str(terms_file)))
+
+    compiled = make_translator(terms_file, use_compiled=True)
+    assert dict(compiled.terms_dict) == dict(parsed.terms_dict)
+    assert compiled.snapshot.matcher.terms == parsed.snapshot.matcher.terms
+    assert compiled.dictionary_checksum == parsed.dictionary_checksum
+    sentence = "Kaisan ba, dhuska aur litti chokha?"
+    assert compiled.translate_sentence(sentence) == parsed.translate_sentence(sentence)
+
+
+def test_stale_artifact_is_ignored(tmp_path, make_translator):
+    terms_file = write_terms(tmp_path)
+    artifact = compiled_path_for(str(terms_file))
+    make_translator(terms_file).save_compiled(artifact)
+    assert load_compiled(artifact, str(terms_file)) is not None
+
+    # Same size, different content: the checksum catches it once the mtime differs
+    write_terms(tmp_path, TERMS.replace("dhuska", "dhooska"))
+    stat = os.stat(terms_file)
+    os.utime(terms_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load_compiled(artifact, str(terms_file)) is None
+    assert "dhooska" in make_translator(terms_file, use_compiled=True).terms_dict
+
+
+def test_corrupt_artifact_is_ignored(tmp_path, make_translator, capsys):
+    terms_file = write_terms(tmp_path)
+    artifact = compiled_path_for(str(terms_file))
+    make_translator(terms_file).save_compiled(artifact)
+    with open(artifact, "r+b") as file:
+        file.seek(-3, os.SEEK_END)
+        file.write(b"\0\0\0")
+
+    assert load_compiled(artifact, str(terms_file)) is None
+    assert "checksum mismatch" in capsys.readouterr().out
+    assert "dhuska" in make_translator(terms_file, use_compiled=True).terms_dict
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Dialect stacks: merged lazily, rebuilt when the base changes, and never holding
+up lookups of other stacks while one is built
+"""
+
+import threading
+
+import pytest
+
+BASE = {"dhuska": "Fried rice pancakes", "litti": "Roasted wheat ball", "khao": "Eat"}
+BASE_RENDERINGS = {"dhuska": "{original} (rice pancakes)", "litti": "{original} (wheat ball)"}
+SHARDS = {
+    "sadri": "- **dhuska** = Sadri rice pancakes\n- **jhakaas** = Excellent\n",
+    "nagpuri": "- **litti** = Baked wheat ball => {original} ({translation})\n",
+}
+
+
+@pytest.fixture
+def translator(tmp_path, make_translator):
+    dialects = {}
+    for name, content in SHARDS.items():
+        path = tmp_path / f"{name}.md"
+        path.write_text(content, encoding="utf-8")
+        dialects[name] = str(path)
+    translator = make_translator(dialects=dialects)
+    translator._install(translator._new_snapshot(dict(BASE), renderings=BASE_RENDERINGS))
+    return translator
+
+
+def run_with_timeout(function, timeout=10):
+    """function's result; fails instead of hanging if it does not return within timeout"""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "deadlocked"
+    return results[0]
+
+
+def test_edit_then_dialect_translate(translator):
+    # The base is rebuilt (clearing the stacks) while the new stack is being looked up
+    translator.terms_dict["litti"] = "Grilled wheat ball"
+    result = run_with_timeout(lambda: translator.translate_sentence("Litti aur dhuska", dialect="sadri"))
+    assert "Grilled wheat ball" in str(result["explanations"])
+    assert "Sadri rice pancakes" in str(result["explanations"])
+
+    # A cached stack is rebuilt too, so terms added to the base are matched through it
+    translator.terms_dict["chokha"] = "Mashed vegetables"
+    result = run_with_timeout(lambda: translator.translate_sentence("Litti chokha", dialect="sadri"))
+    assert "Mashed vegetables" in str(result["explanations"])
+
+
+def test_overrides_follow_the_layer_order(translator):
+    assert translator.snapshot_for("nagpuri").terms_dict["litti"] == "Baked wheat ball"
+    assert translator.snapshot_for(["nagpuri", "base"]).terms_dict["litti"] == "Roasted wheat ball"
+    stack = translator.snapshot_for(["base", "nagpuri", "sadri"])
+    assert (stack.terms_dict["litti"], stack.terms_dict["dhuska"]) == ("Baked wheat ball", "Sadri rice pancakes")
+    assert translator.snapshot_for("sadri") is translator.snapshot_for(["base", "sadri"])
+
+
+def test_building_a_stack_does_not_block_other_stacks(translator, monkeypatch):
+    cached = translator.snapshot_for("nagpuri")
+    started, release = threading.Event(), threading.Event()
+    stack_snapshot = translator._stack_snapshot
+
+    def slow_stack_snapshot(layers, *args):
+        if "sadri" in layers:
+            started.set()
+            release.wait(10)
+        return stack_snapshot(layers, *args)
+    monkeypatch.setattr(translator, "_stack_snapshot", slow_stack_snapshot)
+
+    builders = [threading.Thread(target=translator.snapshot_for, args=("sadri",)) for _ in range(3)]
+    for builder in builders:
+        builder.start()
+    assert started.wait(10)
+    try:
+        assert run_with_timeout(lambda: translator.snapshot_for("nagpuri"), timeout=2) is cached
+    finally:
+        release.set()
+    for builder in builders:
+        builder.join(10)
+    # Requests that waited for the build got the stack built once
+    assert len(translator.dialects) == 2
+
+
+def test_stack_built_across_a_reload_is_not_kept(translator, monkeypatch):
+    stack_snapshot = translator._stack_snapshot
+
+    def reload_meanwhile(*args):
+        translator.terms_dict = dict(BASE, khao="Eat up")
+        return stack_snapshot(*args)
+    monkeypatch.setattr(translator, "_stack_snapshot", reload_meanwhile)
+    translator.snapshot_for("sadri")
+    assert translator.dialects.peek(("base", "sadri")) is None
+
+
+def test_overridden_term_drops_the_lower_template(translator):
+    assert translator.translate_sentence("Dhuska khao")["translated"] == "Dhuska (rice pancakes) khao"
+    # Sadri redefines dhuska without a template: neither the base template nor its definition shows
+    sadri = translator.translate_sentence("Dhuska khao", dialect="sadri")
+    assert sadri["translated"] == "Dhuska (local rice pancakes) khao"
+    assert "Sadri rice pancakes" in sadri["explanations"][0]
+    # Nagpuri brings its own template for litti; terms it leaves alone keep the base one
+    nagpuri = translator.translate_sentence("Litti aur dhuska", dialect="nagpuri")
+    assert nagpuri["translated"] == "Litti (Baked wheat ball) aur dhuska (rice pancakes)"
+    assert translator.translate_sentence("Litti", dialect=["nagpuri", "base"])["translated"] == "Litti (wheat ball)"
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Fuzzy matching: spelling variants must be found through the index, with
+confidences below those of exact matches
+"""
+
+import random
+
+import pytest
+
+from ranchi_fuzzy import FuzzyIndex, phonetic_key, phrase_key, similarity
+
+TERMS = {
+    "dhuska": "Fried rice pancakes",
+    "kaise ho re": "How are you",
+    "litti chokha": "Roasted wheat balls",
+    "bahut acha": "Very good",
+    "ba": "Is"
+}
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("variant, term", [("dhooska", "dhuska"), ("kaisan", "kaise"), ("accha", "acha"),
+                                           ("aaja", "aja"), ("bahot", "bahut")])
+def test_romanizations_share_keys_or_stay_close(variant, term):
+    assert phonetic_key(variant) == phonetic_key(term) or similarity(phonetic_key(variant), phonetic_key(term)) >= 0.75
+
+
+def test_banded_similarity_matches_full_distance():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 9)))
+        b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 9)))
+        exact = 1.0 if a == b else 1 - levenshtein(a, b) / max(len(a), len(b))
+        minimum = rng.choice([0.0, 0.5, 0.7, 0.9])
+        score = similarity(a, b, minimum)
+        if exact >= minimum:
+            assert score == pytest.approx(exact), (a, b, minimum)
+        else:
+            assert score == 0.0, (a, b, minimum)
+
+
+def test_index_finds_variants_and_skips_strangers():
+    terms = list(TERMS)
+    index = FuzzyIndex(terms)
+    for text in ["dhooska", "kaisan ho re", "litti chokhaa"]:
+        found = index.lookup(text, phrase_key(text), 0.6)
+        assert found is not None and found[1] < 1.0, text
+    assert terms[index.lookup("dhooska", phrase_key("dhooska"), 0.6)[0]] == "dhuska"
+    assert index.lookup("zebra", phrase_key("zebra"), 0.6) is None
+    # Short keys must match exactly: "be" is not "ba"
+    assert index.lookup("be", phrase_key("be"), 0.0) is None
+
+
+def test_fuzzy_translation_reports_confidences(make_translator):
+    translator = make_translator(TERMS, fuzzy_index=True)
+    result = translator.translate_sentence("Dhooska aur litti chokha", fuzzy=True)
+    assert len(result["terms_found"]) == len(result["confidences"]) == 2
+    confidences = dict(zip([entry.lower() for entry in result["terms_found"]], result["confidences"]))
+    assert confidences["litti chokha"] == 1.0
+    assert FuzzyIndex.MAX_CONFIDENCE >= confidences["dhooska"] >= 0.6
+
+    assert "confidences" not in translator.translate_sentence("Dhooska aur litti chokha")
+    strict = translator.translate_sentence("Dhooska", fuzzy=True, min_confidence=0.99)
+    assert strict["terms_found"] == []
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Request admission: who a request is charged to, and what it holds while running
+"""
+
+import pytest
+
+from ranchi_limits import ClientIdentity, CostBudget, Rejected, RequestLimits
+
+
+def test_forwarded_address_needs_a_trusted_peer():
+    identity = ClientIdentity(["10.0.0.0/8"])
+    # The leftmost entries are whatever the client sent; the proxy appended the last one
+    assert identity("6.6.6.6, 1.2.3.4", "10.0.0.5") == "1.2.3.4"
+    assert identity("6.6.6.6, 1.2.3.4", "8.8.8.8") == "8.8.8.8"
+    assert identity(None, "10.0.0.5") == "10.0.0.5"
+    assert ClientIdentity()("1.2.3.4", "10.0.0.5") == "10.0.0.5"
+
+
+def test_forwarded_address_with_two_proxies():
+    identity = ClientIdentity(["10.0.0.1", "10.0.0.2"], hops=2)
+    assert identity("6.6.6.6, 1.2.3.4, 10.0.0.1", "10.0.0.2") == "1.2.3.4"
+    # Too few entries: the request skipped a proxy, so nothing in the header is trusted
+    assert identity("1.2.3.4", "10.0.0.2") == "10.0.0.2"
+
+
+def test_size_cap_can_be_skipped():
+    limits = RequestLimits(max_chars=10)
+    with pytest.raises(Rejected) as rejected:
+        limits.check("client", 11)
+    assert rejected.value.status == 413
+    assert limits.check("client", 11, capped=False) == 1
+
+
+def test_budget_is_released():
+    budget = CostBudget(4, max_wait=0)
+    limits = RequestLimits(budget=budget)
+    limits.acquire(3)
+    with pytest.raises(Rejected):
+        limits.acquire(2)
+    limits.release(3)
+    with limits.admit(4):
+        assert budget.in_flight == 4
+    assert budget.in_flight == 0
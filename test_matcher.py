@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Phrase matching: the single-pass matcher must find what the old one-regex-per-term loop found
+"""
+
+import random
+import re
+
+import pytest
+
+SYLLABLES = ["ba", "ka", "ran", "chi", "lit", "ti", "dhu", "ska", "jhar", "khand", "é", "ß", "İ", "_", "2"]
+SEPARATORS = [" ", " ", " ", "-", ", ", "'", ".", "\t"]
+
+
+def regex_find_terms(terms_dict: dict, sentence: str) -> list:
+    """Reference: sort the terms longest first and scan with one word-bounded regex each"""
+    sentence_lower = sentence.lower()
+    found = []
+    for term in sorted(terms_dict.keys(), key=len, reverse=True):
+        for match in re.finditer(r'\b' + re.escape(term) + r'\b', sentence_lower):
+            found.append((sentence[match.start():match.end()], term, terms_dict[term]))
+    return found
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+
+
+def random_terms(rng: random.Random, count: int) -> dict:
+    terms = {}
+    while len(terms) < count:
+        words = [random_word(rng) for _ in range(rng.choice([1, 1, 2, 3]))]
+        term = " ".join(words).lower()
+        # Only terms that match themselves: the parser never produces the others
+        if term == term.strip() and term.lower() == term:
+            terms[term] = f"definition {len(terms)}"
+    return terms
+
+
+def random_sentence(rng: random.Random, terms: list) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 12)):
+        word = rng.choice(terms) if rng.random() < 0.5 else random_word(rng)
+        parts.append(word.upper() if rng.random() < 0.2 else word)
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matcher_agrees_with_regex_scan(seed, make_translator):
+    rng = random.Random(seed)
+    terms = random_terms(rng, rng.randint(1, 60))
+    translator = make_translator(terms)
+    for _ in range(50):
+        sentence = random_sentence(rng, list(terms))
+        assert translator.find_terms_in_sentence(sentence) == regex_find_terms(terms, sentence), sentence
+
+
+def test_in_place_edit_of_the_same_size_is_picked_up(make_translator):
+    translator = make_translator({"dhuska": "Fried rice pancake", "litti": "Roasted wheat ball"})
+    sentence = "Litti and chokha"
+    assert [term for _, term, _ in translator.find_terms_in_sentence(sentence)] == ["litti"]
+    
+    # Same size before and after: only the edit count shows the index is stale
+    del translator.terms_dict["dhuska"]
+    translator.terms_dict["chokha"] = "Mashed vegetables"
+    assert translator.find_terms_in_sentence(sentence) == regex_find_terms(translator.terms_dict, sentence)
+    
+    translator.terms_dict["litti"] = "Baked wheat ball"
+    assert ("Litti", "litti", "Baked wheat ball") in translator.find_terms_in_sentence(sentence)
+    checksum = translator.dictionary_checksum
+    translator.terms_dict.update(chokha="Mashed potato")
+    assert translator.dictionary_checksum != checksum
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Sampling profiler: it must stop by itself and leave idle threads out
+"""
+
+import socket
+import threading
+import time
+
+import ranchi_metrics
+from ranchi_metrics import OTHER_STACKS, SamplingProfiler
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_skips_idle_threads_and_stops_itself():
+    stop = threading.Event()
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    threads = [threading.Thread(target=busy_loop, args=(stop,), daemon=True),
+               threading.Thread(target=stop.wait, daemon=True),
+               threading.Thread(target=listener.accept, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    profiler = SamplingProfiler()
+    try:
+        assert profiler.start(0.001, seconds=0.2)
+        profiler._thread.join(10)
+        assert not profiler._thread.is_alive()
+        samples = profiler.samples
+        time.sleep(0.05)
+        assert profiler.samples == samples
+        stacks = profiler.stop()
+    finally:
+        stop.set()
+        listener.close()
+
+    assert "busy_loop" in stacks
+    assert "accept" not in stacks
+    assert not any(line.split(";")[-1].startswith("wait (threading.py") for line in stacks.splitlines())
+
+
+def test_profiler_bounds_distinct_stacks(monkeypatch):
+    monkeypatch.setattr(ranchi_metrics, "MAX_PROFILE_STACKS", 1)
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), daemon=True)
+    thread.start()
+    profiler = SamplingProfiler()
+    try:
+        profiler.start(0.001, seconds=0.2)
+        time.sleep(0.3)
+    finally:
+        stop.set()
+    counts = profiler._stacks
+    profiler.stop()
+    assert len(counts) <= 2
+    assert set(counts) - {OTHER_STACKS}
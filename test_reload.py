@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Dictionary reloads: a file that cannot be loaded must never replace the dictionary in use
+"""
+
+import contextlib
+import io
+import os
+import time
+
+import pytest
+
+TERMS = "".join(f"- **term{i}** = Definition {i}\n" for i in range(200))
+
+
+def test_reload_keeps_dictionary_on_invalid_utf8(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(TERMS, encoding="utf-8")
+    translator = make_translator(terms_file)
+    checksum = translator.dictionary_checksum
+    assert translator.snapshot.size == 200
+
+    terms_file.write_bytes(TERMS.encode("utf-8") + b"- **bad** = \xff\n")
+    with pytest.raises(UnicodeDecodeError):
+        translator.reload_terms()
+    assert translator.snapshot.size == 200
+    assert translator.dictionary_checksum == checksum
+
+
+def test_reload_keeps_dictionary_when_file_is_missing_or_empty(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(TERMS, encoding="utf-8")
+    translator = make_translator(terms_file)
+
+    with pytest.raises(FileNotFoundError):
+        translator.reload_terms(str(tmp_path / "missing.md"))
+    terms_file.write_text("no terms here\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        translator.reload_terms()
+    assert translator.snapshot.size == 200
+    assert translator.terms_file == str(terms_file)
+
+
+def test_background_reload_reports_and_keeps_dictionary(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(TERMS, encoding="utf-8")
+    translator = make_translator(terms_file)
+
+    terms_file.write_bytes(b"\xff\xfe")
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        translator.reload_terms(background=True).join()
+    assert "keeping the current dictionary" in output.getvalue()
+    assert translator.snapshot.size == 200
+
+
+def test_startup_falls_back_to_default_terms(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_bytes(b"\xff\xfe")
+    translator = make_translator(terms_file)
+    assert translator.snapshot.size == len(translator._default_terms())
+
+
+def test_announced_reload_reaches_followers(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    reload_file = str(tmp_path / "reload")
+    terms_file.write_text(TERMS, encoding="utf-8")
+    # Two workers serving the same file; the reload request reaches the first only
+    worker, follower = make_translator(terms_file), make_translator(terms_file)
+    worker.announce_reload(reload_file)
+    follower.follow_reloads(reload_file, interval=0.01)
+    try:
+        terms_file.write_text(TERMS + "- **extra** = One more\n", encoding="utf-8")
+        worker.reload_terms()
+        worker.announce_reload(reload_file)
+        deadline = time.monotonic() + 5
+        while follower.dictionary_checksum != worker.dictionary_checksum and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert follower.snapshot.size == 201
+    finally:
+        follower.stop_watching()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_follower_started_after_the_announcement_catches_up(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    reload_file = str(tmp_path / "reload")
+    terms_file.write_text(TERMS, encoding="utf-8")
+    # A worker respawned from the master still has the dictionary the master loaded at startup
+    respawned, worker = make_translator(terms_file), make_translator(terms_file)
+    terms_file.write_text(TERMS + "- **extra** = One more\n", encoding="utf-8")
+    worker.reload_terms()
+    worker.announce_reload(reload_file)
+
+    respawned.follow_reloads(reload_file, interval=0.01)
+    try:
+        assert wait_for(lambda: respawned.dictionary_checksum == worker.dictionary_checksum)
+        assert respawned.snapshot.size == 201
+    finally:
+        respawned.stop_watching()
+
+
+def test_watcher_started_after_an_edit_reloads(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(TERMS, encoding="utf-8")
+    # Forked after the master loaded the file, started after it was edited
+    translator = make_translator(terms_file)
+    terms_file.write_text(TERMS + "- **extra** = One more\n", encoding="utf-8")
+    stat = terms_file.stat()
+    os.utime(terms_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    translator.watch_terms_file(interval=0.01)
+    try:
+        assert wait_for(lambda: translator.snapshot.size == 201)
+    finally:
+        translator.stop_watching()
+
+
+def test_watcher_leaves_an_unchanged_file_alone(tmp_path, make_translator):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(TERMS, encoding="utf-8")
+    translator = make_translator(terms_file)
+    snapshot = translator.snapshot
+    translator.watch_terms_file(interval=0.01)
+    try:
+        time.sleep(0.1)
+        assert translator.snapshot is snapshot
+    finally:
+        translator.stop_watching()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Natural renderings: the default templates must render every term the way the
+original hard-coded replacements did
+"""
+
+from ranchi_templates import RenderTemplate
+
+# The replacements translate_sentence used before renderings became templates
+LEGACY_REPLACEMENTS = {
+    "arre baba": "Hey friend",
+    "kaise ho re": "How are you",
+    "theek ba": "I'm fine",
+    "bahut acha": "very good",
+    "khana khaao": "have some food",
+    "paani piyoo": "drink water",
+    "aaja bhai": "come here brother",
+    "kahaan jaat ho": "where are you going",
+    "ghar aa jao": "come to my home"
+}
+
+
+def legacy_rendering(original, term):
+    if term in LEGACY_REPLACEMENTS:
+        return LEGACY_REPLACEMENTS[term]
+    if "litti chokha" in term:
+        return "Litti Chokha (traditional Ranchi dish)"
+    if "dhuska" in term:
+        return "Dhuska (local rice pancakes)"
+    return original
+
+
+TERMS = {
+    "arre baba": "Hey friend",
+    "bahut acha": "Very good",
+    "dhuska": "Fried rice pancakes, local breakfast item",
+    "dhuska acha": "Good rice pancakes",
+    "garam dhuska": "Hot rice pancakes",
+    "litti chokha": "Traditional dish with roasted wheat balls",
+    "litti chokha wala": "Litti Chokha seller",
+    "litti chokha aur dhuska": "A full Ranchi breakfast",
+    "khao": "Eat"
+}
+
+EXPECTED = {
+    "Arre baba, dhuska acha hai": "Hey friend, Dhuska (local rice pancakes) hai",
+    "garam dhuska khao": "Dhuska (local rice pancakes) khao",
+    "Litti Chokha wala aaya": "Litti Chokha (traditional Ranchi dish) aaya",
+    "litti chokha aur dhuska": "Litti Chokha (traditional Ranchi dish)"
+}
+
+
+def test_default_renderings_match_legacy_output(make_translator):
+    translator = make_translator(TERMS)
+    snapshot = translator.snapshot
+    for term, definition in TERMS.items():
+        original = term.title()
+        assert snapshot.render(original, term, definition) == legacy_rendering(original, term), term
+
+    for sentence, expected in EXPECTED.items():
+        assert translator.translate_sentence(sentence)["translated"] == expected, sentence
+
+
+def test_file_templates_override_defaults(make_translator):
+    translator = make_translator({})
+    terms, renderings = translator._parse_content("- **garam dhuska** = Hot rice pancakes => hot {original}\n")
+    translator._install(translator._new_snapshot(terms, renderings=renderings))
+
+    assert translator.translate_sentence("garam dhuska khao")["translated"] == "hot garam dhuska khao"
+
+
+if __name__ == "__main__":
+    test_default_renderings_match_legacy_output()
+    test_file_templates_override_defaults()
+    print("✅ Renderings match the legacy output")
+
+
+def test_escaped_braces_render_single():
+    assert RenderTemplate("Dhuska {{local}}").render("dhuska", "dhuska", "Pancakes") == "Dhuska {local}"
+    assert RenderTemplate("{{}}").render("a", "a", "b") == "{}"
+    dynamic = RenderTemplate("{original} {{{translation}}}")
+    assert dynamic.render("Dhuska", "dhuska", "rice pancakes") == "Dhuska {rice pancakes}"
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Result store: stored translations are read back once per key, from a bounded set of connections
+"""
+
+import threading
+
+import pytest
+
+from ranchi_results import ResultStore, result_key
+
+
+def test_duplicate_keys_count_one_hit(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    stored = result_key("Dhuska khaye", "abc")
+    pending = result_key("Litti khaye", "abc")
+    store.put(stored, "abc", '{"a": 1}')
+    store.flush()
+    store.put(pending, "abc", '{"b": 2}')
+    
+    found = store.get_many([stored, pending, stored, result_key("Kuch nahi", "abc"), pending, stored])
+    assert found == {stored: '{"a": 1}', pending: '{"b": 2}'}
+    assert store.hits == 2
+    store.close()
+
+
+def test_request_threads_share_a_bounded_pool(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"), pool_size=2)
+    key = result_key("Dhuska khaye", "abc")
+    store.put(key, "abc", '{"a": 1}')
+    store.flush()
+    
+    barrier = threading.Barrier(8)
+    results = []
+    def request():
+        barrier.wait()
+        results.append(store.get_many([key]))
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == [{key: '{"a": 1}'}] * 8
+    assert store.hits == 8
+    assert len(store._idle) <= 2
+    store.close()
+    assert store._idle == []
+
+
+def run_gc(monkeypatch, *args):
+    import ranchi_results
+    monkeypatch.setattr("sys.argv", ["ranchi_results.py", "gc", *args])
+    ranchi_results.main()
+
+
+def test_gc_keeps_every_current_stack(tmp_path, make_translator, monkeypatch):
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text("- **dhuska** = Fried rice pancakes\n- **khao** = Eat\n", encoding="utf-8")
+    dialects_dir = tmp_path / "dialects"
+    dialects_dir.mkdir()
+    (dialects_dir / "nagpuri.md").write_text("- **dhuska** = Nagpuri pancakes\n", encoding="utf-8")
+    (dialects_dir / "sadri.md").write_text("- **khao** = Eat up\n", encoding="utf-8")
+    store_file = str(tmp_path / "results.db")
+
+    translator = make_translator(terms_file, dialects={"nagpuri": str(dialects_dir / "nagpuri.md"),
+                                                       "sadri": str(dialects_dir / "sadri.md")},
+                                 results=store_file)
+    for dialect in [None, "sadri", ["base", "nagpuri", "sadri"], ["sadri", "nagpuri"]]:
+        translator.translate_lines(["Dhuska khao"], dialect=dialect)
+    translator.results.put(b"unrecorded-key00", "checksum-of-an-older-version", "{}")
+    translator.results.close()
+    args = [store_file, "--terms", str(terms_file), "--dialects-dir", str(dialects_dir)]
+
+    # A mistyped terms file must fail, not compare the store against the default terms
+    with pytest.raises(SystemExit) as exit_info:
+        run_gc(monkeypatch, store_file, "--terms", str(tmp_path / "terms-typo.md"))
+    assert exit_info.value.code != 0
+    assert len(ResultStore(store_file)) == 5
+
+    run_gc(monkeypatch, *args)
+    assert len(ResultStore(store_file)) == 5
+    run_gc(monkeypatch, *args, "--all")
+    assert set(ResultStore(store_file).versions()) == {translator.snapshot_for(dialect).checksum for dialect in
+                                                       [None, "sadri", ["base", "nagpuri", "sadri"],
+                                                        ["sadri", "nagpuri"]]}
+
+    # Once the base changes, every stack over it is a new version
+    terms_file.write_text("- **dhuska** = Rice pancakes\n- **khao** = Eat\n", encoding="utf-8")
+    run_gc(monkeypatch, *args)
+    assert len(ResultStore(store_file)) == 1
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Response serialization: hand-assembled bodies must be the bytes jsonify would
+send, and compressed bodies must decode to them
+"""
+
+import gzip
+import json
+
+import pytest
+
+from ranchi_serialize import (MIN_COMPRESS_BYTES, StaticBody, choose_encoding, error_json, negotiate,
+                              translation_json)
+
+
+def jsonify_text(payload):
+    """What Flask's jsonify writes outside debug mode, without the trailing newline"""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("result", [
+    {"original": "Dhuska khao", "translated": "Dhuska (local rice pancakes) khao", "has_translations": True,
+     "terms_found": ["Dhuska"], "explanations": ["'Dhuska' means: Fried rice pancakes"]},
+    {"original": "Namaste \"ji\" \\ 🙏", "translated": "Namaste \"ji\" \\ 🙏", "has_translations": False,
+     "terms_found": [], "explanations": []},
+    {"original": "Dhooska", "translated": "Dhuska", "has_translations": True, "terms_found": ["Dhooska"],
+     "explanations": ["'Dhooska' means: Rice pancakes"], "confidences": [0.8125]},
+])
+@pytest.mark.parametrize("index", [None, 0, 17])
+def test_translation_json_matches_jsonify(result, index):
+    payload = {**result, "success": True}
+    if index is not None:
+        payload["index"] = index
+    assert translation_json(result, index) == jsonify_text(payload)
+
+
+@pytest.mark.parametrize("index", [None, 3])
+def test_error_json_matches_jsonify(index):
+    payload = {"error": "Translation error: bad \"input\" é", "success": False}
+    if index is not None:
+        payload["index"] = index
+    assert error_json(payload["error"], index) == jsonify_text(payload)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None), ("", None), ("identity", None), ("gzip", "gzip"), ("GZIP;q=0.5", "gzip"),
+    ("gzip;q=0", None), ("*", choose_encoding("*")), ("deflate, gzip;q=0.1", "gzip")
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_negotiate_compresses_only_large_bodies():
+    small = b"{}"
+    assert negotiate(small, "gzip") == (small, None)
+    large = b'{"translated":"' + b"litti " * MIN_COMPRESS_BYTES + b'"}'
+    body, encoding = negotiate(large, "gzip")
+    assert encoding == "gzip" and gzip.decompress(body) == large and len(body) < len(large)
+
+
+def test_static_body_keeps_one_variant_per_encoding():
+    static = StaticBody(b"x" * MIN_COMPRESS_BYTES, "abc")
+    body, encoding, etag = static.encoded("gzip")
+    assert (encoding, etag) == ("gzip", "abc-gzip") and gzip.decompress(body) == static.body
+    assert static.encoded("gzip")[0] is body
+    assert static.encoded(None) == (static.body, None, "abc")
+
+
+def test_terms_endpoint_bodies():
+    import app as web_app
+
+    client = web_app.app.test_client()
+    plain = client.get("/terms")
+    assert plain.status_code == 200 and plain.get_json()["success"] is True
+    assert plain.data == jsonify_text(json.loads(plain.data)).encode("utf-8")
+    assert client.get("/terms", headers={"If-None-Match": plain.headers["ETag"]}).status_code == 304
+
+    translated = client.post("/translate", json={"sentence": "Arre baba, dhuska khao"})
+    assert translated.data.rstrip(b"\n") == jsonify_text(translated.get_json()).encode("utf-8")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Live translation sessions: after any sequence of edits, a session must agree with
+translate_sentence on its text, and a client applying the edit diffs must end up
+with the session's matches
+"""
+
+import gc
+import random
+import weakref
+
+import pytest
+
+from ranchi_session import SessionStore, TranslationSession
+
+# Overlapping, nested and repeated terms, over a small alphabet so they occur often
+VOCABULARY = ["aa", "aa aa", "b", "aa b", "ab", "ba", "b aa b", "x", "aa aa aa"]
+
+
+@pytest.fixture
+def translator(make_translator):
+    return make_translator({term: term.upper() for term in VOCABULARY})
+
+
+def match_keys(matches):
+    return {(match["start"], match["end"], match["term"]) for match in matches}
+
+
+def apply_diff(client, diff, offset, delete):
+    """The client's matches after an edit diff, checking the diff against them"""
+    for match in diff["removed"]:
+        key = (match["start"], match["end"], match["term"])
+        assert key in client
+        client.remove(key)
+    delta = diff["delta"]
+    client = {(start + delta, end + delta, term) if start >= offset + delete else (start, end, term)
+              for start, end, term in client}
+    for key in match_keys(diff["added"]):
+        assert key not in client
+        client.add(key)
+    return client
+
+
+@pytest.mark.parametrize("seed, alphabet", [(0, "ab x,"), (1, "ab x,"), (2, "aAb x,İ")])
+def test_random_edits_match_translate_sentence(translator, seed, alphabet):
+    rng = random.Random(seed)
+    for _ in range(60):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        session = TranslationSession(translator, text)
+        client = match_keys(session.matches())
+        for _ in range(30):
+            offset = rng.randint(0, len(session.text))
+            delete = rng.randint(0, min(3, len(session.text) - offset))
+            insert = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+            diff = session.edit(offset, delete, insert)
+
+            assert session.result() == translator.translate_sentence(session.text)
+            client = apply_diff(client, diff, offset, delete)
+            assert client == match_keys(TranslationSession(translator, session.text).matches())
+
+
+def test_length_changing_lowercase_falls_back_to_full_match(translator):
+    session = TranslationSession(translator, "aa b aa")
+    diff = session.edit(2, 0, "İ")
+    assert not diff["reloaded"]
+    assert session.result() == translator.translate_sentence("aaİ b aa")
+    session.edit(0, 0, "b ")
+    assert session.result() == translator.translate_sentence("b aaİ b aa")
+
+
+def test_idle_sessions_release_replaced_dictionary(translator):
+    store = SessionStore()
+    translator.install_listeners.append(store.release_superseded)
+    _, session = store.create(translator, "aa b aa")
+    client = match_keys(session.matches())
+    old = weakref.ref(translator.snapshot)
+
+    translator.terms_dict = {"aa": "A", "b aa": "BA"}
+    gc.collect()
+    assert old() is None
+
+    diff = session.edit(0, 0, "x ")
+    assert diff["reloaded"]
+    assert apply_diff(client, diff, 0, 0) == match_keys(session.matches())
+    assert session.result() == translator.translate_sentence("x aa b aa")
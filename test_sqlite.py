@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+SQLite dictionaries: a database must answer like the terms file it was built from
+"""
+
+import pytest
+
+from ranchi_sqlite import SQLiteTermStore
+
+TERMS = """- **dhuska** = Fried rice pancake, local breakfast item
+- **dhuska chana** = Dhuska served with spiced chickpeas
+- **litti chokha** = Roasted wheat balls with mashed vegetables
+- **litti** = Roasted wheat ball
+- **bahut acha** = Very good/excellent
+- **pitha** = Steamed rice cake (a breakfast sweet)
+- **café wala** = Owner of a café
+- **kaisan ba** = How are you? (Bhojpuri-style greeting)
+"""
+DIALECT = """- **litti** = Baked wheat ball, Nagpuri style
+- **jhakaas** = Excellent
+"""
+
+
+@pytest.fixture
+def translators(tmp_path, make_translator):
+    """The same dictionary (with a dialect) from the terms file and from its database"""
+    terms_file = tmp_path / "terms.md"
+    terms_file.write_text(TERMS, encoding="utf-8")
+    (tmp_path / "dialects").mkdir()
+    (tmp_path / "dialects" / "nagpuri.md").write_text(DIALECT, encoding="utf-8")
+    dialects = {"nagpuri": str(tmp_path / "dialects" / "nagpuri.md")}
+    
+    markdown = make_translator(terms_file, dialects=dialects)
+    markdown.save_database(str(tmp_path / "terms.db"))
+    return markdown, make_translator(tmp_path / "terms.db", dialects=dialects)
+
+
+@pytest.mark.parametrize("query", ["dhu", "dhuska", "rice", "ROASTED wheat", "break", "caf", "café",
+                                   "excel", "wheat ball", "r", "zzz", "?"])
+@pytest.mark.parametrize("limit", [1, 3, 20])
+def test_search_matches_the_terms_file(translators, query, limit):
+    markdown, database = translators
+    assert isinstance(database.terms_dict, SQLiteTermStore)
+    assert database.search_terms(query, limit) == markdown.search_terms(query, limit)
+
+
+def test_search_order(translators):
+    markdown, _ = translators
+    # Prefix matches alphabetically, then definitions with a word starting with each word, in file order
+    assert [term for term, _ in markdown.search_terms("dhu", 10)] == ["dhuska", "dhuska chana"]
+    assert [term for term, _ in markdown.search_terms("rice", 10)] == ["dhuska", "pitha"]
+    assert markdown.search_terms("ice", 10) == []
+
+
+def test_terms_pages_read_definitions_in_batches(translators):
+    markdown, database = translators
+    store = database.terms_dict
+    cached = store._lookup.cache_info().currsize
+    terms = ["pitha", "litti", "dhuska"]
+    assert store.definitions(terms) == {term: markdown.terms_dict[term] for term in terms}
+    assert store.definitions(list(store)) == dict(markdown.terms_dict)
+    assert store._lookup.cache_info().currsize == cached
+
+
+def test_stack_over_a_database_reads_no_definitions(translators, monkeypatch):
+    markdown, database = translators
+    store = database.terms_dict
+    misses = store._lookup.cache_info().misses
+    def read_all(*args):
+        raise AssertionError("the whole table was read")
+    monkeypatch.setattr(SQLiteTermStore, "items", read_all)
+    monkeypatch.setattr(SQLiteTermStore, "__iter__", read_all)
+    
+    merged = database.snapshot_for("nagpuri")
+    expected = markdown.snapshot_for("nagpuri")
+    assert merged.matcher.terms == expected.matcher.terms
+    assert merged.categories == expected.categories
+    assert merged.checksum == expected.checksum
+    assert merged.size == expected.size == 9
+    assert database.translate_sentence("Litti aur dhuska jhakaas", dialect="nagpuri") == \
+        markdown.translate_sentence("Litti aur dhuska jhakaas", dialect="nagpuri")
+    # Only the matched terms were looked up
+    assert store._lookup.cache_info().misses - misses <= 2